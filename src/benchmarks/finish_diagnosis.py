@@ -0,0 +1,232 @@
+"""Statements and time of finish_diagnosis for children with long histories.
+
+Seeds a scratch database with children who went through many diagnoses,
+then compares, per call, the number of statements and the median time of:
+
+* history scan: the child, the latest result of every skill type and the
+  whole diagnosis history sorted in Python to find the last diagnosis;
+* child + session: the child and the last completed session, two queries;
+* summary: DiagnosisRepository.get_diagnosis_summary, one statement.
+
+Runs on a scratch database, see src.benchmarks.seed:
+
+    python -m src.benchmarks.finish_diagnosis --sessions 500
+    python -m src.benchmarks.finish_diagnosis --url postgresql://u:p@localhost/bench
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from sqlalchemy import Engine, event, insert, text
+from sqlalchemy.orm import Session
+
+from src.benchmarks.seed import (
+    add_url_argument,
+    insert_batches,
+    recreate_tables,
+    scratch_engine,
+    seed_skills,
+)
+from src.models.database.models import (
+    Child,
+    DiagnosisHistory,
+    DiagnosisResult,
+    DiagnosisSession,
+    User,
+)
+from src.models.domain.models import ChildRead
+from src.models.domain.models import DiagnosisSession as DiagnosisSessionModel
+from src.repos.child import ChildRepository
+from src.repos.diagnosis import DiagnosisRepository
+
+CHILDREN = 200
+SKILL_TYPES = 8
+SKILLS = 400
+START_DATE = datetime.date(2020, 1, 1)
+
+
+def seed(engine: Engine, sessions: int, answers: int) -> None:
+    """
+    Recreates the tables and fills them with completed diagnoses.
+
+    Args:
+        engine (Engine): Engine of the scratch database.
+        sessions (int): Number of diagnoses of every child.
+        answers (int): Number of answers of every diagnosis.
+    """
+    recreate_tables(engine)
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "telegram_id": 1}])
+        connection.execute(
+            insert(Child),
+            [
+                {"id": i, "user_id": 1, "name": f"child {i}", "birth_date": START_DATE}
+                for i in range(1, CHILDREN + 1)
+            ],
+        )
+        skill_types = seed_skills(connection, SKILL_TYPES, SKILLS)
+
+        history: list[dict] = []
+        results: list[dict] = []
+        summaries: list[dict] = []
+        session_id = 0
+        for child_id in range(1, CHILDREN + 1):
+            for number in range(sessions):
+                session_id += 1
+                day = START_DATE + datetime.timedelta(days=number)
+                mastered = {
+                    skill_id: rng.random() < 0.7
+                    for skill_id in rng.sample(range(1, SKILLS + 1), answers)
+                }
+                ages = {
+                    type_id: rng.randint(0, 72) for type_id in range(1, SKILL_TYPES + 1)
+                }
+                answered_bits, mastered_bits = DiagnosisSessionModel.summarize(mastered)
+                summaries.append(
+                    {
+                        "id": session_id,
+                        "child_id": child_id,
+                        "date": day,
+                        "skill_types_age": {str(k): v for k, v in ages.items()},
+                        "answered": answered_bits,
+                        "mastered": mastered_bits,
+                    }
+                )
+                history.extend(
+                    {
+                        "child_id": child_id,
+                        "skill_id": skill_id,
+                        "skill_type_id": skill_types[skill_id],
+                        "date": day,
+                        "mastered": answer,
+                        "session_id": session_id,
+                    }
+                    for skill_id, answer in mastered.items()
+                )
+                results.extend(
+                    {
+                        "child_id": child_id,
+                        "skill_types_id": type_id,
+                        "date": day,
+                        "age_assessment": age,
+                        "session_id": session_id,
+                    }
+                    for type_id, age in ages.items()
+                )
+            # Sessions go first, the answers and results reference them
+            for table, rows in (
+                (DiagnosisSession, summaries),
+                (DiagnosisHistory, history),
+                (DiagnosisResult, results),
+            ):
+                insert_batches(connection, table, rows)
+                rows.clear()
+
+
+def history_scan(session: Session, child_id: int) -> dict:
+    """Reads the results the way finish_diagnosis did before diagnosis sessions."""
+    child = ChildRepository(session).get_child(child_id)
+    repository = DiagnosisRepository(session)
+    skill_types_age = {
+        result.skill_types_id: result.age_assessment
+        for result in repository.get_latest_diagnoses(child_id)
+    }
+    skill_history = repository.get_diagnosis_history(child_id)
+    skill_mastered = {}
+    if skill_history:
+        skill_history.sort(key=lambda el: el.date)
+        last_date = skill_history[-1].date
+        for el in skill_history:
+            if el.date == last_date:
+                skill_mastered[el.skill_id] = el.mastered
+    return {"child": child, "ages": skill_types_age, "mastered": skill_mastered}
+
+
+def _session_results(
+    child: ChildRead | None, last: DiagnosisSessionModel | None
+) -> dict:
+    """Results of the last completed session, empty without one."""
+    if last is None:
+        return {"child": child, "ages": {}, "mastered": {}}
+    return {
+        "child": child,
+        "ages": last.skill_types_age or {},
+        "mastered": last.answers(),
+    }
+
+
+def child_and_session(session: Session, child_id: int) -> dict:
+    """Reads the child and the last completed session with two queries."""
+    child = ChildRepository(session).get_child(child_id)
+    last = DiagnosisRepository(session).get_latest_diagnosis_session(child_id)
+    return _session_results(child, last)
+
+
+def summary(session: Session, child_id: int) -> dict:
+    """Reads the child and the last completed session with one statement."""
+    result = DiagnosisRepository(session).get_diagnosis_summary(child_id)
+    if result is None:
+        return _session_results(None, None)
+    child, last = result
+    return _session_results(child, last)
+
+
+METHODS: dict[str, Callable[[Session, int], dict]] = {
+    "history scan": history_scan,
+    "child + session": child_and_session,
+    "summary": summary,
+}
+
+
+def report(engine: Engine, repeat: int) -> None:
+    """Prints the statements and the median time of every method."""
+    child_id = CHILDREN // 2
+    statements: list[str] = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    expected = None
+    for name, method in METHODS.items():
+        timings = []
+        for _ in range(repeat):
+            with Session(engine) as session:
+                statements.clear()
+                started = time.perf_counter()
+                result = method(session, child_id)
+                timings.append((time.perf_counter() - started) * 1000)
+        if expected is None:
+            expected = result
+        assert result == expected, f"{name} read other results"
+        print(
+            f"-- {name}: {len(statements)} statements, "
+            f"{statistics.median(timings):.3f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_url_argument(parser)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--answers", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with scratch_engine(args.url) as engine:
+        started = time.perf_counter()
+        seed(engine, args.sessions, args.answers)
+        print(
+            f"seeded {CHILDREN} children with {args.sessions} diagnoses of "
+            f"{args.answers} answers in {time.perf_counter() - started:.1f}s"
+        )
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+        report(engine, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Query plans of the diagnosis hot paths with and without the composite indexes.
+
+Seeds a scratch database with children, skills and diagnosis history rows,
+then prints the plan and the median time of every query before and after
+the indexes of revision 5d2a8c4e9f13 are created.
+
+Runs on a scratch database, see src.benchmarks.seed:
+
+    python -m src.benchmarks.index_plans --rows 1000000
+    python -m src.benchmarks.index_plans --url postgresql://u:p@localhost/bench
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import time
+
+from sqlalchemy import Connection, Engine, Index, insert, select, text
+from sqlalchemy.sql import Select
+
+from src.benchmarks.seed import (
+    add_url_argument,
+    insert_batches,
+    recreate_tables,
+    scratch_engine,
+    seed_skills,
+)
+from src.models.database.models import (
+    Child,
+    DiagnosisHistory,
+    DiagnosisResult,
+    User,
+)
+
+INDEXES: tuple[Index, ...] = tuple(
+    index
+    for table in (Child, DiagnosisHistory, DiagnosisResult)
+    for index in table.__table__.indexes  # type: ignore[attr-defined]
+)
+
+USERS = 2_000
+CHILDREN = 5_000
+SKILL_TYPES = 8
+SKILLS = 400
+RESULTS_PER_CHILD = 24
+START_DATE = datetime.date(2024, 1, 1)
+DAYS = 730
+
+
+def seed(engine: Engine, history_rows: int) -> None:
+    """
+    Recreates the tables without the benchmarked indexes and fills them.
+
+    Args:
+        engine (Engine): Engine of the scratch database.
+        history_rows (int): Number of diagnosis_history rows to insert.
+    """
+    recreate_tables(engine)
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        for index in INDEXES:
+            index.drop(connection)
+
+        connection.execute(
+            insert(User), [{"id": i, "telegram_id": i} for i in range(1, USERS + 1)]
+        )
+        connection.execute(
+            insert(Child),
+            [
+                {
+                    "id": i,
+                    "user_id": rng.randint(1, USERS),
+                    "name": f"child {i}",
+                    "birth_date": START_DATE - datetime.timedelta(days=i % 1500),
+                }
+                for i in range(1, CHILDREN + 1)
+            ],
+        )
+        skill_types = seed_skills(connection, SKILL_TYPES, SKILLS)
+
+        history = (
+            {
+                "child_id": rng.randint(1, CHILDREN),
+                "skill_id": (skill_id := rng.randint(1, SKILLS)),
+                "skill_type_id": skill_types[skill_id],
+                "date": START_DATE + datetime.timedelta(days=rng.randrange(DAYS)),
+                "mastered": rng.random() < 0.7,
+            }
+            for _ in range(history_rows)
+        )
+        insert_batches(connection, DiagnosisHistory, history)
+
+        results = (
+            {
+                "child_id": child_id,
+                "skill_types_id": rng.randint(1, SKILL_TYPES),
+                "date": START_DATE + datetime.timedelta(days=rng.randrange(DAYS)),
+                "age_assessment": rng.randint(0, 72),
+            }
+            for child_id in range(1, CHILDREN + 1)
+            for _ in range(RESULTS_PER_CHILD)
+        )
+        insert_batches(connection, DiagnosisResult, results)
+
+
+def queries() -> dict[str, Select]:
+    """Statements of the repository methods that use the indexes."""
+    child_id = CHILDREN // 2
+    return {
+        "get_diagnosis": select(DiagnosisResult)
+        .where(DiagnosisResult.child_id == child_id)
+        .where(DiagnosisResult.skill_types_id == 1)
+        .order_by(DiagnosisResult.date.desc())
+        .limit(1),
+        "get_diagnosis_history": select(DiagnosisHistory).where(
+            DiagnosisHistory.child_id == child_id
+        ),
+        "mastered_skill": select(DiagnosisHistory.skill_id, DiagnosisHistory.mastered)
+        .where(DiagnosisHistory.child_id == child_id)
+        .order_by(DiagnosisHistory.date, DiagnosisHistory.id),
+        "get_children": select(Child).where(Child.user_id == USERS // 2),
+    }
+
+
+def explain(connection: Connection, statement: Select) -> list[str]:
+    """
+    Returns the query plan of a statement.
+
+    Args:
+        connection (Connection): Connection to the scratch database.
+        statement (Select): The statement to explain.
+
+    Returns:
+        list[str]: Lines of the plan.
+    """
+    sql = str(statement.compile(connection, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+        return [row[0] for row in rows]
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return [row[-1] for row in rows]
+    rows = connection.execute(text(f"EXPLAIN {sql}"))
+    return [" ".join(str(column) for column in row) for row in rows]
+
+
+def median_time(connection: Connection, statement: Select, repeat: int) -> float:
+    """Returns the median execution time of a statement in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def report(engine: Engine, title: str, repeat: int) -> None:
+    """Prints the plan and the median time of every benchmarked query."""
+    print(f"==== {title} ====")
+    with engine.connect() as connection:
+        for name, statement in queries().items():
+            elapsed = median_time(connection, statement, repeat)
+            print(f"-- {name}: {elapsed:.3f} ms")
+            for line in explain(connection, statement):
+                print(f"   {line}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_url_argument(parser)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with scratch_engine(args.url) as engine:
+        started = time.perf_counter()
+        seed(engine, args.rows)
+        print(
+            f"seeded {args.rows} history rows in {time.perf_counter() - started:.1f}s"
+        )
+
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+        report(engine, "without indexes", args.repeat)
+
+        with engine.begin() as connection:
+            for index in INDEXES:
+                index.create(connection)
+            connection.execute(text("ANALYZE"))
+        report(engine, "with indexes", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Scratch databases of the benchmarks.
+
+The benchmarks drop and recreate the tables of the target database, never
+point them to a database with data you want to keep. Without --url they run
+on a temporary SQLite file.
+"""
+
+import argparse
+import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Connection, Engine, create_engine, insert
+
+from src.models.database.models import Base, Skill, SkillType
+
+BATCH_SIZE = 50_000
+
+
+def add_url_argument(parser: argparse.ArgumentParser) -> None:
+    """Adds the --url option of the scratch database to a benchmark parser."""
+    parser.add_argument(
+        "--url",
+        help="URL of a scratch database, its tables are dropped and recreated; "
+        "a temporary SQLite file by default",
+    )
+
+
+@contextmanager
+def scratch_engine(url: str | None) -> Iterator[Engine]:
+    """
+    Creates the engine of the scratch database and disposes it afterwards.
+
+    Args:
+        url (str | None): URL of the database, None for a temporary SQLite file.
+
+    Yields:
+        Engine: Engine of the scratch database.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(url or f"sqlite:///{Path(directory) / 'bench.db'}")
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+def recreate_tables(engine: Engine) -> None:
+    """Drops and recreates all tables of the scratch database."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def insert_batches(
+    connection: Connection, table: type[Base], rows: Iterable[dict[str, Any]]
+) -> None:
+    """
+    Inserts rows with multi-row inserts of BATCH_SIZE rows.
+
+    Args:
+        connection (Connection): Connection to the scratch database.
+        table (type[Base]): The schema to insert into.
+        rows (Iterable[dict[str, Any]]): The rows, e.g. a generator.
+    """
+    for batch in batched(rows, BATCH_SIZE):
+        connection.execute(insert(table), batch)
+
+
+def seed_skills(
+    connection: Connection, skill_types: int, skills: int
+) -> dict[int, int]:
+    """
+    Inserts the skill types and the skills of the catalog.
+
+    Skill i belongs to skill type i % skill_types + 1 and its ages cycle
+    through the first six years.
+
+    Args:
+        connection (Connection): Connection to the scratch database.
+        skill_types (int): Number of skill types.
+        skills (int): Number of skills.
+
+    Returns:
+        dict[int, int]: Skill type id by skill id.
+    """
+    skill_type_ids = {i: i % skill_types + 1 for i in range(1, skills + 1)}
+    connection.execute(
+        insert(SkillType),
+        [{"id": i, "name": f"type {i}"} for i in range(1, skill_types + 1)],
+    )
+    connection.execute(
+        insert(Skill),
+        [
+            {
+                "id": i,
+                "skill_type_id": skill_type_ids[i],
+                "name": f"skill {i}",
+                "criteria": "",
+                "recommendation": "",
+                "age_start": i % 72,
+                "age_end": i % 72 + 2,
+                "age_actual": i % 72 + 1,
+            }
+            for i in range(1, skills + 1)
+        ],
+    )
+    return skill_type_ids
@@ -1,10 +1,8 @@
 import logging
-from datetime import date
 from typing import Any
 
 from data import TEXT, States
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update, error
-from telegram.ext import ContextTypes
 from utils import (
     birth_date,
     error_message,
@@ -12,45 +10,37 @@ from utils import (
     log_handler_errors,
 )
 
+from src.bot.session import SessionContext, SessionState, get_session
 from src.dependencies import (
-    get_child_service,
-    get_diagnosis_service,
-    get_recommendation_service,
-    get_user_service,
+    get_async_child_service,
+    get_async_diagnosis_service,
+    get_async_recommendation_service,
+    get_async_user_service,
 )
 
 
 @log_handler_errors
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def start(update: Update, context: SessionContext) -> Any:
     """
     Start a dialogue and display a menu.
 
     """
     try:
         message = update.message or update.callback_query.message
-        service = get_user_service()
-        context.user_data.update(
-            {
-                "user": None,
-                "current_questions": 0,
-                "children": None,
-                "current_child": None,
-                "current_date": None,
-            }
-        )
+        service = get_async_user_service()
+        get_session(context).reset()
         telegram_id = update.effective_user.id
-        user = service.get_user_by_telegram_id(telegram_id=telegram_id)
-        context.user_data["user"] = user
+        user = await service.get_user_by_telegram_id(telegram_id=telegram_id)
         if user:
             username = update.effective_user.full_name
             await message.reply_text(f"Привествуем,{username}")
             await message.reply_text(TEXT["greetings"])
         else:
-            user = service.register_user(telegram_id=telegram_id)
-            context.user_data["user"] = user
+            user = await service.register_user(telegram_id=telegram_id)
             await message.reply_text(
                 f"{update.effective_user.full_name}, Вы зарегистрированы"
             )
+        get_session(context).user_id = user.id
 
         menu_keyboard = ["Инструкция", "Диагностика"]
 
@@ -66,8 +56,19 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
     return States.START.value
 
 
+async def session_expired(update: Update, context: SessionContext) -> Any:
+    """
+    Return to the start when the session lost the ids a handler needs,
+    e.g. after a reset of the bot data.
+
+    """
+    message = await get_message(update)
+    await message.reply_text("Сессия устарела, возвращаемся к началу")
+    return await start(update, context)
+
+
 @log_handler_errors
-async def handle_menu_choice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def handle_menu_choice(update: Update, context: SessionContext) -> Any:
     """
     Processing user selection in the menu.
 
@@ -87,15 +88,18 @@ async def handle_menu_choice(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 @log_handler_errors
-async def choice_child(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def choice_child(update: Update, context: SessionContext) -> Any:
     """
     Child selection menu
 
     """
     query = update.callback_query
     await query.answer()
-    service = get_child_service()
-    children = service.get_children(context.user_data["user"].id)
+    user_id = get_session(context).user_id
+    if user_id is None:
+        return await session_expired(update, context)
+    service = get_async_child_service()
+    children = await service.get_children(user_id)
     keyboard = ["Выбрать", "Добавить"] if len(children) > 0 else ["Добавить"]
     await query.edit_message_text(
         text="Выберете или добавьте данные ребенка:",
@@ -106,15 +110,13 @@ async def choice_child(update: Update, context: ContextTypes.DEFAULT_TYPE) -> An
 
 
 @log_handler_errors
-async def handle_choice_child(
-    update: Update, context: ContextTypes.DEFAULT_TYPE
-) -> Any:
+async def handle_choice_child(update: Update, context: SessionContext) -> Any:
     """
     Processing child selection in the menu.
 
     """
     query = update.callback_query
-    service = get_child_service()
+    service = get_async_child_service()
     await query.answer()
     choice = query.data
 
@@ -122,7 +124,10 @@ async def handle_choice_child(
         return await handle_add_child(update, context)
 
     elif choice == "Выбрать":
-        children = service.get_children(context.user_data["user"].id)
+        user_id = get_session(context).user_id
+        if user_id is None:
+            return await session_expired(update, context)
+        children = await service.get_children(user_id)
 
         buttons = [
             InlineKeyboardButton(
@@ -139,20 +144,19 @@ async def handle_choice_child(
         return States.CHOICE_CHILD
 
     elif type(choice) == int:
-        child_id = choice
-        context.user_data["current_child"] = child_id
-        context.user_data["current_questions"] = 0
+        get_session(context).select_child(choice)
 
         return await ask_question(update, context)
 
 
 @log_handler_errors
-async def handle_add_child(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def handle_add_child(update: Update, context: SessionContext) -> Any:
     """
     Adding child's name
 
     """
-    context.user_data["child"] = {}
+    get_session(context).new_child_name = None
+    get_session(context).new_child_birth_date = None
     query = update.callback_query
     await query.edit_message_text(text="Введите имя ребенка")
 
@@ -160,13 +164,13 @@ async def handle_add_child(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
 
 @log_handler_errors
-async def handle_add_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def handle_add_name(update: Update, context: SessionContext) -> Any:
     """
     Processing adding child's name
 
     """
     user_input = update.message.text
-    context.user_data["child"]["name"] = user_input
+    get_session(context).new_child_name = user_input
     await update.message.reply_text(
         "Введите дату рождения ребенка в формате ДД.ММ.ГГГГ"
     )
@@ -175,31 +179,35 @@ async def handle_add_name(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 
 @log_handler_errors
-async def handle_add_date(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def handle_add_date(update: Update, context: SessionContext) -> Any:
     """
     Adding child's birth date
 
     """
-    service = get_child_service()
+    service = get_async_child_service()
     user_input = update.message.text
-    context.user_data["child"]["date"] = birth_date(user_input)
-    service.add_child(
-        user_id=context.user_data["user"].id,
-        name=context.user_data["child"]["name"],
-        birth_date=context.user_data["child"]["date"],
+    session = get_session(context)
+    if session.user_id is None or session.new_child_name is None:
+        return await session_expired(update, context)
+    session.new_child_birth_date = birth_date(user_input)
+    await service.add_child(
+        user_id=session.user_id,
+        name=session.new_child_name,
+        birth_date=session.new_child_birth_date,
     )
 
     if update.message:
         await update.message.reply_text(
-            f"Ребенок {context.user_data['child']['name']} с датой {context.user_data['child']['date']} добавлен"
+            f"Ребенок {session.new_child_name} с датой {session.new_child_birth_date} добавлен"
         )
     else:
         await update.callback_query.message.reply_text(
-            f"Ребенок {context.user_data['child']['name']} с датой {context.user_data['child']['date']} добавлен"
+            f"Ребенок {session.new_child_name} с датой {session.new_child_birth_date} добавлен"
         )
 
-    context.user_data["current_questions"] = 0
-    context.user_data["child"] = {}
+    session.question_index = 0
+    session.new_child_name = None
+    session.new_child_birth_date = None
 
     keyboard = ["Выбрать", "Добавить"]
     await update.message.reply_text(
@@ -209,23 +217,44 @@ async def handle_add_date(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     return States.CHOICE_CHILD
 
 
+async def get_diagnosis_id(session: SessionState, child_id: int) -> int:
+    """
+    Id of the diagnosis session, opened on the first answer
+
+    Loading the questions does not open a session, so a questionnaire left
+    before the first answer leaves no session behind.
+    """
+    if session.diagnosis_id is None:
+        diagnosis = await get_async_diagnosis_service().open_session(child_id)
+        session.diagnosis_id = diagnosis.id
+    return session.diagnosis_id
+
+
 @log_handler_errors
-async def ask_question(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def ask_question(update: Update, context: SessionContext) -> Any:
     """
     Output of questions by list and get answer
 
     """
     try:
         message = await get_message(update)
-        current_question = context.user_data.get("current_questions", 0)
-        service = get_diagnosis_service()
-        questions = service.start_diagnosis(context.user_data["current_child"])
-        context.user_data["questions"] = questions
+        session = get_session(context)
+        current_question = session.question_index
+        questions = session.questions
+        # Вопросы загружаются один раз за диагностику и сбрасываются
+        # при выборе другого ребенка или перезапуске
+        if questions is None:
+            if session.child_id is None:
+                return await session_expired(update, context)
+            questions = await get_async_diagnosis_service().get_questionnaire(
+                session.child_id
+            )
+            session.questions = questions
 
         if current_question < len(questions):
-            skill = questions[current_question]
+            question = questions[current_question]
             await message.reply_text(
-                text=f" {skill.criteria}",
+                text=f" {question.criteria}",
                 reply_markup=build_keyboard(["Выполнил", "Не выполнил"]),
             )
 
@@ -239,7 +268,7 @@ async def ask_question(update: Update, context: ContextTypes.DEFAULT_TYPE) -> An
 
 
 @log_handler_errors
-async def handle_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def handle_answer(update: Update, context: SessionContext) -> Any:
     """
     Processing the answer to the questions
 
@@ -248,10 +277,10 @@ async def handle_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> A
         query = update.callback_query
         await query.answer()
 
-        child_id = context.user_data["current_child"]
+        session = get_session(context)
+        child_id = session.child_id
         if not child_id:
-            await query.message.reply_text("Сессия устарела, возвращаемся к началу")
-            return await start(update, context)
+            return await session_expired(update, context)
 
         answer_data = {"Выполнил": True, "Не выполнил": False}
         user_answer = query.data
@@ -262,23 +291,24 @@ async def handle_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> A
                 "Ошибка в получении ответа, возвращаемся к вопросу"
             )
             return await ask_question(update, context)
-        service = get_diagnosis_service()
-        questions = context.user_data["questions"]
+        service = get_async_diagnosis_service()
+        questions = session.questions
         if not questions:
             query.message.reply_text(
                 "Ошибка в формировании вопросов, возвращаемся к началу"
             )
             return await start(update, context)
 
-        current_question = context.user_data.get("current_questions", 0)
+        question = questions[session.question_index]
         answer = answer_data[user_answer]
-        service.submit_question(
+        await service.queue_answer(
             child_id=child_id,
-            skill_id=questions[current_question].id,
-            skill_type=questions[current_question].skill_type_id,
+            skill_id=question.skill_id,
+            skill_type=question.skill_type_id,
             answer=answer,
+            session_id=await get_diagnosis_id(session, child_id),
         )
-        context.user_data["current_questions"] += 1
+        session.question_index += 1
         return await ask_question(update, context)
 
     except error.BadRequest as e:
@@ -287,7 +317,7 @@ async def handle_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> A
 
 
 @log_handler_errors
-async def instruction(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def instruction(update: Update, context: SessionContext) -> Any:
     """
     Output istructions
 
@@ -307,63 +337,44 @@ async def instruction(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any
 
 
 @log_handler_errors
-async def result(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def result(update: Update, context: SessionContext) -> Any:
     """
     Result output from user's poll
 
     """
     try:
         message = await get_message(update)
-        service = get_diagnosis_service()
-        child_id = context.user_data["current_child"]
-        current_date: date = date.today()
+        session = get_session(context)
+        child_id = session.child_id
         if not child_id:
             await message.reply_text("Ребенок не найден, вернёмся к началу")
             return await start(update, context)
-        result = service._get_diagnosis_results(child_id=child_id)
-        service.save_diagnosis(child_id=child_id, result=result)
-        recommendations = list(
-            get_recommendation_service().get_recommendations(
-                child_id=child_id, date=current_date
-            )
-        )
-        logging.info(recommendations)
-
-        if not recommendations:
-            await message.reply_text("Рекомендации не найдены")
-            return States.RESULT
-
-        if "current_recommend_index" not in context.user_data:
-            context.user_data["current_recommend_index"] = 0
-
-        current_index = context.user_data.get("current_recommend_index", 0)
-        keyboard = [
-            InlineKeyboardButton("История", callback_data="history"),
-            InlineKeyboardButton("Старт", callback_data="start"),
-        ]
 
-        if current_index == 0:
+        # Результат считается и сохраняется один раз за диагностику,
+        # дальше по рекомендациям только листаем
+        if session.recommendations is None:
+            if session.questions is None:
+                await message.reply_text("Сессия устарела, возвращаемся к началу")
+                return await start(update, context)
             await message.reply_text(text="Идёт подсчёт результата")
-
-        if current_index < len(recommendations):
-            item = recommendations[current_index]
-            await message.reply_text(
-                f"{item}",
-                reply_markup=InlineKeyboardMarkup(
-                    [[InlineKeyboardButton("Продолжить", callback_data="next")]]
-                ),
+            diagnosis_id = await get_diagnosis_id(session, child_id)
+            await get_async_diagnosis_service().complete_diagnosis(
+                session_id=diagnosis_id
             )
-            context.user_data["current_recommend_index"] += 1
-
-        else:
-            await message.reply_text(
-                text=f"Опрос завершен. Спасибо!",
-                reply_markup=InlineKeyboardMarkup.from_row(keyboard),
+            recommendations = (
+                await get_async_recommendation_service().get_recommendations(
+                    child_id=child_id, session_id=diagnosis_id
+                )
             )
-            context.user_data["current_recommend_index"] = 0
+            session.recommendations = recommendations
+            session.recommend_index = 0
+            logging.info(recommendations)
+
+        if not session.recommendations:
+            await message.reply_text("Рекомендации не найдены")
             return States.RESULT
 
-        return States.RESULT
+        return await show_recommendation(update, context)
     except Exception as e:
         logging.error(f"Error in result is {e}")
         await error_message(update)
@@ -371,7 +382,45 @@ async def result(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
 
 
 @log_handler_errors
-async def handle_result(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def show_recommendation(update: Update, context: SessionContext) -> Any:
+    """
+    Output of the next recommendation of the completed diagnosis
+
+    """
+    message = await get_message(update)
+    session = get_session(context)
+    recommendations = session.recommendations or ()
+    current_index = session.recommend_index
+    keyboard = [
+        InlineKeyboardButton("История", callback_data="history"),
+        InlineKeyboardButton("Старт", callback_data="start"),
+    ]
+
+    if current_index < len(recommendations):
+        service = get_async_recommendation_service()
+        texts = await service.get_recommendation_texts(
+            recommendations[current_index : current_index + 1]
+        )
+        item = texts[0] if texts else "Рекомендация больше недоступна"
+        await message.reply_text(
+            f"{item}",
+            reply_markup=InlineKeyboardMarkup(
+                [[InlineKeyboardButton("Продолжить", callback_data="next")]]
+            ),
+        )
+        session.recommend_index += 1
+    else:
+        await message.reply_text(
+            text=f"Опрос завершен. Спасибо!",
+            reply_markup=InlineKeyboardMarkup.from_row(keyboard),
+        )
+        session.recommend_index = 0
+
+    return States.RESULT
+
+
+@log_handler_errors
+async def handle_result(update: Update, context: SessionContext) -> Any:
     """
     Processing result selections
 
@@ -381,7 +430,7 @@ async def handle_result(update: Update, context: ContextTypes.DEFAULT_TYPE) -> A
     choice = query.data
 
     if choice == "next":
-        return await result(update, context)
+        return await show_recommendation(update, context)
 
     elif choice == "history":
         return await history(update, context)
@@ -395,7 +444,7 @@ async def handle_result(update: Update, context: ContextTypes.DEFAULT_TYPE) -> A
 
 # TODO
 @log_handler_errors
-async def history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+async def history(update: Update, context: SessionContext) -> Any:
     """
     Output history of polls
 
@@ -444,7 +493,7 @@ def build_keyboard(  # type: ignore
     return InlineKeyboardMarkup.from_row(buttons)
 
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def help_command(update: Update, context: SessionContext) -> None:
     """Displays info on how to use the bot."""
 
     await update.message.reply_text(
@@ -7,15 +7,31 @@ from telegram.ext import (
     Application,
     CallbackQueryHandler,
     CommandHandler,
+    ContextTypes,
     ConversationHandler,
     MessageHandler,
     PersistenceInput,
-    PicklePersistence,
     filters,
 )
 
 import src.bot.handlers as handlers
+from src.bot.persistence import (
+    IncrementalPersistence,
+    PersistenceStore,
+    PostgresPersistenceStore,
+    SQLitePersistenceStore,
+    import_pickle_persistence,
+)
+from src.bot.session import SessionState, measure_sessions
+from src.bot.updates import ConversationUpdateProcessor
 from src.config import settings
+from src.dependencies import (
+    engine,
+    get_async_diagnosis_service,
+    max_concurrent_updates,
+    service_scope,
+    thread_pool_runner,
+)
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
@@ -24,19 +40,67 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 TOKEN = settings.app_config.bot.get_token
+ANSWER_FLUSH_INTERVAL = settings.app_config.service.answer_buffer_seconds
+SESSION_CLEANUP_INTERVAL = 24 * 60 * 60
+# Файл PicklePersistence прежних версий бота
+LEGACY_PERSISTENCE_PATH = "src/bot/databot"
+
+
+async def flush_answers(force: bool = False) -> None:
+    """Запись буферизованных ответов диагностики в базу"""
+    try:
+        async with service_scope():
+            await get_async_diagnosis_service().flush_due_answers(force=force)
+    except Exception as e:
+        logger.error(f"Ошибка при записи ответов: {e}")
+
+
+async def flush_answers_periodically() -> None:
+    """Периодическая запись ответов, ожидающих дольше порога"""
+    while True:
+        await asyncio.sleep(ANSWER_FLUSH_INTERVAL)
+        await flush_answers()
+
+
+async def delete_empty_sessions_periodically() -> None:
+    """Ежедневное удаление сессий диагностики, брошенных до первого ответа"""
+    while True:
+        try:
+            async with service_scope():
+                await get_async_diagnosis_service().delete_empty_sessions()
+        except Exception as e:
+            logger.error(f"Ошибка при удалении пустых сессий: {e}")
+        await asyncio.sleep(SESSION_CLEANUP_INTERVAL)
+
+
+def create_persistence_store() -> PersistenceStore:
+    """Хранилище состояния диалогов, выбранное в настройках бота"""
+    if settings.app_config.bot.persistence == "postgres":
+        return PostgresPersistenceStore(engine)
+    return SQLitePersistenceStore(settings.app_config.bot.persistence_path)
 
 
 async def main() -> None:
     """Запуск бота."""
     store_data = PersistenceInput(chat_data=True, user_data=True, bot_data=True)
-    persistence = PicklePersistence(
-        filepath="src/bot/databot", store_data=store_data, update_interval=5
+    store = create_persistence_store()
+    imported = import_pickle_persistence(
+        LEGACY_PERSISTENCE_PATH, store, SessionState.from_legacy
+    )
+    if imported:
+        logger.info(f"Импортировано записей из {LEGACY_PERSISTENCE_PATH}: {imported}")
+    persistence = IncrementalPersistence(
+        store,
+        store_data=store_data,
+        update_interval=settings.app_config.bot.persistence_interval,
     )
     application = (
         Application.builder()
         .token(TOKEN)
         .persistence(persistence)
+        .context_types(ContextTypes(user_data=SessionState))
         .arbitrary_callback_data(True)
+        .concurrent_updates(ConversationUpdateProcessor(max_concurrent_updates))
         .build()
     )
 
@@ -81,6 +145,8 @@ async def main() -> None:
     application.add_handler(CommandHandler("help", handlers.help_command))
 
     running = True  # определение состояния, что бот работает
+    flusher = asyncio.create_task(flush_answers_periodically())
+    cleaner = asyncio.create_task(delete_empty_sessions_periodically())
 
     async def shutdown() -> None:
         """Корректное завершение работы"""
@@ -95,6 +161,16 @@ async def main() -> None:
             await application.update_persistence()
             if application.running:
                 await application.stop()
+            flusher.cancel()
+            cleaner.cancel()
+            await flush_answers(force=True)
+            if thread_pool_runner is not None:
+                thread_pool_runner.shutdown()
+            logger.info(f"Запись состояния: {persistence.metrics.snapshot()}")
+            logger.info(
+                f"Размер сессий: {measure_sessions(application.user_data.values())}"
+            )
+            persistence.store.close()
         except Exception as e:
             logger.error(f"Ошибка при завершении: {e}")
         finally:
@@ -0,0 +1,376 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import Engine, delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as psql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from telegram.ext import BasePersistence, PersistenceInput
+
+from src.models.database.models import BotPersistence
+
+logger = logging.getLogger(__name__)
+
+# Persisted data types of python-telegram-bot, which keeps them private
+ConversationKey = tuple[int | str, ...]
+ConversationDict = dict[ConversationKey, object]
+CDCData = tuple[list[tuple[str, float, dict[str, Any]]], dict[str, str]]
+
+# (kind, key, pickled data); data None deletes the entry
+Entry = tuple[str, str, bytes | None]
+
+USER_DATA = "user_data"
+CHAT_DATA = "chat_data"
+BOT_DATA = "bot_data"
+CALLBACK_DATA = "callback_data"
+CONVERSATION = "conversation:"
+
+
+class PersistenceStore(ABC):
+    """Key-value storage of pickled persistence entries."""
+
+    @abstractmethod
+    def load(self, kind: str) -> dict[str, bytes]:
+        """
+        Loads all entries of a kind.
+
+        Args:
+            kind (str): Kind of the entries, e.g. user_data.
+
+        Returns:
+            dict[str, bytes]: Pickled data by key.
+        """
+
+    @abstractmethod
+    def write(self, entries: Sequence[Entry]) -> None:
+        """
+        Upserts and deletes entries in one transaction.
+
+        Args:
+            entries (Sequence[Entry]): Entries to write, None data deletes them.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases the resources of the store."""
+
+
+class SQLitePersistenceStore(PersistenceStore):
+    """Stores the entries in a SQLite file in WAL mode."""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS bot_persistence ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, data BLOB NOT NULL, "
+            "PRIMARY KEY (kind, key))"
+        )
+        self._connection.commit()
+
+    def load(self, kind: str) -> dict[str, bytes]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, data FROM bot_persistence WHERE kind = ?", (kind,)
+            )
+            return dict(rows.fetchall())
+
+    def write(self, entries: Sequence[Entry]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO bot_persistence (kind, key, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (kind, key) DO UPDATE SET data = excluded.data",
+                [entry for entry in entries if entry[2] is not None],
+            )
+            self._connection.executemany(
+                "DELETE FROM bot_persistence WHERE kind = ? AND key = ?",
+                [(kind, key) for kind, key, data in entries if data is None],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class PostgresPersistenceStore(PersistenceStore):
+    """Stores the entries in the bot_persistence table of the database."""
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+
+    def load(self, kind: str) -> dict[str, bytes]:
+        query = select(BotPersistence.key, BotPersistence.data).where(
+            BotPersistence.kind == kind
+        )
+        with self._engine.connect() as connection:
+            return {key: data for key, data in connection.execute(query)}
+
+    def write(self, entries: Sequence[Entry]) -> None:
+        upserts = [
+            {"kind": kind, "key": key, "data": data}
+            for kind, key, data in entries
+            if data is not None
+        ]
+        deletes = [(kind, key) for kind, key, data in entries if data is None]
+        insert = (
+            psql_insert if self._engine.dialect.name == "postgresql" else sqlite_insert
+        )
+        with self._engine.begin() as connection:
+            if upserts:
+                statement = insert(BotPersistence).values(upserts)
+                connection.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[BotPersistence.kind, BotPersistence.key],
+                        set_={"data": statement.excluded.data},
+                    )
+                )
+            if deletes:
+                connection.execute(
+                    delete(BotPersistence).where(
+                        tuple_(BotPersistence.kind, BotPersistence.key).in_(deletes)
+                    )
+                )
+
+    def close(self) -> None:
+        """The engine is shared with the repositories and disposed with them."""
+
+
+class PersistenceMetrics:
+    """Counters of the flushes of IncrementalPersistence."""
+
+    def __init__(self) -> None:
+        self.flushes = 0
+        self.entries_written = 0
+        self.bytes_written = 0
+        self.last_latency = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record_flush(self, entries: int, written: int, latency: float) -> None:
+        """
+        Records a flush.
+
+        Args:
+            entries (int): Number of upserted and deleted entries.
+            written (int): Bytes of pickled data written.
+            latency (float): Seconds the write took.
+        """
+        self.flushes += 1
+        self.entries_written += entries
+        self.bytes_written += written
+        self.last_latency = latency
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current counters.
+
+        Returns:
+            dict: flushes, entries_written, bytes_written and the last, max and
+            avg flush latency in seconds.
+        """
+        return {
+            "flushes": self.flushes,
+            "entries_written": self.entries_written,
+            "bytes_written": self.bytes_written,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "avg_latency": self.total_latency / self.flushes if self.flushes else 0.0,
+        }
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class IncrementalPersistence(BasePersistence[Any, dict, dict]):
+    """Persistence that writes only the entries changed since the last flush.
+
+    Every user, chat and conversation is pickled into its own entry of a
+    PersistenceStore. Updates whose pickle did not change since the last
+    write are skipped; the remaining ones are collected and written in one
+    transaction right after the update_persistence run that produced them.
+    """
+
+    def __init__(
+        self,
+        store: PersistenceStore,
+        store_data: PersistenceInput | None = None,
+        update_interval: float = 5,
+    ) -> None:
+        super().__init__(store_data=store_data, update_interval=update_interval)
+        self.store = store
+        self.metrics = PersistenceMetrics()
+        self._dirty: dict[tuple[str, str], bytes | None] = {}
+        self._digests: dict[tuple[str, str], bytes] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def _load(self, kind: str) -> dict[str, Any]:
+        entries = await asyncio.to_thread(self.store.load, kind)
+        for key, data in entries.items():
+            self._digests[kind, key] = _digest(data)
+        return {key: pickle.loads(data) for key, data in entries.items()}
+
+    def _mark(self, kind: str, key: str, value: Any) -> None:
+        if value is None:
+            self._dirty[kind, key] = None
+        else:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if self._digests.get((kind, key)) == _digest(data):
+                self._dirty.pop((kind, key), None)
+                return
+            self._dirty[kind, key] = data
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        # Lets the other updates of the same update_persistence run join the write
+        await asyncio.sleep(0)
+        while True:
+            try:
+                await self.flush()
+                return
+            except Exception:
+                # The entries stay dirty, changes made meanwhile join the retry
+                logger.exception(
+                    f"Ошибка записи состояния, повтор через {self.update_interval} с"
+                )
+                await asyncio.sleep(self.update_interval)
+
+    async def get_user_data(self) -> dict[int, Any]:
+        data = await self._load(USER_DATA)
+        return {int(key): value for key, value in data.items()}
+
+    async def get_chat_data(self) -> dict[int, dict]:
+        data = await self._load(CHAT_DATA)
+        return {int(key): value for key, value in data.items()}
+
+    async def get_bot_data(self) -> dict:
+        data = await self._load(BOT_DATA)
+        return data.get("", {})
+
+    async def get_callback_data(self) -> CDCData | None:
+        data = await self._load(CALLBACK_DATA)
+        return data.get("")
+
+    async def get_conversations(self, name: str) -> ConversationDict:
+        data = await self._load(CONVERSATION + name)
+        return {tuple(json.loads(key)): state for key, state in data.items()}
+
+    async def update_conversation(
+        self, name: str, key: ConversationKey, new_state: object | None
+    ) -> None:
+        self._mark(CONVERSATION + name, json.dumps(key), new_state)
+
+    async def update_user_data(self, user_id: int, data: Any) -> None:
+        self._mark(USER_DATA, str(user_id), data)
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        self._mark(CHAT_DATA, str(chat_id), data)
+
+    async def update_bot_data(self, data: dict) -> None:
+        self._mark(BOT_DATA, "", data)
+
+    async def update_callback_data(self, data: CDCData) -> None:
+        self._mark(CALLBACK_DATA, "", data)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._mark(USER_DATA, str(user_id), None)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._mark(CHAT_DATA, str(chat_id), None)
+
+    async def refresh_user_data(self, user_id: int, user_data: Any) -> None:
+        """The bot is the only writer of the store, nothing to refresh."""
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        """The bot is the only writer of the store, nothing to refresh."""
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        """The bot is the only writer of the store, nothing to refresh."""
+
+    async def flush(self) -> None:
+        """Writes the changed entries to the store in one transaction."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, {}
+            entries = [(kind, key, data) for (kind, key), data in dirty.items()]
+
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.store.write, entries)
+            except Exception:
+                # Keep newer changes made during the write
+                self._dirty = dirty | self._dirty
+                raise
+            latency = time.perf_counter() - started
+
+            for (kind, key), data in dirty.items():
+                if data is None:
+                    self._digests.pop((kind, key), None)
+                else:
+                    self._digests[kind, key] = _digest(data)
+            self.metrics.record_flush(
+                len(entries), sum(len(data or b"") for data in dirty.values()), latency
+            )
+
+
+def import_pickle_persistence(
+    path: str,
+    store: PersistenceStore,
+    convert_user_data: Callable[[Any], Any] = lambda data: data,
+) -> int:
+    """
+    Imports the user, chat and bot data of a PicklePersistence file.
+
+    The import runs only while the store holds no user, chat or bot data, so
+    it happens once. Conversations and callback data are not imported: they
+    point into the user data of the old format, so users restart with /start.
+
+    Args:
+        path (str): Path of the single file written by PicklePersistence.
+        store (PersistenceStore): The empty store to fill.
+        convert_user_data (Callable): Converts the user data of one user.
+
+    Returns:
+        int: Number of imported entries, 0 if nothing was imported.
+    """
+    if not os.path.exists(path):
+        return 0
+    if any(store.load(kind) for kind in (USER_DATA, CHAT_DATA, BOT_DATA)):
+        return 0
+
+    with open(path, "rb") as file:
+        data = pickle.load(file)
+
+    def dump(value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    entries: list[Entry] = [
+        (USER_DATA, str(user_id), dump(convert_user_data(value)))
+        for user_id, value in (data.get("user_data") or {}).items()
+    ]
+    entries.extend(
+        (CHAT_DATA, str(chat_id), dump(value))
+        for chat_id, value in (data.get("chat_data") or {}).items()
+    )
+    if data.get("bot_data"):
+        entries.append((BOT_DATA, "", dump(data["bot_data"])))
+    if entries:
+        store.write(entries)
+    return len(entries)
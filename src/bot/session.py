@@ -0,0 +1,128 @@
+import pickle
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from telegram.ext import CallbackContext, ExtBot
+
+from src.models.domain.models import Question
+
+
+@dataclass(slots=True)
+class SessionState:
+    """Состояние диалога пользователя, хранимое в context.user_data
+
+    Хранит только идентификаторы и курсоры, модели загружаются через сервисы.
+
+    Attributes:
+        user_id: id пользователя в базе
+        child_id: id ребенка, проходящего диагностику
+        questions: снимок вопросов диагностики
+        diagnosis_id: id сессии диагностики, к которой относятся ответы
+        question_index: номер текущего вопроса
+        recommendations: id навыков с рекомендациями завершенной диагностики
+        recommend_index: номер текущей рекомендации
+        new_child_name: имя добавляемого ребенка
+        new_child_birth_date: дата рождения добавляемого ребенка
+    """
+
+    user_id: int | None = None
+    child_id: int | None = None
+    questions: tuple[Question, ...] | None = None
+    diagnosis_id: int | None = None
+    question_index: int = 0
+    recommendations: tuple[int, ...] | None = None
+    recommend_index: int = 0
+    new_child_name: str | None = None
+    new_child_birth_date: date | None = None
+
+    @classmethod
+    def from_legacy(cls, data: Any) -> "SessionState":
+        """Перенос user_data старого формата: пользователь и выбранный ребенок"""
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, Mapping):
+            return cls()
+        user = data.get("user")
+        return cls(
+            user_id=getattr(user, "id", None), child_id=data.get("current_child")
+        )
+
+    def reset(self) -> None:
+        """Сброс диагностики при перезапуске"""
+        self.child_id = None
+        self.questions = None
+        self.diagnosis_id = None
+        self.question_index = 0
+        self.recommendations = None
+        self.recommend_index = 0
+        self.new_child_name = None
+        self.new_child_birth_date = None
+
+    def select_child(self, child_id: int) -> None:
+        """Выбор ребенка, снимок вопросов предыдущего ребенка сбрасывается"""
+        self.child_id = child_id
+        self.questions = None
+        self.diagnosis_id = None
+        self.question_index = 0
+        self.recommendations = None
+        self.recommend_index = 0
+
+
+SessionContext = CallbackContext[ExtBot[None], SessionState, dict, dict]
+
+
+def get_session(context: SessionContext) -> SessionState:
+    """
+    Returns the session of the user of the update.
+
+    context.user_data is typed optional because updates without a user have
+    no user data; every handler of the bot serves a user.
+
+    Args:
+        context (SessionContext): Context of the handled update.
+
+    Raises:
+        ValueError: If the update has no user.
+
+    Returns:
+        SessionState: The session of the user.
+    """
+    session = context.user_data
+    if session is None:
+        raise ValueError("Update without a user has no session")
+    return session
+
+
+def session_size(session: Any) -> int:
+    """
+    Returns the size of the pickled session, as written by the persistence.
+
+    Args:
+        session: SessionState or a legacy user_data dict.
+
+    Returns:
+        int: Size in bytes.
+    """
+    return len(pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def measure_sessions(sessions: Iterable[Any]) -> dict[str, Any]:
+    """
+    Reports the pickled size of user sessions.
+
+    Args:
+        sessions (Iterable): SessionState objects or legacy user_data dicts,
+            e.g. the values of application.user_data.
+
+    Returns:
+        dict: sessions, total_bytes, avg_bytes and max_bytes.
+    """
+    sizes = [session_size(session) for session in sessions]
+    return {
+        "sessions": len(sizes),
+        "total_bytes": sum(sizes),
+        "avg_bytes": sum(sizes) / len(sizes) if sizes else 0.0,
+        "max_bytes": max(sizes, default=0),
+    }
@@ -0,0 +1,65 @@
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# (chat id, user id) of an update, the key of its ConversationHandler state
+UpdateKey = tuple[int | None, int | None]
+
+
+class ConversationUpdateProcessor(BaseUpdateProcessor):
+    """Processes the updates of different users concurrently, and the updates
+    of one chat and user one at a time, in the order they arrived.
+
+    ConversationHandler reads the state of a conversation and the handlers
+    read the SessionState of the user before they update them, so two updates
+    of one conversation handled at once would both see the old state, e.g.
+    two quick taps answering the same question.
+    """
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+        super().__init__(max_concurrent_updates)
+        self._locks: dict[UpdateKey, asyncio.Lock] = {}
+        self._waiting: dict[UpdateKey, int] = {}
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """
+        Waits for the earlier updates of the chat and user, then processes
+        the update within the max_concurrent_updates limit.
+
+        Args:
+            update (object): The update to process.
+            coroutine (Awaitable): The coroutine processing the update.
+        """
+        if not isinstance(update, Update):
+            await super().process_update(update, coroutine)
+            return
+        key = (
+            update.effective_chat.id if update.effective_chat else None,
+            update.effective_user.id if update.effective_user else None,
+        )
+        # The lock is taken before a slot of the semaphore, so the queued
+        # updates of one user do not keep the other users waiting
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with lock:
+                await super().process_update(update, coroutine)
+        finally:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:
+                del self._waiting[key]
+                del self._locks[key]
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
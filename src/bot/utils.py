@@ -8,6 +8,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from src.bot.data import States
+from src.dependencies import service_scope
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -52,24 +53,30 @@ def log_handler_errors(handler_func: Callable) -> Callable:
     - Start work handler
     - Success work
     - Raise errors
+
+    The handler runs inside the service scope of the update. In async mode
+    all services it uses (including nested handlers) share one session that
+    is closed when the outermost handler returns; in threadpool mode every
+    service call runs in the thread pool with its own session.
     """
 
     @wraps(handler_func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
         handler_name = handler_func.__name__
 
-        try:
-            logger.info(f"Обработчик '{handler_name}' начал выполнение")
-            result = await handler_func(update, context)
-            logger.info(f"Обработчик '{handler_name}' успешно завершился")
-            return result
-
-        except Exception as e:
-            logger.error(
-                f"Ошибка в обработчике '{handler_name}': {str(e)}",
-                exc_info=True,
-            )
-            await error_message(update)
-            return States.START
+        async with service_scope():
+            try:
+                logger.info(f"Обработчик '{handler_name}' начал выполнение")
+                result = await handler_func(update, context)
+                logger.info(f"Обработчик '{handler_name}' успешно завершился")
+                return result
+
+            except Exception as e:
+                logger.error(
+                    f"Ошибка в обработчике '{handler_name}': {str(e)}",
+                    exc_info=True,
+                )
+                await error_message(update)
+                return States.START
 
     return wrapper
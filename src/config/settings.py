@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,6 +12,9 @@ class DBSettings(BaseSettings):
     postgres_host: str
     postgres_port: int
     driver: str
+    async_driver: str = "postgresql+asyncpg"
+    pool_size: int = 20
+    max_overflow: int = 20
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -28,11 +33,31 @@ class DBSettings(BaseSettings):
             f"{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def async_db_url(self) -> str:
+        """
+        Constructs the database URL of the async driver.
+
+        Returns:
+            str: The async database URL.
+        """
+        return (
+            f"{self.async_driver}://{self.postgres_user}:"
+            f"{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+        )
+
 
 class BotSettings(BaseSettings):
-    """Bots settings"""
+    """Bots settings
+
+    Conversation state is persisted in a SQLite file at persistence_path or,
+    with persistence="postgres", in the bot_persistence table of the database.
+    """
 
     token: str
+    persistence: Literal["sqlite", "postgres"] = "sqlite"
+    persistence_path: str = "src/bot/databot.sqlite3"
+    persistence_interval: float = 5.0
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore", env_prefix="bot_"
@@ -43,11 +68,40 @@ class BotSettings(BaseSettings):
         return f"{self.token}"
 
 
+class ServiceSettings(BaseSettings):
+    """Settings of how bot handlers execute service calls.
+
+    In "async" mode the services run on the async engine. In "threadpool"
+    mode the synchronous services run in a bounded thread pool, each call
+    with its own session; the pool defaults to the size of the SQLAlchemy
+    connection pool (pool_size + max_overflow). The bot handles as many
+    updates concurrently as the connection pool, or the thread pool in
+    threadpool mode, can serve.
+
+    Diagnosis answers are buffered and written once a child collects
+    answer_buffer_size answers or after answer_buffer_seconds. Buffered
+    answers are kept in memory only, a crash loses the ones not written yet.
+    """
+
+    mode: Literal["async", "threadpool"] = "async"
+    threadpool_workers: int | None = None
+    answer_buffer_size: int = 50
+    answer_buffer_seconds: float = 300.0
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="service_",
+    )
+
+
 class AppConfig(BaseSettings):
     """Application settings configuration."""
 
     db: DBSettings = DBSettings()
     bot: BotSettings = BotSettings()
+    service: ServiceSettings = ServiceSettings()
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -0,0 +1,47 @@
+"""diagnosis_indexes
+
+Revision ID: 5d2a8c4e9f13
+Revises: 3c9e1f5a7b21
+Create Date: 2026-10-18 13:40:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a8c4e9f13'
+down_revision: Union[str, None] = '3c9e1f5a7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_children_user_id', 'children', ['user_id'], unique=False)
+    op.create_index(
+        'ix_diagnosis_history_child_id_date',
+        'diagnosis_history',
+        ['child_id', 'date'],
+        unique=False,
+        postgresql_include=['skill_id', 'mastered'],
+    )
+    op.create_index(
+        'ix_diagnosis_result_child_id_skill_types_id_date',
+        'diagnosis_result',
+        ['child_id', 'skill_types_id', sa.text('date DESC')],
+        unique=False,
+        postgresql_include=['age_assessment'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_diagnosis_result_child_id_skill_types_id_date',
+        table_name='diagnosis_result',
+    )
+    op.drop_index(
+        'ix_diagnosis_history_child_id_date', table_name='diagnosis_history'
+    )
+    op.drop_index('ix_children_user_id', table_name='children')
@@ -0,0 +1,40 @@
+"""skills_unique_name
+
+Revision ID: e4f1c8a2d957
+Revises: a7e3b9d14c62
+Create Date: 2026-10-18 16:10:27.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f1c8a2d957'
+down_revision: Union[str, None] = 'a7e3b9d14c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every restart of db_data.py added the catalog again, keep the first copy
+    # of each skill and move the answers given to the later copies onto it
+    op.execute(
+        "UPDATE diagnosis_history SET skill_id = ("
+        "SELECT min(kept.id) FROM skills AS copy "
+        "JOIN skills AS kept ON kept.skill_type_id = copy.skill_type_id "
+        "AND kept.name = copy.name "
+        "WHERE copy.id = diagnosis_history.skill_id) "
+        "WHERE skill_id NOT IN (SELECT min(id) FROM skills GROUP BY skill_type_id, name)"
+    )
+    op.execute(
+        "DELETE FROM skills "
+        "WHERE id NOT IN (SELECT min(id) FROM skills GROUP BY skill_type_id, name)"
+    )
+    op.create_unique_constraint('uq_skills_skill_type_id_name', 'skills', ['skill_type_id', 'name'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_skills_skill_type_id_name', 'skills', type_='unique')
@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+
+class PoolMetrics:
+    """Counters of connection checkouts and of the time spent waiting for them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float) -> None:
+        """
+        Records a checkout that took the given number of seconds.
+
+        Args:
+            wait (float): Seconds spent waiting for the connection.
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current counters.
+
+        Returns:
+            dict: checkouts, total_wait, max_wait and avg_wait in seconds.
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "avg_wait": self.total_wait / self.checkouts if self.checkouts else 0.0,
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that measures how long every checkout waits for a connection.
+
+    Pass it to create_engine as poolclass; the counters are available
+    through the metrics attribute of engine.pool.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "MeteredQueuePool":
+        # engine.dispose() replaces the pool, the counters carry over
+        self.logger.info("Pool recreating")
+        pool = self.__class__(
+            self._creator,
+            pool_size=self._pool.maxsize,
+            max_overflow=self._max_overflow,
+            pre_ping=self._pre_ping,
+            use_lifo=self._pool.use_lifo,
+            timeout=self._timeout,
+            recycle=self._recycle,
+            echo=self.echo,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        connection = super().connect()
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def status_metrics(self) -> dict[str, Any]:
+        """
+        Returns the pool state together with the checkout counters.
+
+        Returns:
+            dict: size, checked_out, overflow and the PoolMetrics counters.
+        """
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            **self.metrics.snapshot(),
+        }
+
+
+class MeteredAsyncQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """MeteredQueuePool for engines created with create_async_engine."""
@@ -1,50 +1,39 @@
-import json
+import argparse
+import time
 
 from sqlalchemy import create_engine
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 
-from config.settings import app_config
-from models.database import models
+from src.config.settings import app_config
+from src.repos.skill import SkillRepository
+from src.services.catalog_reader import FORMATS, iter_catalog
 
 
 def main() -> None:
-    engine = create_engine(app_config.db.db_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    with open("src/data.json", encoding="utf-8") as file:
-        data = json.load(file)
-
-    skill_types = {}
-
-    for el in data:
-        skill_types[el["skill_type"]] = models.SkillType(name=el["skill_type"])
-
-    skills = []
-
-    for el in data:
-        el["name"] = el["skill"]
-        del el["skill"]
-        skill_type = skill_types[el["skill_type"]]
-        del el["skill_type"]
-        skills.append(models.Skill(skill_type=skill_type, **el))
-
-    with Session(engine) as session:
-        for item in skill_types.values():
-            try:
-                session.add(item)
-                session.commit()
-            except IntegrityError:
-                session.rollback()
-                continue
-        for item in skills:
-            try:
-                session.add(item)
-                session.commit()
-            except IntegrityError:
-                session.rollback()
-                continue
+    parser = argparse.ArgumentParser(description="Загрузка каталога навыков")
+    parser.add_argument("path", nargs="?", default="src/data.json")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
 
+    engine = create_engine(app_config.db.db_url)
+    # Файл читается потоково, в памяти держится только текущая пачка навыков
+    entries = iter_catalog(args.path, args.format)
+
+    started = time.perf_counter()
+    # Весь каталог и версия каталога пишутся одной транзакцией,
+    # повторный запуск ничего не меняет
+    with Session(engine) as session, session.begin():
+        stats = SkillRepository(session, use_catalog=False).upsert_catalog(
+            entries, batch_size=args.batch_size
+        )
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Skill types inserted: {stats.skill_types_inserted}, "
+        f"skills inserted: {stats.inserted}, updated: {stats.updated}, "
+        f"skipped: {stats.skipped} in {elapsed:.2f}s"
+    )
     return None
 
 
@@ -1,21 +1,85 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+)
+from contextvars import ContextVar
+from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config.settings import app_config
+from src.database.pool import MeteredAsyncQueuePool, MeteredQueuePool
+from src.repos.buffer import diagnosis_history_buffer
+from src.repos.cache_stats import statement_cache_stats
 from src.repos.child import ChildRepository
 from src.repos.diagnosis import DiagnosisRepository
 from src.repos.skill import SkillRepository
 from src.repos.user import UserRepository
-from src.services.child_service import ChildService
-from src.services.diagnosis_service import DiagnosisService
-from src.services.recommendation_service import RecommendationService
-from src.services.user_service import UserService
+from src.services.child_service import AsyncChildService, ChildService
+from src.services.diagnosis_service import AsyncDiagnosisService, DiagnosisService
+from src.services.recommendation_service import (
+    AsyncRecommendationService,
+    RecommendationService,
+)
+from src.services.unit_of_work import (
+    AsyncUnitOfWork,
+    ThreadPoolUnitOfWorkRunner,
+    UnitOfWork,
+)
+from src.services.user_service import AsyncUserService, UserService
 
-engine = create_engine(app_config.db.db_url, pool_size=20, max_overflow=20)
+engine = create_engine(
+    app_config.db.db_url,
+    poolclass=MeteredQueuePool,
+    pool_size=app_config.db.pool_size,
+    max_overflow=app_config.db.max_overflow,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+diagnosis_history_buffer.configure(
+    max_answers=app_config.service.answer_buffer_size,
+    max_age=app_config.service.answer_buffer_seconds,
+)
+
+async_engine = create_async_engine(
+    app_config.db.async_db_url,
+    poolclass=MeteredAsyncQueuePool,
+    pool_size=app_config.db.pool_size,
+    max_overflow=app_config.db.max_overflow,
+)
+statement_cache_stats.attach(engine)
+statement_cache_stats.attach(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Every update being handled holds a connection, or a worker of the service
+# thread pool in threadpool mode, so the bot handles at most as many updates
+# at once as there are connections or workers
+max_concurrent_updates = (
+    app_config.service.threadpool_workers
+    if app_config.service.mode == "threadpool" and app_config.service.threadpool_workers
+    else app_config.db.pool_size + app_config.db.max_overflow
+)
+
+thread_pool_runner: ThreadPoolUnitOfWorkRunner | None = (
+    ThreadPoolUnitOfWorkRunner(SessionLocal, max_workers=max_concurrent_updates)
+    if app_config.service.mode == "threadpool"
+    else None
+)
+
+_current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "current_unit_of_work", default=None
+)
+_current_async_unit_of_work: ContextVar[AsyncUnitOfWork | None] = ContextVar(
+    "current_async_unit_of_work", default=None
+)
+
 
 def get_db() -> Generator[Session]:
     """
@@ -34,54 +98,178 @@ def get_db() -> Generator[Session]:
         db.close()
 
 
+@contextmanager
+def unit_of_work() -> Generator[UnitOfWork]:
+    """
+    Provides the unit of work of the current request.
+
+    The outermost call opens a session and closes it when the block exits,
+    nested calls within the same context join the already active unit of work.
+    Bot handlers get one unit of work per update from log_handler_errors.
+
+    Yields:
+        UnitOfWork: The active unit of work.
+    """
+    current = _current_unit_of_work.get()
+    if current is not None:
+        yield current
+        return
+
+    uow = UnitOfWork(SessionLocal())
+    token = _current_unit_of_work.set(uow)
+    try:
+        yield uow
+    finally:
+        _current_unit_of_work.reset(token)
+        uow.close()
+
+
+def current_unit_of_work() -> UnitOfWork:
+    """
+    Returns the active unit of work.
+
+    Raises:
+        RuntimeError: If called outside of unit_of_work().
+    """
+    uow = _current_unit_of_work.get()
+    if uow is None:
+        raise RuntimeError("No active unit of work, use unit_of_work()")
+    return uow
+
+
+@asynccontextmanager
+async def async_unit_of_work() -> AsyncGenerator[AsyncUnitOfWork]:
+    """
+    Provides the async unit of work of the current request.
+
+    Works like unit_of_work() on the async engine. Bot handlers get one
+    async unit of work per update from log_handler_errors.
+
+    Yields:
+        AsyncUnitOfWork: The active async unit of work.
+    """
+    current = _current_async_unit_of_work.get()
+    if current is not None:
+        yield current
+        return
+
+    uow = AsyncUnitOfWork(AsyncSessionLocal())
+    token = _current_async_unit_of_work.set(uow)
+    try:
+        yield uow
+    finally:
+        _current_async_unit_of_work.reset(token)
+        await uow.close()
+
+
+def current_async_unit_of_work() -> AsyncUnitOfWork:
+    """
+    Returns the active async unit of work.
+
+    Raises:
+        RuntimeError: If called outside of async_unit_of_work().
+    """
+    uow = _current_async_unit_of_work.get()
+    if uow is None:
+        raise RuntimeError("No active unit of work, use async_unit_of_work()")
+    return uow
+
+
+def service_scope() -> AbstractAsyncContextManager[Any]:
+    """
+    Provides the scope of the services used by one bot update.
+
+    In async mode it is the async unit of work of the update. In threadpool
+    mode every service call opens its own session, so no scope is needed.
+    """
+    if thread_pool_runner is not None:
+        return nullcontext()
+    return async_unit_of_work()
+
+
+def get_service_metrics() -> dict[str, Any]:
+    """Provides queue depth and wait time counters of the service thread pool."""
+    if thread_pool_runner is None:
+        return {}
+    return thread_pool_runner.metrics()
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    """Provides connection pool state and checkout wait counters of both engines."""
+    return {
+        "sync": engine.pool.status_metrics(),  # type: ignore[attr-defined]
+        "async": async_engine.pool.status_metrics(),  # type: ignore[attr-defined]
+    }
+
+
+def get_statement_cache_metrics() -> dict[str, Any]:
+    """Provides the compiled statement cache counters of both engines."""
+    return statement_cache_stats.snapshot()
+
+
 def get_user_repository() -> UserRepository:
     """Provides an instance of UserRepository."""
-    db = next(get_db())
-    return UserRepository(db)
+    return current_unit_of_work().user_repository
 
 
 def get_user_service() -> UserService:
     """Provides an instance of UserService."""
-    user_repository = get_user_repository()
-    return UserService(user_repository)
+    return current_unit_of_work().user_service
 
 
 def get_child_repository() -> ChildRepository:
     """Provides an instance of ChildRepository."""
-    db = next(get_db())
-    return ChildRepository(db)
+    return current_unit_of_work().child_repository
 
 
 def get_child_service() -> ChildService:
     """Provides an instance of ChildService."""
-    child_repository = get_child_repository()
-    return ChildService(child_repository)
+    return current_unit_of_work().child_service
 
 
 def get_diagnosis_repository() -> DiagnosisRepository:
     """Provides an instance of DiagnosisRepository."""
-    db = next(get_db())
-    return DiagnosisRepository(db)
+    return current_unit_of_work().diagnosis_repository
 
 
 def get_skill_repository() -> SkillRepository:
-    db = next(get_db())
-    return SkillRepository(db)
+    """Provides an instance of SkillRepository."""
+    return current_unit_of_work().skill_repository
 
 
 def get_diagnosis_service() -> DiagnosisService:
     """Provides an instance of DiagnosisService."""
-    diagnosis_repository = get_diagnosis_repository()
-    child_repository = get_child_repository()
-    skill_repository = get_skill_repository()
-    return DiagnosisService(diagnosis_repository, child_repository, skill_repository)
+    return current_unit_of_work().diagnosis_service
 
 
 def get_recommendation_service() -> RecommendationService:
     """Provides an instance of RecommendationService."""
-    diagnosis_repository = get_diagnosis_repository()
-    child_repository = get_child_repository()
-    skill_repository = get_skill_repository()
-    return RecommendationService(
-        child_repository, skill_repository, diagnosis_repository
-    )
+    return current_unit_of_work().recommendation_service
+
+
+def get_async_user_service() -> AsyncUserService:
+    """Provides an instance of AsyncUserService."""
+    if thread_pool_runner is not None:
+        return AsyncUserService(thread_pool_runner)
+    return current_async_unit_of_work().user_service
+
+
+def get_async_child_service() -> AsyncChildService:
+    """Provides an instance of AsyncChildService."""
+    if thread_pool_runner is not None:
+        return AsyncChildService(thread_pool_runner)
+    return current_async_unit_of_work().child_service
+
+
+def get_async_diagnosis_service() -> AsyncDiagnosisService:
+    """Provides an instance of AsyncDiagnosisService."""
+    if thread_pool_runner is not None:
+        return AsyncDiagnosisService(thread_pool_runner)
+    return current_async_unit_of_work().diagnosis_service
+
+
+def get_async_recommendation_service() -> AsyncRecommendationService:
+    """Provides an instance of AsyncRecommendationService."""
+    if thread_pool_runner is not None:
+        return AsyncRecommendationService(thread_pool_runner)
+    return current_async_unit_of_work().recommendation_service
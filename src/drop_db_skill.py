@@ -1,19 +1,38 @@
 from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 
-from config.settings import app_config
-from models.database.models import DiagnosisHistory, DiagnosisResult, Skill, SkillType
+from src.config.settings import app_config
+from src.models.database.models import (
+    Base,
+    DiagnosisHistory,
+    DiagnosisResult,
+    DiagnosisSession,
+    Skill,
+    SkillType,
+)
+from src.repos.skill import SkillRepository
 
 
 def main() -> None:
     engine = create_engine(app_config.db.db_url)
-    DiagnosisHistory.__table__.drop(engine)
-    DiagnosisResult.__table__.drop(engine)
-    Skill.__table__.drop(engine)
-    SkillType.__table__.drop(engine)
-    SkillType.__table__.create(engine)
-    Skill.__table__.create(engine)
-    DiagnosisHistory.__table__.create(engine)
-    DiagnosisResult.__table__.create(engine)
+    # Таблицы удаляются и создаются в порядке внешних ключей. Сессии
+    # диагностики хранят битовые маски id навыков, поэтому удаляются вместе
+    # с навыками, чтобы не указывать на переиспользованные id
+    tables = [
+        Base.metadata.tables[model.__tablename__]
+        for model in (
+            SkillType,
+            Skill,
+            DiagnosisSession,
+            DiagnosisHistory,
+            DiagnosisResult,
+        )
+    ]
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+    # Работающие процессы перечитают пустой каталог по новой версии
+    with Session(engine) as session, session.begin():
+        SkillRepository(session, use_catalog=False).bump_catalog_version()
     print("Done")
 
 
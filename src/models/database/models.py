@@ -4,7 +4,19 @@ from __future__ import annotations
 
 from datetime import date
 
-from sqlalchemy import BigInteger, Boolean, Date, ForeignKey, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Date,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    desc,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -26,6 +38,7 @@ class User(Base):
 
 class Child(Base):
     __tablename__ = "children"
+    __table_args__ = (Index("ix_children_user_id", "user_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -39,6 +52,9 @@ class Child(Base):
     diagnosis_result: Mapped[list["DiagnosisResult"]] = relationship(
         back_populates="child"
     )
+    diagnosis_session: Mapped[list["DiagnosisSession"]] = relationship(
+        back_populates="child"
+    )
 
     def __repr__(self) -> str:
         return f"<{self.name} {self.birth_date} {self.id}>"
@@ -64,6 +80,10 @@ class SkillType(Base):
 
 class Skill(Base):
     __tablename__ = "skills"
+    __table_args__ = (
+        Index("ix_skills_age_start_age_end", "age_start", "age_end"),
+        UniqueConstraint("skill_type_id", "name", name="uq_skills_skill_type_id_name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     skill_type_id: Mapped[int] = mapped_column(
@@ -87,6 +107,15 @@ class Skill(Base):
 
 class DiagnosisHistory(Base):
     __tablename__ = "diagnosis_history"
+    __table_args__ = (
+        Index(
+            "ix_diagnosis_history_child_id_date",
+            "child_id",
+            "date",
+            postgresql_include=["skill_id", "mastered"],
+        ),
+        Index("ix_diagnosis_history_session_id", "session_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     skill_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), nullable=False)
@@ -96,10 +125,16 @@ class DiagnosisHistory(Base):
     date: Mapped[date] = mapped_column(Date)
     mastered: Mapped[bool] = mapped_column(Boolean)
     child_id: Mapped[int] = mapped_column(ForeignKey("children.id"), nullable=False)
+    session_id: Mapped[int | None] = mapped_column(
+        ForeignKey("diagnosis_session.id"), nullable=True
+    )
 
     skill: Mapped["Skill"] = relationship(back_populates="diagnosis_history")
     skill_type: Mapped["SkillType"] = relationship(back_populates="diagnosis_history")
     child: Mapped["Child"] = relationship(back_populates="diagnosis_history")
+    session: Mapped["DiagnosisSession | None"] = relationship(
+        back_populates="diagnosis_history"
+    )
 
     def __repr__(self) -> str:
         return f"{self.child_id} {self.skill} {self.mastered}"
@@ -107,6 +142,15 @@ class DiagnosisHistory(Base):
 
 class DiagnosisResult(Base):
     __tablename__ = "diagnosis_result"
+    __table_args__ = (
+        Index(
+            "ix_diagnosis_result_child_id_skill_types_id_date",
+            "child_id",
+            "skill_types_id",
+            desc("date"),
+            postgresql_include=["age_assessment"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     child_id: Mapped[int] = mapped_column(ForeignKey("children.id"), nullable=False)
@@ -115,9 +159,62 @@ class DiagnosisResult(Base):
         ForeignKey("skill_types.id"), nullable=False
     )
     age_assessment: Mapped[int] = mapped_column()
+    session_id: Mapped[int | None] = mapped_column(
+        ForeignKey("diagnosis_session.id"), nullable=True
+    )
 
     skill_type: Mapped["SkillType"] = relationship(back_populates="diagnosis_result")
     child: Mapped[Child] = relationship(back_populates="diagnosis_result")
+    session: Mapped["DiagnosisSession | None"] = relationship(
+        back_populates="diagnosis_result"
+    )
 
     def __repr__(self) -> str:
         return f"{self.child_id} {self.skill_types_id} {self.age_assessment}"
+
+
+class DiagnosisSession(Base):
+    __tablename__ = "diagnosis_session"
+    __table_args__ = (Index("ix_diagnosis_session_child_id_id", "child_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    child_id: Mapped[int] = mapped_column(ForeignKey("children.id"), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Сводка заполняется при завершении диагностики
+    skill_types_age: Mapped[dict | None] = mapped_column(
+        JSON(none_as_null=True), nullable=True
+    )
+    answered: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    mastered: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    child: Mapped["Child"] = relationship(back_populates="diagnosis_session")
+    diagnosis_history: Mapped[list["DiagnosisHistory"]] = relationship(
+        back_populates="session"
+    )
+    diagnosis_result: Mapped[list["DiagnosisResult"]] = relationship(
+        back_populates="session"
+    )
+
+    def __repr__(self) -> str:
+        return f"{self.child_id} {self.date} {self.id}"
+
+
+class BotPersistence(Base):
+    __tablename__ = "bot_persistence"
+
+    kind: Mapped[str] = mapped_column(Text, primary_key=True)
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"{self.kind} {self.key}"
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"Catalog <{self.version}>"
@@ -1,4 +1,6 @@
+from collections.abc import Iterable, Iterator, Mapping
 from datetime import date
+from typing import NamedTuple
 
 from pydantic import BaseModel, computed_field
 
@@ -11,22 +13,26 @@ class Base(BaseModel):
         from_attributes = True
 
 
-class User(Base):
-    """User model representing a user in the system."""
+class UserRead(Base):
+    """Read projection of a user without relationships."""
 
     id: int
     telegram_id: int
+
+
+class User(UserRead):
+    """User model representing a user in the system."""
+
     children: list["Child"] = []
 
 
-class Child(Base):
-    """Child model representing a child associated with a user."""
+class ChildRead(Base):
+    """Read projection of a child without relationships."""
 
     id: int
     user_id: int
     name: str
     birth_date: date
-    diagnosis_history: list["DiagnosisHistory"] = []
 
     @computed_field
     @property
@@ -41,6 +47,11 @@ class Child(Base):
 
         return full_months
 
+
+class Child(ChildRead):
+    """Child model representing a child associated with a user."""
+
+    diagnosis_history: list["DiagnosisHistory"] = []
     diagnosis_result: list["DiagnosisResult"] = []
 
 
@@ -77,6 +88,7 @@ class DiagnosisHistory(Base):
     date: date
     mastered: bool
     child_id: int
+    session_id: int | None = None
 
 
 class DiagnosisResult(Base):
@@ -87,3 +99,192 @@ class DiagnosisResult(Base):
     date: date
     skill_types_id: int
     age_assessment: int | None
+    session_id: int | None = None
+
+
+class SkillBitset:
+    """Immutable set of skill ids packed into the bits of an int.
+
+    Bit N is skill N: unlike positions in the catalog, ids survive catalog
+    reloads. Skill ids are serial and SkillRepository.upsert_catalog only
+    takes new ids for new skills, so the set stays dense. Set operations are
+    single bitwise operations on the ints.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0) -> None:
+        self.bits = bits
+
+    @classmethod
+    def from_ids(cls, skill_ids: Iterable[int]) -> "SkillBitset":
+        """
+        Builds a bitset of the given skill ids.
+
+        Args:
+            skill_ids (Iterable[int]): The skill ids.
+
+        Returns:
+            SkillBitset: The bitset.
+        """
+        bits = 0
+        for skill_id in skill_ids:
+            bits |= 1 << skill_id
+        return cls(bits)
+
+    @classmethod
+    def from_bytes(cls, bitmap: bytes | None) -> "SkillBitset":
+        """
+        Decodes a bitmap written by to_bytes, None is the empty set.
+
+        Args:
+            bitmap (bytes | None): The bitmap.
+
+        Returns:
+            SkillBitset: The bitset.
+        """
+        return cls(int.from_bytes(bitmap or b"", "little"))
+
+    def to_bytes(self) -> bytes:
+        """Encodes the set as little-endian bytes, empty for no skills."""
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    def __or__(self, other: "SkillBitset") -> "SkillBitset":
+        return SkillBitset(self.bits | other.bits)
+
+    def __and__(self, other: "SkillBitset") -> "SkillBitset":
+        return SkillBitset(self.bits & other.bits)
+
+    def __sub__(self, other: "SkillBitset") -> "SkillBitset":
+        return SkillBitset(self.bits & ~other.bits)
+
+    def __xor__(self, other: "SkillBitset") -> "SkillBitset":
+        return SkillBitset(self.bits ^ other.bits)
+
+    def __contains__(self, skill_id: object) -> bool:
+        return (
+            isinstance(skill_id, int)
+            and skill_id >= 0
+            and bool(self.bits >> skill_id & 1)
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        # Visits only the set bits, lowest skill id first
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SkillBitset):
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"SkillBitset({list(self)})"
+
+
+class DiagnosisChanges(NamedTuple):
+    """Skills whose mastered status changed between two diagnoses."""
+
+    previous_id: int
+    current_id: int
+    newly_mastered: SkillBitset
+    regressed: SkillBitset
+
+
+class DiagnosisSession(Base):
+    """DiagnosisSession model grouping the answers and results of a diagnosis.
+
+    The summary fields are empty until the diagnosis is completed.
+    """
+
+    id: int
+    child_id: int
+    date: date
+    skill_types_age: dict[int, int] | None = None
+    answered: bytes | None = None
+    mastered: bytes | None = None
+
+    @property
+    def completed(self) -> bool:
+        return self.skill_types_age is not None
+
+    @property
+    def answered_skills(self) -> SkillBitset:
+        """Skills the child was asked about."""
+        return SkillBitset.from_bytes(self.answered)
+
+    @property
+    def mastered_skills(self) -> SkillBitset:
+        """Skills the child mastered."""
+        return SkillBitset.from_bytes(self.mastered)
+
+    @property
+    def failed_skills(self) -> SkillBitset:
+        """Skills the child was asked about and did not master."""
+        return self.answered_skills - self.mastered_skills
+
+    def answers(self) -> dict[int, bool]:
+        """Mastered status by skill id of the answered skills."""
+        mastered = self.mastered_skills
+        return {skill_id: skill_id in mastered for skill_id in self.answered_skills}
+
+    def compare(self, previous: "DiagnosisSession") -> DiagnosisChanges:
+        """
+        Compares the diagnosis with an earlier one of the child.
+
+        A skill is newly mastered when it is mastered now and was not
+        mastered before, whether it failed or was not asked. It regressed
+        when it was mastered before and failed now.
+
+        Args:
+            previous (DiagnosisSession): The earlier diagnosis.
+
+        Returns:
+            DiagnosisChanges: The newly mastered and the regressed skills.
+        """
+        mastered = self.mastered_skills
+        previous_mastered = previous.mastered_skills
+        return DiagnosisChanges(
+            previous_id=previous.id,
+            current_id=self.id,
+            newly_mastered=mastered - previous_mastered,
+            regressed=previous_mastered & (self.answered_skills - mastered),
+        )
+
+    @staticmethod
+    def summarize(answers: Mapping[int, bool]) -> tuple[bytes, bytes]:
+        """
+        Encodes answers as the answered and mastered bitmaps of a session.
+
+        Args:
+            answers (Mapping[int, bool]): Mastered status by skill id.
+
+        Returns:
+            tuple[bytes, bytes]: The answered and the mastered bitmaps.
+        """
+        return (
+            SkillBitset.from_ids(answers).to_bytes(),
+            SkillBitset.from_ids(
+                skill_id for skill_id, mastered in answers.items() if mastered
+            ).to_bytes(),
+        )
+
+
+class Question(NamedTuple):
+    """Diagnosis question kept in the conversation state of a diagnosis."""
+
+    skill_id: int
+    skill_type_id: int
+    criteria: str | None
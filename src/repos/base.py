@@ -1,9 +1,85 @@
-from typing import Any
-
+import binascii
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import event, select, tuple_
+from sqlalchemy.dialects.postgresql import Insert as PostgresInsert
 from sqlalchemy.dialects.postgresql import insert as psql_insert
-from sqlalchemy.orm import Query, Session
-from sqlalchemy.sql import text
-from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    InstrumentedAttribute,
+    ORMExecuteState,
+    Query,
+    Session,
+    raiseload,
+)
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+ResultT = TypeVar("ResultT")
+
+OrderType = Literal["asc", "desc"]
+
+# WHERE criteria of the query helpers, e.g. [Skill.id == 1, Skill.name.in_(names)]
+Filters = Sequence[ColumnElement[bool]]
+
+
+@dataclass(frozen=True)
+class Page[ItemT]:
+    """One page of a keyset paginated query.
+
+    Attributes:
+        items: The items of the page.
+        next_cursor: Opaque cursor of the next page, None on the last page.
+    """
+
+    items: list[ItemT]
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the keyset values of the last row of a page as an opaque cursor."""
+    raw = [
+        value.isoformat() if isinstance(value, datetime.date) else value
+        for value in values
+    ]
+    return urlsafe_b64encode(json.dumps(raw).encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> list[Any]:
+    """Decode a cursor made by encode_cursor into values of the keyset columns.
+
+    Args:
+        cursor: The opaque cursor.
+        keys: The keyset columns the cursor was made for.
+
+    Returns:
+        The keyset values, converted to the python types of the columns.
+
+    Raises:
+        ValueError: If the cursor is malformed or made for other columns.
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError("Invalid cursor") from error
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    return [
+        datetime.date.fromisoformat(value)
+        if value is not None and key.type.python_type is datetime.date
+        else value
+        for key, value in zip(keys, values, strict=True)
+    ]
 
 
 class BaseRepository:
@@ -15,7 +91,7 @@ class BaseRepository:
     should be written in the child repository.
     """
 
-    _schema: type | None = None  # SQLAlchemy model
+    _schema: type[DeclarativeBase] | None = None  # SQLAlchemy model
     _model: type | None = None  # Pydantic model
 
     def __init__(self, db: Session) -> None:
@@ -39,6 +115,8 @@ class BaseRepository:
         Returns:
             obj: An individual _schema instance.
         """
+        if self._schema is None:
+            raise ValueError("_schema not defined")
         return self._db.query(self._schema).get(entity_id)
 
     def all(self) -> list[Any]:
@@ -52,6 +130,28 @@ class BaseRepository:
         else:
             return self._db.query(self._schema).all()
 
+    def stream_all(self, chunk_size: int = 1000) -> Iterator[Any]:
+        """Iterate over all _schemas without materializing them in a list.
+
+        Rows are fetched chunk_size at a time through a server-side cursor
+        where the driver supports one; the session's connection is busy
+        until the iterator is exhausted or closed.
+
+        Args:
+            chunk_size: Number of rows fetched per round trip.
+
+        Yields:
+            _schema instances.
+        """
+        if self._schema is None:
+            raise ValueError("_schema not defined")
+        query = (
+            select(self._schema)
+            .options(raiseload("*", sql_only=True))
+            .execution_options(yield_per=chunk_size)
+        )
+        yield from self._db.scalars(query)
+
     def add(self, entity: Any) -> None:
         """Add an entity to the current session.
 
@@ -64,29 +164,145 @@ class BaseRepository:
         """Commit all changes to persistence."""
         self._db.commit()
 
+    def _insert(self, schema: type) -> PostgresInsert | SQLiteInsert:
+        """Return an INSERT construct of the session's dialect for a schema.
+
+        The Postgres and SQLite constructs support ON CONFLICT clauses, both
+        accept multi-row VALUES and RETURNING.
+
+        Args:
+            schema: The schema to insert into.
+
+        Raises:
+            ValueError: If the session is bound to another database.
+
+        Returns:
+            The Postgres or SQLite Insert object.
+        """
+        dialect = self._db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return psql_insert(schema)
+        if dialect == "sqlite":
+            return sqlite_insert(schema)
+        raise ValueError(f"Unsupported database dialect: {dialect}")
+
+    def _query_projection(
+        self,
+        projection: type[BaseModel],
+        filters: Filters | None = None,
+        order_by: Sequence[ColumnElement | InstrumentedAttribute] = None,
+        schema: type[DeclarativeBase] | None = None,
+    ) -> list[Any]:
+        """Select only the columns of a pydantic model and build it from the rows.
+
+        Model fields that are not table columns, e.g. relationship lists, keep
+        their defaults. No ORM entities are loaded, so validating the models
+        can never trigger lazy loads.
+
+        Args:
+            projection: The pydantic model to build.
+            filters: A list of filters for the query.
+            order_by: Columns to order the returned items by.
+            schema: The schema to select from, _schema by default.
+
+        Returns:
+            A list of projection instances.
+        """
+        query = self._projection_select(projection, filters, order_by, schema)
+        return [
+            projection.model_validate(row._asdict()) for row in self._db.execute(query)
+        ]
+
+    def _stream_projection(
+        self,
+        projection: type[BaseModel],
+        filters: Filters | None = None,
+        order_by: Sequence[ColumnElement | InstrumentedAttribute] = None,
+        schema: type[DeclarativeBase] | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Any]:
+        """Generator variant of _query_projection for large results.
+
+        Rows are fetched chunk_size at a time through a server-side cursor
+        where the driver supports one and each chunk is converted only when
+        the caller reaches it, so memory stays flat however many rows match.
+        The session's connection is busy until the iterator is exhausted or
+        closed.
+
+        Args:
+            projection: The pydantic model to build.
+            filters: A list of filters for the query.
+            order_by: Columns to order the returned items by.
+            schema: The schema to select from, _schema by default.
+            chunk_size: Number of rows fetched per round trip.
+
+        Yields:
+            projection instances.
+        """
+        query = self._projection_select(
+            projection, filters, order_by, schema
+        ).execution_options(yield_per=chunk_size)
+        for rows in self._db.execute(query).partitions():
+            for row in rows:
+                yield projection.model_validate(row._asdict())
+
+    def _projection_select(
+        self,
+        projection: type[BaseModel],
+        filters: Filters | None = None,
+        order_by: Sequence[ColumnElement | InstrumentedAttribute] = None,
+        schema: type[DeclarativeBase] | None = None,
+    ) -> Select:
+        """Build the SELECT of the columns of a pydantic model."""
+        schema = schema or self._schema
+        if schema is None:
+            raise ValueError("_schema not defined")
+        table = schema.__table__
+        columns = [
+            table.columns[name] for name in projection.model_fields if name in table.c
+        ]
+        query = select(*columns)
+        if filters:
+            query = query.where(*filters)
+        if order_by:
+            query = query.order_by(*order_by)
+        return query
+
     def _query(
         self,
-        filters: list[BinaryExpression] = None,
+        filters: Filters | None = None,
         joins: list = None,
-        order_by: str = None,
-        order_type: str = None,
-        size: int = 50,
+        order_by: str | InstrumentedAttribute | None = None,
+        order_type: OrderType = None,
+        size: int = None,
         page: int = None,
+        options: Sequence[ORMOption] = None,
     ) -> Query:
         """Query wrapper to pre-process for given arguments.
 
         Args:
             filters: A list of filters for the query.
             joins: A list of joins for the query.
-            order_by: Set an order field for the returned items.
-            order_type: Define the order type for the returned items.
-            size: Limits the amount of items returned. Defaults to 50.
-            page: Page to start returning items from.
+            order_by: Set an order column, or the name of one, for the
+                returned items.
+            order_type: "asc" or "desc", defaults to "desc".
+            size: Limits the amount of items returned, all items by default.
+            page: Page to start returning items from, requires size, a
+                ValueError is raised without it. Prefer _query_page on large
+                tables.
+            options: Loader options of the relationships the caller needs,
+                e.g. selectinload(Child.diagnosis_history). Accessing any
+                other relationship raises instead of lazy loading it.
 
         Returns:
             A sqlalchemy.orm.query.Query object.
         """
-        query = self._db.query(self._schema)
+        schema = self._schema
+        if schema is None:
+            raise ValueError("_schema not defined")
+        query = self._db.query(schema).options(
+            *(options or ()), raiseload("*", sql_only=True)
+        )
 
         if filters:
             for query_filter in filters:
@@ -97,25 +313,20 @@ class BaseRepository:
                 query = query.join(join)
 
         if order_by:
-            query = query.order_by(text(f"{order_by} {order_type or 'desc'}"))
-
-        if size:
-            query = query.limit(size)
+            query = query.order_by(self._order_by(schema, order_by, order_type))
 
-        if page:
-            query = query.offset((page - 1) * size)
-
-        return query
+        return self._paginate(query, size, page)
 
     def _query_schema(
         self,
-        schema: type = None,
-        filters: list[BinaryExpression] = None,
+        schema: type[DeclarativeBase] | None = None,
+        filters: Filters | None = None,
         joins: list = None,
-        order_by: str = None,
-        order_type: str = None,
-        size: int = 50,
+        order_by: str | InstrumentedAttribute | None = None,
+        order_type: OrderType = None,
+        size: int = None,
         page: int = None,
+        options: Sequence[ORMOption] = None,
     ) -> Query:
         """Query wrapper to pre-process for given arguments.
 
@@ -123,15 +334,28 @@ class BaseRepository:
             schema: The schema to query.
             filters: A list of filters for the query.
             joins: A list of joins for the query.
-            order_by: Set an order field for the returned items.
-            order_type: Define the order type for the returned items.
-            size: Limits the amount of items returned. Defaults to 50.
-            page: Page to start returning items from.
+            order_by: Set an order column, or the name of one, for the
+                returned items.
+            order_type: "asc" or "desc", defaults to "desc".
+            size: Limits the amount of items returned, all items by default.
+            page: Page to start returning items from, requires size, a
+                ValueError is raised without it. Prefer _query_page on large
+                tables.
+            options: Loader options of the relationships the caller needs,
+                e.g. selectinload(Child.diagnosis_history). Accessing any
+                other relationship raises instead of lazy loading it.
 
         Returns:
             A sqlalchemy.orm.query.Query object.
+
+        Raises:
+            ValueError: If no schema is given.
         """
-        query = self._db.query(schema)
+        if schema is None:
+            raise ValueError("schema not defined")
+        query = self._db.query(schema).options(
+            *(options or ()), raiseload("*", sql_only=True)
+        )
 
         if filters:
             for query_filter in filters:
@@ -142,15 +366,189 @@ class BaseRepository:
                 query = query.join(join)
 
         if order_by:
-            query = query.order_by(text(f"{order_by} {order_type or 'desc'}"))
+            query = query.order_by(self._order_by(schema, order_by, order_type))
+
+        return self._paginate(query, size, page)
+
+    @staticmethod
+    def _paginate(query: Query, size: int | None, page: int | None) -> Query:
+        """Apply LIMIT and OFFSET for a page of the given size.
+
+        Args:
+            query: The query to paginate.
+            size: Limits the amount of items returned, all items if None.
+            page: Page to start returning items from, requires size.
+
+        Raises:
+            ValueError: If page is given without size.
+
+        Returns:
+            The paginated query.
+        """
+        if page and not size:
+            raise ValueError("page requires size")
 
         if size:
             query = query.limit(size)
 
-        if page:
+        if page and size:
             query = query.offset((page - 1) * size)
 
         return query
 
+    @staticmethod
+    def _order_by(
+        schema: type[DeclarativeBase],
+        order_by: str | InstrumentedAttribute,
+        order_type: str | None,
+    ) -> UnaryExpression:
+        """Build an ORDER BY clause from a column of the schema and a direction.
+
+        Args:
+            schema: The queried schema.
+            order_by: A column of the schema or its name.
+            order_type: "asc" or "desc", None for "desc".
+
+        Returns:
+            The column with its direction.
+
+        Raises:
+            ValueError: If the column is not a column of the schema or the
+                direction is neither "asc" nor "desc".
+        """
+        table = schema.__table__
+        if isinstance(order_by, str):
+            if order_by not in table.c:
+                raise ValueError(f"Unknown order_by column {order_by!r}")
+            column = getattr(schema, order_by)
+        else:
+            column = order_by
+            if column.table is not table:
+                raise ValueError(
+                    f"order_by column {column} is not in {schema.__tablename__}"
+                )
+
+        direction = (order_type or "desc").lower()
+        if direction == "desc":
+            return column.desc()
+        if direction == "asc":
+            return column.asc()
+        raise ValueError(f"Unknown order_type {order_type!r}")
+
+    def _query_page(
+        self,
+        keys: Sequence[Any],
+        filters: Filters | None = None,
+        descending: bool = False,
+        size: int = 50,
+        cursor: str | None = None,
+        schema: type[DeclarativeBase] | None = None,
+        options: Sequence[ORMOption] = None,
+    ) -> Page[Any]:
+        """Keyset (seek) pagination over indexed columns.
+
+        Rows are ordered by the keys and every page continues right after
+        the last row of the previous one, so deep pages cost as much as the
+        first one. The last key must be unique, usually the primary key.
+
+        Args:
+            keys: The columns to order and seek by, e.g. (date, id).
+            filters: A list of filters for the query.
+            descending: Order by the keys in descending order.
+            size: Number of items of the page.
+            cursor: next_cursor of the previous page, None for the first page.
+            schema: The schema to query, _schema by default.
+            options: Loader options of the relationships the caller needs.
+
+        Returns:
+            A Page of _schema instances.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = self._query_schema(
+            schema=schema or self._schema, filters=filters, options=options
+        )
+        if cursor is not None:
+            values = tuple_(
+                *decode_cursor(cursor, keys), types=[key.type for key in keys]
+            )
+            query = query.filter(
+                tuple_(*keys) < values if descending else tuple_(*keys) > values
+            )
+        query = query.order_by(
+            *(key.desc() if descending else key.asc() for key in keys)
+        )
+
+        rows = query.limit(size + 1).all()
+        if len(rows) <= size:
+            return Page(rows, None)
+        rows = rows[:size]
+        return Page(rows, encode_cursor([getattr(rows[-1], key.key) for key in keys]))
+
     def flush(self) -> None:
         self._db.flush()
+
+
+class AsyncBaseRepository:
+    """Async variant of BaseRepository working on an AsyncSession.
+
+    Every async repository wraps a synchronous one, set as the _repository
+    private class attribute, and runs its methods through
+    AsyncSession.run_sync. The queries are shared with the sync API while
+    the database I/O goes through the async driver and never blocks the
+    event loop.
+    """
+
+    _repository: type[BaseRepository] = BaseRepository
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Instantiate the repository with an async db session.
+
+        Args:
+            db: A sqlalchemy.ext.asyncio.AsyncSession object.
+        """
+        self._db = db
+
+    @property
+    def session(self) -> AsyncSession:
+        return self._db
+
+    async def _run(
+        self,
+        method: Callable[..., ResultT],
+        *args: Any,
+        **kwargs: Any,
+    ) -> ResultT:
+        """Run a method of the sync repository on the session of this one.
+
+        Args:
+            method: An unbound method of the _repository class.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            The value returned by the method.
+        """
+        return await self._db.run_sync(
+            lambda session: method(self._repository(session), *args, **kwargs)
+        )
+
+    async def get(self, entity_id: int) -> Any:
+        """Return a _schema by its primary key id."""
+        return await self._run(BaseRepository.get, entity_id)
+
+    async def all(self) -> list[Any]:
+        """Return all _schemas."""
+        return await self._run(BaseRepository.all)
+
+    def add(self, entity: Any) -> None:
+        """Add an entity to the current session."""
+        self._db.add(entity)
+
+    async def commit(self) -> None:
+        """Commit all changes to persistence."""
+        await self._db.commit()
+
+    async def flush(self) -> None:
+        await self._db.flush()
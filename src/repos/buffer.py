@@ -0,0 +1,129 @@
+import datetime
+import threading
+import time
+from typing import NamedTuple
+
+
+class PendingAnswer(NamedTuple):
+    """A diagnosis answer waiting to be written to diagnosis_history."""
+
+    child_id: int
+    skill_id: int
+    skill_type_id: int
+    mastered: bool
+    date: datetime.date
+    session_id: int | None = None
+
+
+class DiagnosisHistoryBuffer:
+    """Process-wide write-behind buffer of diagnosis answers.
+
+    Answers are collected per child and written in one multi-row insert
+    once the questionnaire ends, or earlier when a child collects max_answers
+    answers or its oldest answer is older than max_age seconds.
+
+    The buffer lives in process memory: if the process dies, the answers not
+    written yet are lost, i.e. up to max_answers - 1 answers per child given
+    during the last max_age seconds. The bot writes every pending answer when
+    it shuts down gracefully, and readers of diagnosis_history only see the
+    written answers.
+    """
+
+    def __init__(self, max_answers: int = 50, max_age: float = 300.0) -> None:
+        self._lock = threading.Lock()
+        self._answers: dict[int, list[PendingAnswer]] = {}
+        self._first_added: dict[int, float] = {}
+        self.max_answers = max_answers
+        self.max_age = max_age
+
+    def configure(self, max_answers: int, max_age: float) -> None:
+        """
+        Sets the flush thresholds.
+
+        Args:
+            max_answers (int): Pending answers of a child that trigger a flush.
+            max_age (float): Seconds after which pending answers are due.
+        """
+        self.max_answers = max_answers
+        self.max_age = max_age
+
+    def add(self, answer: PendingAnswer) -> bool:
+        """
+        Adds an answer to the buffer.
+
+        Args:
+            answer (PendingAnswer): The answer to add.
+
+        Returns:
+            bool: Whether the answers of the child should be flushed now.
+        """
+        with self._lock:
+            answers = self._answers.setdefault(answer.child_id, [])
+            answers.append(answer)
+            first_added = self._first_added.setdefault(
+                answer.child_id, time.monotonic()
+            )
+            return (
+                len(answers) >= self.max_answers
+                or time.monotonic() - first_added >= self.max_age
+            )
+
+    def pending(self, child_id: int) -> int:
+        """Returns the number of pending answers of the child."""
+        with self._lock:
+            return len(self._answers.get(child_id, []))
+
+    def drain(self, child_id: int) -> list[PendingAnswer]:
+        """
+        Removes and returns the pending answers of the child.
+
+        Args:
+            child_id (int): The ID of the child.
+
+        Returns:
+            list[PendingAnswer]: The answers in the order they were added.
+        """
+        with self._lock:
+            self._first_added.pop(child_id, None)
+            return self._answers.pop(child_id, [])
+
+    def restore(self, answers: list[PendingAnswer]) -> None:
+        """
+        Puts drained answers back in front of the buffer, e.g. after a failed write.
+
+        Args:
+            answers (list[PendingAnswer]): Answers returned by drain().
+        """
+        with self._lock:
+            for answer in reversed(answers):
+                self._answers.setdefault(answer.child_id, []).insert(0, answer)
+                self._first_added.setdefault(answer.child_id, time.monotonic())
+
+    def due(self, max_age: float | None = None) -> list[int]:
+        """
+        Returns the ids of children whose pending answers are due.
+
+        Args:
+            max_age (float | None): Age in seconds after which answers are due,
+                the buffer's max_age by default; 0 returns every child.
+
+        Returns:
+            list[int]: The ids of the children.
+        """
+        threshold = self.max_age if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            return [
+                child_id
+                for child_id, first_added in self._first_added.items()
+                if now - first_added >= threshold
+            ]
+
+    def clear(self) -> None:
+        """Drops all pending answers."""
+        with self._lock:
+            self._answers.clear()
+            self._first_added.clear()
+
+
+diagnosis_history_buffer = DiagnosisHistoryBuffer()
@@ -0,0 +1,69 @@
+import threading
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine.interfaces import CacheStats
+
+
+class StatementCacheStats:
+    """Counters of SQLAlchemy's compiled statement cache.
+
+    Every statement executed on an attached engine is counted by its cache
+    outcome: hits reuse a compiled statement, misses compile and store one,
+    uncached statements (e.g. DDL) are compiled every time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(CacheStats, 0)
+
+    def attach(self, engine: Engine) -> None:
+        """
+        Starts counting the statements of an engine.
+
+        Args:
+            engine (Engine): The engine, engine.sync_engine for async engines.
+        """
+        event.listen(engine, "after_cursor_execute", self._record)
+
+    def _record(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is None:
+            return
+        with self._lock:
+            self._counts[cache_hit] += 1
+
+    def reset(self) -> None:
+        """Sets all counters to zero."""
+        with self._lock:
+            self._counts = dict.fromkeys(CacheStats, 0)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current counters.
+
+        Returns:
+            dict: hits, misses, uncached and hit_rate, the share of cacheable
+            statements that were served from the cache.
+        """
+        with self._lock:
+            hits = self._counts[CacheStats.CACHE_HIT]
+            misses = self._counts[CacheStats.CACHE_MISS]
+            uncached = sum(self._counts.values()) - hits - misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "uncached": uncached,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+
+statement_cache_stats = StatementCacheStats()
@@ -0,0 +1,282 @@
+import heapq
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Container, Iterable, Mapping
+from dataclasses import dataclass
+from functools import cached_property
+
+from src.models.domain.models import Skill, SkillType
+
+
+class SkillAgeIndex:
+    """Interval index answering which skills cover a given age in months.
+
+    The [age_start, age_end] intervals of the skills split the age axis into
+    elementary segments, and the ordered tuple of skills covering each segment
+    is computed once. A lookup is a bisect over the segment bounds, so it costs
+    O(log n) and returns the same tuple object for every age in a segment.
+    """
+
+    def __init__(self, skills: Iterable[Skill]) -> None:
+        starts: dict[int, list[Skill]] = defaultdict(list)
+        ends: dict[int, list[Skill]] = defaultdict(list)
+        for skill in skills:
+            if skill.age_start is None or skill.age_end is None:
+                continue
+            if skill.age_start > skill.age_end:
+                continue
+            starts[skill.age_start].append(skill)
+            ends[skill.age_end + 1].append(skill)
+
+        self._bounds = sorted(starts.keys() | ends.keys())
+        self._segments: list[tuple[Skill, ...]] = []
+        active: dict[int, Skill] = {}
+        for bound in self._bounds:
+            for skill in ends.get(bound, []):
+                del active[skill.id]
+            for skill in starts.get(bound, []):
+                active[skill.id] = skill
+            self._segments.append(tuple(active[key] for key in sorted(active)))
+
+    def lookup(self, age: int) -> tuple[Skill, ...]:
+        """
+        Retrieves the skills whose age interval contains the age.
+
+        Args:
+            age (int): The age in months.
+
+        Returns:
+            tuple[Skill, ...]: The skills ordered by id, or an empty tuple.
+        """
+        position = bisect_right(self._bounds, age) - 1
+        if position < 0:
+            return ()
+        return self._segments[position]
+
+
+class SkillTable:
+    """Column-oriented lookup table of the skills with an actual age.
+
+    The skill type ids and actual ages are kept in parallel integer arrays,
+    skill_positions maps a skill id to its row.
+    """
+
+    def __init__(self, skills: Iterable[Skill]) -> None:
+        self.skill_ids = array("q")
+        self.skill_type_ids = array("q")
+        self.ages = array("q")
+        for skill in skills:
+            if skill.age_actual is None:
+                continue
+            self.skill_ids.append(skill.id)
+            self.skill_type_ids.append(skill.skill_type_id)
+            self.ages.append(skill.age_actual)
+        self.skill_positions = {
+            skill_id: position for position, skill_id in enumerate(self.skill_ids)
+        }
+        self.skill_type_order = tuple(dict.fromkeys(self.skill_type_ids))
+
+
+class RecommendationIndex:
+    """Per skill type index of the skills with an actual age, sorted by age.
+
+    The skills of a type between the assessment age of the type and the age
+    of the child are found with two bisects over the sorted ages, so only the
+    candidate skills are checked against the answers of the child.
+    """
+
+    def __init__(self, skills: Iterable[Skill]) -> None:
+        by_type: dict[int, list[Skill]] = defaultdict(list)
+        for skill in skills:
+            if skill.age_actual is not None:
+                by_type[skill.skill_type_id].append(skill)
+
+        self._skills: dict[int, tuple[Skill, ...]] = {}
+        self._ages: dict[int, array] = {}
+        for skill_type_id, type_skills in by_type.items():
+            type_skills.sort(key=lambda skill: (skill.age_actual, skill.id))
+            self._skills[skill_type_id] = tuple(type_skills)
+            self._ages[skill_type_id] = array(
+                "q", (skill.age_actual for skill in type_skills)
+            )
+
+    def candidates(
+        self, skill_type_id: int, assessed_age: int, age: int
+    ) -> tuple[Skill, ...]:
+        """
+        Retrieves the skills of a type older than the assessment age.
+
+        Args:
+            skill_type_id (int): The ID of the skill type.
+            assessed_age (int): Assessment age of the skill type, exclusive.
+            age (int): Age of the child in months, inclusive.
+
+        Returns:
+            tuple[Skill, ...]: The skills ordered by actual age and id.
+        """
+        ages = self._ages.get(skill_type_id)
+        if ages is None:
+            return ()
+        start = bisect_right(ages, assessed_age)
+        end = bisect_right(ages, age)
+        return self._skills[skill_type_id][start:end]
+
+    def select(
+        self,
+        skill_types_age: Mapping[int, int],
+        failed: Container[int],
+        age: int,
+    ) -> list[Skill]:
+        """
+        Selects the skills a child should be given recommendations for.
+
+        A skill is selected when its type was assessed, its actual age is
+        above the assessment age of the type and not above the age of the
+        child, and the child answered that it is not mastered.
+
+        Args:
+            skill_types_age (Mapping[int, int]): Assessment age by skill type id.
+            failed (Container[int]): Ids of the skills answered as not
+                mastered, e.g. DiagnosisSession.failed_skills.
+            age (int): Age of the child in months.
+
+        Returns:
+            list[Skill]: The skills ordered by actual age and id.
+        """
+        selected = [
+            [
+                skill
+                for skill in self.candidates(skill_type_id, assessed_age, age)
+                if skill.id in failed
+            ]
+            for skill_type_id, assessed_age in skill_types_age.items()
+        ]
+        return list(
+            heapq.merge(*selected, key=lambda skill: (skill.age_actual, skill.id))
+        )
+
+    def recommend(
+        self,
+        skill_types_age: Mapping[int, int],
+        failed: Container[int],
+        age: int,
+    ) -> list[str]:
+        """
+        Selects the recommendations of the skills a child failed.
+
+        Args:
+            skill_types_age (Mapping[int, int]): Assessment age by skill type id.
+            failed (Container[int]): Ids of the skills answered as not mastered.
+            age (int): Age of the child in months.
+
+        Returns:
+            list[str]: The recommendations of the skills chosen by select().
+        """
+        return [
+            skill.recommendation for skill in self.select(skill_types_age, failed, age)
+        ]
+
+
+@dataclass(frozen=True)
+class SkillCatalog:
+    """Immutable snapshot of the skills and skill types tables.
+
+    A catalog is shared by every repository instance in the process, so
+    neither the tuples nor the models inside them may be mutated by callers.
+    """
+
+    version: int
+    skill_types: tuple[SkillType, ...]
+    skills: tuple[Skill, ...]
+
+    @cached_property
+    def skills_by_id(self) -> dict[int, Skill]:
+        """Skills of the catalog keyed by their id."""
+        return {skill.id: skill for skill in self.skills}
+
+    @cached_property
+    def skill_table(self) -> SkillTable:
+        """Lookup table of skill type and actual age by skill id."""
+        return SkillTable(self.skills)
+
+    @cached_property
+    def recommendation_index(self) -> RecommendationIndex:
+        """Age-sorted index of the catalog skills by skill type."""
+        return RecommendationIndex(self.skills)
+
+    @cached_property
+    def age_index(self) -> SkillAgeIndex:
+        """Interval index of the catalog skills by age."""
+        return SkillAgeIndex(self.skills)
+
+    def skills_for_age(self, age: int) -> tuple[Skill, ...]:
+        """Skills whose age interval contains the age, ordered by id."""
+        return self.age_index.lookup(age)
+
+
+class SkillCatalogCache:
+    """Process-wide holder of the current SkillCatalog.
+
+    The catalog version lives in the catalog_version table and the catalog
+    loading scripts bump it in the transaction that changes the skills or
+    skill_types tables. The cache reads the version at most every
+    check_interval seconds and reloads the catalog once it changed, so every
+    process serves the new catalog check_interval seconds after the load at
+    the latest.
+    """
+
+    def __init__(self, check_interval: float = 5.0) -> None:
+        self._lock = threading.Lock()
+        self._catalog: SkillCatalog | None = None
+        self._checked_at = -math.inf
+        self.check_interval = check_interval
+
+    def get(
+        self,
+        loader: Callable[[int], SkillCatalog],
+        read_version: Callable[[], int],
+    ) -> SkillCatalog:
+        """
+        Returns the cached catalog, loading it if it is missing or outdated.
+
+        Args:
+            loader (Callable): Builds a catalog for the given version.
+            read_version (Callable): Reads the catalog version of the database.
+
+        Returns:
+            SkillCatalog: The catalog of the current version.
+        """
+        catalog = self._catalog
+        if (
+            catalog is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        ):
+            return catalog
+
+        version = read_version()
+        if catalog is None or catalog.version != version:
+            # Built without holding the lock: the loader queries the database,
+            # and from AsyncSession.run_sync a thread blocked on the lock would
+            # block the event loop. Concurrent misses may load twice.
+            catalog = loader(version)
+        with self._lock:
+            self._catalog = catalog
+            self._checked_at = time.monotonic()
+        return catalog
+
+    def invalidate(self) -> None:
+        """Drops the cached catalog so the next access of this process reloads it."""
+        with self._lock:
+            self._catalog = None
+
+
+skill_catalog_cache = SkillCatalogCache()
+
+
+def invalidate_skill_catalog() -> None:
+    """Drops the process-wide skill catalog of this process, e.g. in tests."""
+    skill_catalog_cache.invalidate()
@@ -3,15 +3,16 @@ from datetime import date
 from sqlalchemy.sql.elements import ColumnElement
 
 from src.models.database.models import Child as ChildSchema
-from src.models.domain.models import Child
-from src.repos.base import BaseRepository
+from src.models.domain.models import Child, ChildRead
+from src.repos.base import AsyncBaseRepository, BaseRepository
 
 
 class ChildRepository(BaseRepository):
     _schema = ChildSchema
     _model = Child
+    _projection = ChildRead
 
-    def get_child(self, child_id: int) -> Child | None:
+    def get_child(self, child_id: int) -> ChildRead | None:
         """
         Retrieves a child by their id.
 
@@ -19,27 +20,31 @@ class ChildRepository(BaseRepository):
             child_id (int): The ID of the child to retrieve.
 
         Returns:
-            Child: The child with the specified ID, or None if not found.
+            ChildRead: The child with the specified ID, or None if not found.
         """
         filters: list[ColumnElement] = [self._schema.id == child_id]
-        child = self._query(filters=filters).first()
-        return self._model.model_validate(child) if child else None
+        children = self._query_projection(self._projection, filters=filters)
+        return children[0] if children else None
 
-    def get_children(self, user_id: int) -> list[Child]:
+    def get_children(self, user_id: int) -> list[ChildRead]:
         """
         Retrieves a list of children by their parent's id.
 
+        Only the columns of the children are selected, their diagnosis
+        history and results are never loaded.
+
         Args:
             user_id (int): The parent's ID of the child to retrieve.
 
         Returns:
-            Child: The child with the specified parent's ID, or None if not found.
+            list[ChildRead]: The children of the parent.
         """
         filters: list[ColumnElement] = [self._schema.user_id == user_id]
-        children = self._query(filters=filters).all()
-        return [self._model.model_validate(child) for child in children]
+        return self._query_projection(
+            self._projection, filters=filters, order_by=[self._schema.id]
+        )
 
-    def create_child(self, user_id: int, name: str, birth_date: date) -> Child:
+    def create_child(self, user_id: int, name: str, birth_date: date) -> ChildRead:
         """
         Creates a child by their parent's ID, name and birth_date.
 
@@ -49,9 +54,27 @@ class ChildRepository(BaseRepository):
             birth_date (date): The birth_date ID of the child to create.
 
         Returns:
-            Child: The created child.
+            ChildRead: The created child.
         """
         child = self._schema(user_id=user_id, name=name, birth_date=birth_date)
         self.add(child)
         self.flush()
-        return self._model.model_validate(child)
+        return self._projection.model_validate(child)
+
+
+class AsyncChildRepository(AsyncBaseRepository):
+    _repository = ChildRepository
+
+    async def get_child(self, child_id: int) -> ChildRead | None:
+        """Async variant of ChildRepository.get_child."""
+        return await self._run(ChildRepository.get_child, child_id)
+
+    async def get_children(self, user_id: int) -> list[ChildRead]:
+        """Async variant of ChildRepository.get_children."""
+        return await self._run(ChildRepository.get_children, user_id)
+
+    async def create_child(
+        self, user_id: int, name: str, birth_date: date
+    ) -> ChildRead:
+        """Async variant of ChildRepository.create_child."""
+        return await self._run(ChildRepository.create_child, user_id, name, birth_date)
@@ -1,11 +1,59 @@
 import datetime
+from collections.abc import Iterator, Mapping, Sequence
+from typing import NamedTuple
 
+from sqlalchemy import delete, event, exists, func, select, update
+from sqlalchemy.orm import Session, SessionTransaction
 from sqlalchemy.sql.elements import ColumnElement
 
+from src.models.database.models import Child as ChildSchema
 from src.models.database.models import DiagnosisHistory as DiagnosisHistorySchema
 from src.models.database.models import DiagnosisResult as DiagnosisSchema
-from src.models.domain.models import DiagnosisHistory, DiagnosisResult
-from src.repos.base import BaseRepository
+from src.models.database.models import DiagnosisSession as DiagnosisSessionSchema
+from src.models.domain.models import (
+    ChildRead,
+    DiagnosisHistory,
+    DiagnosisResult,
+    DiagnosisSession,
+)
+from src.repos.base import AsyncBaseRepository, BaseRepository, Page
+from src.repos.buffer import (
+    DiagnosisHistoryBuffer,
+    PendingAnswer,
+    diagnosis_history_buffer,
+)
+
+_WRITTEN_ANSWERS = "diagnosis_history_written"
+
+
+class _WrittenAnswers(NamedTuple):
+    """Buffered answers written by a transaction that did not commit yet."""
+
+    transaction: SessionTransaction | None
+    answers: list[tuple[DiagnosisHistoryBuffer, list[PendingAnswer]]]
+
+
+def _forget_written_answers(session: Session) -> None:
+    # The transaction that wrote the buffered answers committed
+    session.info.pop(_WRITTEN_ANSWERS, None)
+
+
+def _restore_written_answers(session: Session, transaction: SessionTransaction) -> None:
+    # The transaction that wrote the buffered answers ended without a commit,
+    # the answers go back into their buffers to be written again
+    written: _WrittenAnswers | None = session.info.get(_WRITTEN_ANSWERS)
+    if written is None or written.transaction is not transaction:
+        return
+    del session.info[_WRITTEN_ANSWERS]
+    for buffer, answers in reversed(written.answers):
+        buffer.restore(answers)
+
+
+class DiagnosisSummary(NamedTuple):
+    """Child with the last completed diagnosis, read in one statement."""
+
+    child: ChildRead
+    session: DiagnosisSession | None
 
 
 class DiagnosisRepository(BaseRepository):
@@ -13,6 +61,21 @@ class DiagnosisRepository(BaseRepository):
     _model = DiagnosisHistory
     _schema_result = DiagnosisSchema
     _model_result = DiagnosisResult
+    _schema_session = DiagnosisSessionSchema
+    _model_session = DiagnosisSession
+
+    def __init__(
+        self, db: Session, buffer: DiagnosisHistoryBuffer = diagnosis_history_buffer
+    ) -> None:
+        """Instantiate the repository with a db session.
+
+        Args:
+            db: A sqlalchemy.orm.session.Session object.
+            buffer: Write-behind buffer of diagnosis answers, the process-wide
+                one by default.
+        """
+        super().__init__(db)
+        self._buffer = buffer
 
     def get_diagnosis(
         self, child_id: int, skill_type_id: int
@@ -35,14 +98,63 @@ class DiagnosisRepository(BaseRepository):
         diagnosis = self._query_schema(
             schema=self._schema_result,
             filters=filters,
-            order_by="date",
+            order_by=self._schema_result.date,
             order_type="desc",
             size=1,
         ).first()
         return self._model_result.model_validate(diagnosis) if diagnosis else None
 
+    def get_latest_diagnoses(self, child_id: int) -> list[DiagnosisResult]:
+        """
+        Retrieves last child's diagnosis result for every skill type in one query.
+
+        Postgres picks the rows with DISTINCT ON, other databases fall back
+        to ranking the rows with a ROW_NUMBER window function.
+
+        Args:
+            child_id (int): The ID of the child.
+
+        Returns:
+            list[DiagnosisResult]: The latest diagnosis result of each skill type
+            ordered by skill type id, or empty list if not found.
+        """
+        schema = self._schema_result
+        if self._db.get_bind().dialect.name == "postgresql":
+            query = (
+                self._db.query(schema)
+                .filter(schema.child_id == child_id)
+                .distinct(schema.skill_types_id)
+                .order_by(schema.skill_types_id, schema.date.desc(), schema.id.desc())
+            )
+        else:
+            ranked = (
+                select(
+                    schema.id,
+                    func.row_number()
+                    .over(
+                        partition_by=schema.skill_types_id,
+                        order_by=(schema.date.desc(), schema.id.desc()),
+                    )
+                    .label("position"),
+                )
+                .where(schema.child_id == child_id)
+                .subquery()
+            )
+            query = (
+                self._db.query(schema)
+                .join(ranked, ranked.c.id == schema.id)
+                .filter(ranked.c.position == 1)
+                .order_by(schema.skill_types_id)
+            )
+        return [self._model_result.model_validate(el) for el in query.all()]
+
     def create_diagnosis_history(
-        self, child_id: int, skill_id: int, skill_type_id: int, answer: bool
+        self,
+        child_id: int,
+        skill_id: int,
+        skill_type_id: int,
+        answer: bool,
+        session_id: int | None = None,
     ) -> DiagnosisHistory:
         """
         Creates diagnosis history for child's skill.
@@ -52,6 +164,7 @@ class DiagnosisRepository(BaseRepository):
             skill_id (int): The ID of the skill.
             skill_type_id (int): The ID of the skill type.
             answer (bool): Skill mastered.
+            session_id (int | None): The ID of the diagnosis session.
 
         Returns:
             DiagnosisHistory: The created diagnosis history.
@@ -62,15 +175,124 @@ class DiagnosisRepository(BaseRepository):
             skill_type_id=skill_type_id,
             mastered=answer,
             date=datetime.date.today(),
+            session_id=session_id,
         )
         self.add(history)
         self.flush()
         return self._model.model_validate(history)
 
+    def create_diagnosis_histories(self, answers: Sequence[PendingAnswer]) -> int:
+        """
+        Creates diagnosis history rows with a single multi-row insert.
+
+        Args:
+            answers (Sequence[PendingAnswer]): The answers to insert.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        if not answers:
+            return 0
+        self._db.execute(
+            self._insert(self._schema).values([answer._asdict() for answer in answers])
+        )
+        return len(answers)
+
+    def buffer_diagnosis_history(
+        self,
+        child_id: int,
+        skill_id: int,
+        skill_type_id: int,
+        answer: bool,
+        session_id: int | None = None,
+    ) -> int:
+        """
+        Adds an answer to the write-behind buffer instead of inserting it.
+
+        The answers of the child are written in the current transaction
+        once the buffer thresholds are reached, the caller commits.
+
+        Args:
+            child_id (int): The ID of the child.
+            skill_id (int): The ID of the skill.
+            skill_type_id (int): The ID of the skill type.
+            answer (bool): Skill mastered.
+            session_id (int | None): The ID of the diagnosis session.
+
+        Returns:
+            int: The number of answers of the child still pending.
+        """
+        pending = PendingAnswer(
+            child_id=child_id,
+            skill_id=skill_id,
+            skill_type_id=skill_type_id,
+            mastered=answer,
+            date=datetime.date.today(),
+            session_id=session_id,
+        )
+        if self._buffer.add(pending):
+            self.flush_diagnosis_history(child_id)
+        return self._buffer.pending(child_id)
+
+    def flush_diagnosis_history(self, child_id: int) -> int:
+        """
+        Writes the buffered answers of a child in the current transaction.
+
+        The caller commits. The answers go back into the buffer if the write
+        fails, which only rolls back to a savepoint, or if the transaction
+        ends without a commit.
+
+        Args:
+            child_id (int): The ID of the child.
+
+        Returns:
+            int: The number of written answers.
+        """
+        answers = self._buffer.drain(child_id)
+        if not answers:
+            return 0
+        try:
+            with self._db.begin_nested():
+                self.create_diagnosis_histories(answers)
+        except Exception:
+            self._buffer.restore(answers)
+            raise
+        self._hold_until_commit(answers)
+        return len(answers)
+
+    def _hold_until_commit(self, answers: list[PendingAnswer]) -> None:
+        """Puts written answers back into the buffer unless their transaction commits."""
+        if not event.contains(self._db, "after_commit", _forget_written_answers):
+            event.listen(self._db, "after_commit", _forget_written_answers)
+            event.listen(self._db, "after_transaction_end", _restore_written_answers)
+        transaction = self._db.get_transaction()
+        written: _WrittenAnswers | None = self._db.info.get(_WRITTEN_ANSWERS)
+        if written is None or written.transaction is not transaction:
+            written = _WrittenAnswers(transaction, [])
+            self._db.info[_WRITTEN_ANSWERS] = written
+        written.answers.append((self._buffer, answers))
+
+    def flush_due_diagnosis_history(self, force: bool = False) -> int:
+        """
+        Writes the buffered answers that are older than the buffer's max_age.
+
+        The answers are written in the current transaction, the caller commits.
+
+        Args:
+            force (bool): Write the buffered answers of every child.
+
+        Returns:
+            int: The number of written answers.
+        """
+        due = self._buffer.due(0 if force else None)
+        return sum(self.flush_diagnosis_history(child_id) for child_id in due)
+
     def get_diagnosis_history(self, child_id: int) -> list[DiagnosisHistory]:
         """
         Retrieves child's diagnosis history.
 
+        Answers still waiting in the write-behind buffer are not included.
+
         Args:
             child_id (int): The ID of the child.
 
@@ -82,6 +304,56 @@ class DiagnosisRepository(BaseRepository):
         diagnosis_history = self._query(filters=filters).all()
         return [self._model.model_validate(el) for el in diagnosis_history]
 
+    def get_diagnosis_history_page(
+        self, child_id: int, cursor: str | None = None, size: int = 50
+    ) -> Page[DiagnosisHistory]:
+        """
+        Retrieves one page of child's diagnosis history, newest answers first.
+
+        Args:
+            child_id (int): The ID of the child.
+            cursor (str | None): next_cursor of the previous page.
+            size (int): Number of answers of the page.
+
+        Returns:
+            Page[DiagnosisHistory]: The answers and the cursor of the next page.
+        """
+        page = self._query_page(
+            keys=(self._schema.date, self._schema.id),
+            filters=[self._schema.child_id == child_id],
+            descending=True,
+            size=size,
+            cursor=cursor,
+        )
+        return Page(
+            [self._model.model_validate(el) for el in page.items], page.next_cursor
+        )
+
+    def stream_diagnosis_history(
+        self, child_id: int | None = None, chunk_size: int = 1000
+    ) -> Iterator[DiagnosisHistory]:
+        """
+        Streams the diagnosis history of a child or of all children, e.g. for
+        exports and reports.
+
+        Unlike get_diagnosis_history the answers are fetched and converted in
+        chunks, so memory use does not grow with the size of the table.
+
+        Args:
+            child_id (int | None): The ID of the child, None for all children.
+            chunk_size (int): Number of answers fetched per round trip.
+
+        Yields:
+            DiagnosisHistory: The answers ordered by child, date and id.
+        """
+        filters = None if child_id is None else [self._schema.child_id == child_id]
+        yield from self._stream_projection(
+            self._model,
+            filters=filters,
+            order_by=[self._schema.child_id, self._schema.date, self._schema.id],
+            chunk_size=chunk_size,
+        )
+
     def create_diagnosis_result(
         self, child_id: int, skill_type_id: int, age_assessment: int
     ) -> DiagnosisResult:
@@ -106,12 +378,351 @@ class DiagnosisRepository(BaseRepository):
         self.flush()
         return self._model_result.model_validate(result)
 
+    def create_diagnosis_results(
+        self,
+        child_id: int,
+        skill_types_age: dict[int, int],
+        session_id: int | None = None,
+    ) -> list[DiagnosisResult]:
+        """
+        Creates diagnosis results for several child's skill types at once.
+
+        All rows are written by a single INSERT ... VALUES ... RETURNING
+        statement, without flushing the session per row.
+
+        Args:
+            child_id (int): The ID of the child.
+            skill_types_age (dict[int, int]): Assessment age by skill type id.
+            session_id (int | None): The ID of the diagnosis session.
+
+        Returns:
+            list[DiagnosisResult]: The created diagnosis results in the order
+            of skill_types_age.
+        """
+        return self._create_results({child_id: skill_types_age}, session_id)[child_id]
+
+    def create_children_diagnosis_results(
+        self, skill_types_age: Mapping[int, Mapping[int, int]]
+    ) -> dict[int, list[DiagnosisResult]]:
+        """
+        Creates the diagnosis results of several children at once.
+
+        The rows of all children are written by a single
+        INSERT ... VALUES ... RETURNING statement.
+
+        Args:
+            skill_types_age (Mapping[int, Mapping[int, int]]): Assessment age
+                by skill type id, by child id.
+
+        Returns:
+            dict[int, list[DiagnosisResult]]: The created diagnosis results by
+            child id, in the order of skill_types_age.
+        """
+        return self._create_results(skill_types_age)
+
+    def _create_results(
+        self,
+        skill_types_age: Mapping[int, Mapping[int, int]],
+        session_id: int | None = None,
+    ) -> dict[int, list[DiagnosisResult]]:
+        today = datetime.date.today()
+        rows = [
+            {
+                "child_id": child_id,
+                "skill_types_id": skill_type_id,
+                "age_assessment": age_assessment,
+                "date": today,
+                "session_id": session_id,
+            }
+            for child_id, ages in skill_types_age.items()
+            for skill_type_id, age_assessment in ages.items()
+        ]
+        results = {}
+        if rows:
+            statement = (
+                self._insert(self._schema_result)
+                .values(rows)
+                .returning(self._schema_result)
+            )
+            results = {
+                (result.child_id, result.skill_types_id): result
+                for result in self._db.scalars(statement).all()
+            }
+        return {
+            child_id: [
+                self._model_result.model_validate(results[child_id, skill_type_id])
+                for skill_type_id in ages
+            ]
+            for child_id, ages in skill_types_age.items()
+        }
+
+    def create_diagnosis_session(self, child_id: int) -> DiagnosisSession:
+        """
+        Opens a diagnosis session of a child.
+
+        Args:
+            child_id (int): The ID of the child.
+
+        Returns:
+            DiagnosisSession: The created session, without a summary.
+        """
+        session = self._schema_session(child_id=child_id, date=datetime.date.today())
+        self.add(session)
+        self.flush()
+        return self._model_session.model_validate(session)
+
+    def get_diagnosis_session(
+        self, session_id: int, lock: bool = False
+    ) -> DiagnosisSession | None:
+        """
+        Retrieves a diagnosis session by its id.
+
+        Args:
+            session_id (int): The ID of the session.
+            lock (bool): Locks the row until the end of the transaction with
+                SELECT ... FOR UPDATE, so concurrent completions of the
+                session run one after the other.
+
+        Returns:
+            DiagnosisSession: The session, or None if not found.
+        """
+        query = self._query_schema(
+            schema=self._schema_session,
+            filters=[self._schema_session.id == session_id],
+        )
+        if lock:
+            query = query.with_for_update()
+        session = query.first()
+        return self._model_session.model_validate(session) if session else None
+
+    def get_latest_diagnosis_session(self, child_id: int) -> DiagnosisSession | None:
+        """
+        Retrieves the last completed diagnosis session of a child.
+
+        Args:
+            child_id (int): The ID of the child.
+
+        Returns:
+            DiagnosisSession: The session with its summary, or None if the
+            child has not completed a diagnosis.
+        """
+        session = self._query_schema(
+            schema=self._schema_session,
+            filters=[
+                self._schema_session.child_id == child_id,
+                self._schema_session.skill_types_age.is_not(None),
+            ],
+            order_by=self._schema_session.id,
+            order_type="desc",
+            size=1,
+        ).first()
+        return self._model_session.model_validate(session) if session else None
+
+    def get_diagnosis_summary(self, child_id: int) -> DiagnosisSummary | None:
+        """
+        Retrieves a child with the last completed diagnosis session.
+
+        The child row is outer joined with the session picked by a correlated
+        top-1 subquery, so the assessment ages by skill type and the answers
+        of the last diagnosis come with the child in one statement. The
+        subquery walks the (child_id, id) index backwards and stops at the
+        first completed session, which keeps the cost flat however long the
+        history of the child is, where a ROW_NUMBER window would rank every
+        session of the child first.
+
+        Args:
+            child_id (int): The ID of the child.
+
+        Returns:
+            DiagnosisSummary: The child and its last completed session, with
+            session None if the child has not completed a diagnosis, or None
+            if the child is not found.
+        """
+        # Core columns, the statement is built on every call and ORM
+        # attributes of an alias cost more to build than the query to run
+        children = ChildSchema.__table__
+        sessions = self._schema_session.__table__
+        completed = sessions.alias("completed")
+        latest = (
+            select(completed.c.id)
+            .where(
+                completed.c.child_id == children.c.id,
+                completed.c.skill_types_age.is_not(None),
+            )
+            .order_by(completed.c.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                *(
+                    children.c[name].label(f"child_{name}")
+                    for name in ChildRead.model_fields
+                ),
+                *(
+                    sessions.c[name].label(f"session_{name}")
+                    for name in self._model_session.model_fields
+                ),
+            )
+            .select_from(children.outerjoin(sessions, sessions.c.id == latest))
+            .where(children.c.id == child_id)
+        )
+        row = self._db.execute(query).first()
+        if row is None:
+            return None
+
+        values = row._asdict()
+        child = ChildRead.model_validate(
+            {name: values[f"child_{name}"] for name in ChildRead.model_fields}
+        )
+        if values["session_id"] is None:
+            return DiagnosisSummary(child, None)
+        session = self._model_session.model_validate(
+            {
+                name: values[f"session_{name}"]
+                for name in self._model_session.model_fields
+            }
+        )
+        return DiagnosisSummary(child, session)
+
+    def get_diagnosis_sessions_page(
+        self, child_id: int, cursor: str | None = None, size: int = 20
+    ) -> Page[DiagnosisSession]:
+        """
+        Retrieves one page of child's completed diagnoses, newest first.
+
+        Every diagnosis is a single row with its summary, so a history
+        screen does not read the answers.
+
+        Args:
+            child_id (int): The ID of the child.
+            cursor (str | None): next_cursor of the previous page.
+            size (int): Number of diagnoses of the page.
+
+        Returns:
+            Page[DiagnosisSession]: The sessions and the cursor of the next page.
+        """
+        page = self._query_page(
+            keys=(self._schema_session.id,),
+            filters=[
+                self._schema_session.child_id == child_id,
+                self._schema_session.skill_types_age.is_not(None),
+            ],
+            descending=True,
+            size=size,
+            cursor=cursor,
+            schema=self._schema_session,
+        )
+        return Page(
+            [self._model_session.model_validate(el) for el in page.items],
+            page.next_cursor,
+        )
+
+    def get_session_results(self, session_id: int) -> list[DiagnosisResult]:
+        """
+        Retrieves the diagnosis results of a completed session.
+
+        Args:
+            session_id (int): The ID of the session.
+
+        Returns:
+            list[DiagnosisResult]: The results in the order they were created.
+        """
+        results = self._query_schema(
+            schema=self._schema_result,
+            filters=[self._schema_result.session_id == session_id],
+            order_by=self._schema_result.id,
+            order_type="asc",
+        ).all()
+        return [self._model_result.model_validate(result) for result in results]
+
+    def get_session_answers(self, session_id: int) -> dict[int, bool]:
+        """
+        Retrieves the answers given during a diagnosis session.
+
+        Args:
+            session_id (int): The ID of the session.
+
+        Returns:
+            dict: skill_id as key and mastered as value, the last answer of
+            a skill wins.
+        """
+        rows = self._db.execute(
+            select(self._schema.skill_id, self._schema.mastered)
+            .where(self._schema.session_id == session_id)
+            .order_by(self._schema.id)
+        )
+        return dict(rows.tuples().all())
+
+    def complete_diagnosis_session(
+        self,
+        session_id: int,
+        skill_types_age: dict[int, int],
+        answers: dict[int, bool],
+    ) -> DiagnosisSession | None:
+        """
+        Stores the summary of a diagnosis session.
+
+        Args:
+            session_id (int): The ID of the session.
+            skill_types_age (dict[int, int]): Assessment age by skill type id.
+            answers (dict[int, bool]): Mastered status by skill id.
+
+        Returns:
+            DiagnosisSession: The completed session, or None if not found.
+        """
+        answered, mastered = self._model_session.summarize(answers)
+        session = self._db.scalars(
+            update(self._schema_session)
+            .where(self._schema_session.id == session_id)
+            .values(
+                skill_types_age={
+                    str(skill_type_id): age
+                    for skill_type_id, age in skill_types_age.items()
+                },
+                answered=answered,
+                mastered=mastered,
+            )
+            .returning(self._schema_session),
+            execution_options={"synchronize_session": False},
+        ).first()
+        return self._model_session.model_validate(session) if session else None
+
+    def delete_empty_diagnosis_sessions(self, before: datetime.date) -> int:
+        """
+        Deletes unfinished diagnosis sessions without answers or results.
+
+        Such sessions were opened and abandoned before the first answer was
+        written. Unfinished sessions with answers are kept with them.
+
+        Args:
+            before (datetime.date): Only sessions opened before this date are
+                deleted, so that sessions in use are kept.
+
+        Returns:
+            int: Number of deleted sessions.
+        """
+        schema = self._schema_session
+        result = self._db.execute(
+            delete(schema)
+            .where(
+                schema.date < before,
+                schema.answered.is_(None),
+                ~exists().where(self._schema.session_id == schema.id),
+                ~exists().where(self._schema_result.session_id == schema.id),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount  # type: ignore[attr-defined]
+
     def mastered_skill(
         self, child_id: int, date: datetime.date | None
     ) -> dict[int, bool]:
         """
         Checks if a skill is mastered by a child.
 
+        A skill answered more than once keeps its latest answer.
+
         Args:
             child_id (int): The ID of the child.
             date (datetime.datetime): Date for filters, or None for all
@@ -124,10 +735,182 @@ class DiagnosisRepository(BaseRepository):
             if date
             else [self._schema.child_id == child_id]
         )
-        res = self._query(filters=filters, order_by="date DESC").all()
+        # Oldest first, so later answers overwrite earlier ones in the dict
+        res = (
+            self._query(filters=filters, order_by=self._schema.date, order_type="asc")
+            .order_by(self._schema.id)
+            .all()
+        )
         result_dict: dict[int, bool] = {}
         if not res:
             return result_dict
         for item in res:
             result_dict[item.skill_id] = item.mastered
         return result_dict
+
+
+class AsyncDiagnosisRepository(AsyncBaseRepository):
+    _repository = DiagnosisRepository
+
+    async def get_diagnosis(
+        self, child_id: int, skill_type_id: int
+    ) -> DiagnosisResult | None:
+        """Async variant of DiagnosisRepository.get_diagnosis."""
+        return await self._run(
+            DiagnosisRepository.get_diagnosis, child_id, skill_type_id
+        )
+
+    async def get_latest_diagnoses(self, child_id: int) -> list[DiagnosisResult]:
+        """Async variant of DiagnosisRepository.get_latest_diagnoses."""
+        return await self._run(DiagnosisRepository.get_latest_diagnoses, child_id)
+
+    async def create_diagnosis_history(
+        self,
+        child_id: int,
+        skill_id: int,
+        skill_type_id: int,
+        answer: bool,
+        session_id: int | None = None,
+    ) -> DiagnosisHistory:
+        """Async variant of DiagnosisRepository.create_diagnosis_history."""
+        return await self._run(
+            DiagnosisRepository.create_diagnosis_history,
+            child_id,
+            skill_id,
+            skill_type_id,
+            answer,
+            session_id,
+        )
+
+    async def buffer_diagnosis_history(
+        self,
+        child_id: int,
+        skill_id: int,
+        skill_type_id: int,
+        answer: bool,
+        session_id: int | None = None,
+    ) -> int:
+        """Async variant of DiagnosisRepository.buffer_diagnosis_history."""
+        return await self._run(
+            DiagnosisRepository.buffer_diagnosis_history,
+            child_id,
+            skill_id,
+            skill_type_id,
+            answer,
+            session_id,
+        )
+
+    async def flush_diagnosis_history(self, child_id: int) -> int:
+        """Async variant of DiagnosisRepository.flush_diagnosis_history."""
+        return await self._run(DiagnosisRepository.flush_diagnosis_history, child_id)
+
+    async def get_diagnosis_history(self, child_id: int) -> list[DiagnosisHistory]:
+        """Async variant of DiagnosisRepository.get_diagnosis_history."""
+        return await self._run(DiagnosisRepository.get_diagnosis_history, child_id)
+
+    async def get_diagnosis_history_page(
+        self, child_id: int, cursor: str | None = None, size: int = 50
+    ) -> Page[DiagnosisHistory]:
+        """Async variant of DiagnosisRepository.get_diagnosis_history_page."""
+        return await self._run(
+            DiagnosisRepository.get_diagnosis_history_page, child_id, cursor, size
+        )
+
+    async def create_diagnosis_result(
+        self, child_id: int, skill_type_id: int, age_assessment: int
+    ) -> DiagnosisResult:
+        """Async variant of DiagnosisRepository.create_diagnosis_result."""
+        return await self._run(
+            DiagnosisRepository.create_diagnosis_result,
+            child_id,
+            skill_type_id,
+            age_assessment,
+        )
+
+    async def create_diagnosis_results(
+        self,
+        child_id: int,
+        skill_types_age: dict[int, int],
+        session_id: int | None = None,
+    ) -> list[DiagnosisResult]:
+        """Async variant of DiagnosisRepository.create_diagnosis_results."""
+        return await self._run(
+            DiagnosisRepository.create_diagnosis_results,
+            child_id,
+            skill_types_age,
+            session_id,
+        )
+
+    async def create_children_diagnosis_results(
+        self, skill_types_age: Mapping[int, Mapping[int, int]]
+    ) -> dict[int, list[DiagnosisResult]]:
+        """Async variant of DiagnosisRepository.create_children_diagnosis_results."""
+        return await self._run(
+            DiagnosisRepository.create_children_diagnosis_results, skill_types_age
+        )
+
+    async def create_diagnosis_session(self, child_id: int) -> DiagnosisSession:
+        """Async variant of DiagnosisRepository.create_diagnosis_session."""
+        return await self._run(DiagnosisRepository.create_diagnosis_session, child_id)
+
+    async def get_diagnosis_session(
+        self, session_id: int, lock: bool = False
+    ) -> DiagnosisSession | None:
+        """Async variant of DiagnosisRepository.get_diagnosis_session."""
+        return await self._run(
+            DiagnosisRepository.get_diagnosis_session, session_id, lock
+        )
+
+    async def get_latest_diagnosis_session(
+        self, child_id: int
+    ) -> DiagnosisSession | None:
+        """Async variant of DiagnosisRepository.get_latest_diagnosis_session."""
+        return await self._run(
+            DiagnosisRepository.get_latest_diagnosis_session, child_id
+        )
+
+    async def get_diagnosis_summary(self, child_id: int) -> DiagnosisSummary | None:
+        """Async variant of DiagnosisRepository.get_diagnosis_summary."""
+        return await self._run(DiagnosisRepository.get_diagnosis_summary, child_id)
+
+    async def get_diagnosis_sessions_page(
+        self, child_id: int, cursor: str | None = None, size: int = 20
+    ) -> Page[DiagnosisSession]:
+        """Async variant of DiagnosisRepository.get_diagnosis_sessions_page."""
+        return await self._run(
+            DiagnosisRepository.get_diagnosis_sessions_page, child_id, cursor, size
+        )
+
+    async def get_session_results(self, session_id: int) -> list[DiagnosisResult]:
+        """Async variant of DiagnosisRepository.get_session_results."""
+        return await self._run(DiagnosisRepository.get_session_results, session_id)
+
+    async def get_session_answers(self, session_id: int) -> dict[int, bool]:
+        """Async variant of DiagnosisRepository.get_session_answers."""
+        return await self._run(DiagnosisRepository.get_session_answers, session_id)
+
+    async def complete_diagnosis_session(
+        self,
+        session_id: int,
+        skill_types_age: dict[int, int],
+        answers: dict[int, bool],
+    ) -> DiagnosisSession | None:
+        """Async variant of DiagnosisRepository.complete_diagnosis_session."""
+        return await self._run(
+            DiagnosisRepository.complete_diagnosis_session,
+            session_id,
+            skill_types_age,
+            answers,
+        )
+
+    async def delete_empty_diagnosis_sessions(self, before: datetime.date) -> int:
+        """Async variant of DiagnosisRepository.delete_empty_diagnosis_sessions."""
+        return await self._run(
+            DiagnosisRepository.delete_empty_diagnosis_sessions, before
+        )
+
+    async def mastered_skill(
+        self, child_id: int, date: datetime.date | None
+    ) -> dict[int, bool]:
+        """Async variant of DiagnosisRepository.mastered_skill."""
+        return await self._run(DiagnosisRepository.mastered_skill, child_id, date)
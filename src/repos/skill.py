@@ -1,10 +1,38 @@
-from sqlalchemy import and_, or_
+from collections.abc import Iterable
+from itertools import batched
+from typing import NamedTuple
+
+from sqlalchemy import and_, select, tuple_, update
+from sqlalchemy.orm import Session
 from sqlalchemy.sql.elements import ColumnElement
 
+from src.models.database.models import CatalogVersion as CatalogVersionSchema
 from src.models.database.models import Skill as SkillSchema
 from src.models.database.models import SkillType as SkillTypeSchema
 from src.models.domain.models import Skill, SkillType
-from src.repos.base import BaseRepository
+from src.repos.base import AsyncBaseRepository, BaseRepository
+from src.repos.catalog import SkillCatalog, skill_catalog_cache
+
+
+class CatalogEntry(NamedTuple):
+    """A skill of the catalog file, keyed by skill type name and skill name."""
+
+    skill_type: str
+    name: str
+    criteria: str | None
+    recommendation: str
+    age_start: int | None
+    age_end: int | None
+    age_actual: int | None
+
+
+class CatalogLoadStats(NamedTuple):
+    """Counts of a catalog load."""
+
+    skill_types_inserted: int
+    inserted: int
+    updated: int
+    skipped: int
 
 
 class SkillRepository(BaseRepository):
@@ -13,6 +41,88 @@ class SkillRepository(BaseRepository):
     _schema_skill_type = SkillTypeSchema
     _model_skill_type = SkillType
 
+    def __init__(self, db: Session, use_catalog: bool = True) -> None:
+        """Instantiate the repository with a db session.
+
+        Args:
+            db: A sqlalchemy.orm.session.Session object.
+            use_catalog: Serve catalog reads from the process-wide skill
+                catalog instead of querying the database every time.
+        """
+        super().__init__(db)
+        self._use_catalog = use_catalog
+
+    @property
+    def catalog(self) -> SkillCatalog:
+        """The process-wide skill catalog, reloaded when its version changes."""
+        return skill_catalog_cache.get(self._load_catalog, self.get_catalog_version)
+
+    def get_catalog_version(self) -> int:
+        """
+        Reads the catalog version stored in the database.
+
+        Returns:
+            int: The version, 0 if it was never bumped.
+        """
+        version = self._db.execute(
+            select(CatalogVersionSchema.version).where(CatalogVersionSchema.id == 1)
+        ).scalar_one_or_none()
+        return version or 0
+
+    def bump_catalog_version(self) -> int:
+        """
+        Increments the catalog version in the current transaction.
+
+        Every process reloads its cached catalog once it reads the new
+        version, so whatever changes the skills or skill types tables bumps
+        the version in the same transaction. The caller commits.
+
+        Returns:
+            int: The new catalog version.
+        """
+        schema = CatalogVersionSchema
+        statement = (
+            self._insert(schema)
+            .values(id=1, version=1)
+            .on_conflict_do_update(
+                index_elements=["id"], set_={"version": schema.version + 1}
+            )
+            .returning(schema.version)
+        )
+        return self._db.execute(statement).scalar_one()
+
+    def _load_catalog(self, version: int) -> SkillCatalog:
+        """
+        Loads the whole skill catalog in two queries.
+
+        Only table columns are selected, so relationships of the skills
+        and skill types are never loaded into the catalog.
+
+        Args:
+            version (int): The catalog version being loaded.
+
+        Returns:
+            SkillCatalog: The loaded catalog.
+        """
+        skill_types = (
+            self._db.query(*self._schema_skill_type.__table__.columns)
+            .order_by(self._schema_skill_type.id)
+            .all()
+        )
+        skills = (
+            self._db.query(*self._schema.__table__.columns)
+            .order_by(self._schema.id)
+            .all()
+        )
+        return SkillCatalog(
+            version=version,
+            skill_types=tuple(
+                self._model_skill_type.model_validate(skill_type)
+                for skill_type in skill_types
+            ),
+            skills=tuple(self._model.model_validate(skill) for skill in skills),
+        )
+
     def get_skills_by_age(self, age: int) -> list[Skill]:
         """
         Retrieves a list of skills by its age.
@@ -23,11 +133,15 @@ class SkillRepository(BaseRepository):
         Returns:
             list[Skill]: The list of skills with the specified age, or empty list if not found.
         """
+        if self._use_catalog:
+            return list(self.catalog.skills_for_age(age))
+
         filters: list[ColumnElement] = [
             and_(self._schema.age_start <= age, self._schema.age_end >= age)
         ]
-        skills = self._query(filters=filters).limit(200).all()
-        return [self._model.model_validate(skill) for skill in skills]
+        return self._query_projection(
+            self._model, filters=filters, order_by=[self._schema.id]
+        )
 
     def get_skill(self, skill_id: int) -> Skill | None:
         """
@@ -39,9 +153,12 @@ class SkillRepository(BaseRepository):
         Returns:
             Skill: The skill with the specified ID, or None if not found.
         """
+        if self._use_catalog:
+            return self.catalog.skills_by_id.get(skill_id)
+
         filters: list[ColumnElement] = [self._schema.id == skill_id]
-        skill = self._query(filters=filters).first()
-        return self._model.model_validate(skill) if skill else None
+        skills = self._query_projection(self._model, filters=filters)
+        return skills[0] if skills else None
 
     def get_skills_list(self) -> list[Skill]:
         """
@@ -52,8 +169,10 @@ class SkillRepository(BaseRepository):
         Returns:
             list[Skill]: The list of all skills.
         """
-        skills = self.all()
-        return [self._model.model_validate(skill) for skill in skills]
+        if self._use_catalog:
+            return list(self.catalog.skills)
+
+        return self._query_projection(self._model, order_by=[self._schema.id])
 
     def get_skill_types(self) -> list[SkillType]:
         """
@@ -64,8 +183,156 @@ class SkillRepository(BaseRepository):
         Returns:
             list[SkillType]: The list of all skills.
         """
-        skill_types = self._query_schema(self._schema_skill_type).all()
-        return [
-            self._model_skill_type.model_validate(skill_type)
-            for skill_type in skill_types
+        if self._use_catalog:
+            return list(self.catalog.skill_types)
+
+        return self._query_projection(
+            self._model_skill_type,
+            order_by=[self._schema_skill_type.id],
+            schema=self._schema_skill_type,
+        )
+
+    def upsert_catalog(
+        self, entries: Iterable[CatalogEntry], batch_size: int = 1000
+    ) -> CatalogLoadStats:
+        """
+        Inserts or updates catalog skills in batches.
+
+        Skills are matched by skill type and name. Unknown skill types and
+        skills are inserted with multi-row inserts, changed skills are
+        updated by id and unchanged ones are left untouched, so loading the same catalog again writes nothing. Repeated
+        entries keep the last occurrence. The catalog version is bumped in
+        the same transaction when anything changed. The caller commits.
+
+        Args:
+            entries (Iterable[CatalogEntry]): The skills to load.
+            batch_size (int): Number of skills per INSERT statement.
+
+        Returns:
+            CatalogLoadStats: Inserted, updated and skipped counts.
+        """
+        type_ids: dict[str, int] = dict(
+            self._db.execute(
+                select(self._schema_skill_type.name, self._schema_skill_type.id)
+            )
+            .tuples()
+            .all()
+        )
+        types_before = len(type_ids)
+        values_columns = [
+            "criteria",
+            "recommendation",
+            "age_start",
+            "age_end",
+            "age_actual",
         ]
+        inserted = updated = skipped = 0
+
+        for batch in batched(entries, batch_size):
+            missing = {entry.skill_type for entry in batch} - type_ids.keys()
+            if missing:
+                self._db.execute(
+                    self._insert(self._schema_skill_type)
+                    .values([{"name": name} for name in sorted(missing)])
+                    .on_conflict_do_nothing(index_elements=["name"])
+                )
+                type_ids.update(
+                    self._db.execute(
+                        select(
+                            self._schema_skill_type.name, self._schema_skill_type.id
+                        ).where(self._schema_skill_type.name.in_(missing))
+                    )
+                    .tuples()
+                    .all()
+                )
+
+            # One row per key, a key may not be upserted twice by one statement
+            rows = {
+                (type_ids[entry.skill_type], entry.name): {
+                    "skill_type_id": type_ids[entry.skill_type],
+                    "name": entry.name,
+                    **{column: getattr(entry, column) for column in values_columns},
+                }
+                for entry in batch
+            }
+            skipped += len(batch) - len(rows)
+            existing = {
+                (row.skill_type_id, row.name): row
+                for row in self._db.execute(
+                    select(
+                        self._schema.id,
+                        self._schema.skill_type_id,
+                        self._schema.name,
+                        *(
+                            self._schema.__table__.c[column]
+                            for column in values_columns
+                        ),
+                    ).where(
+                        tuple_(self._schema.skill_type_id, self._schema.name).in_(
+                            list(rows)
+                        )
+                    )
+                )
+            }
+            # Only the missing skills are inserted: an INSERT ... ON CONFLICT
+            # takes a value of the id sequence for every row, existing or not,
+            # and the skill ids must stay dense for SkillBitset
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            changed = [
+                {
+                    "id": existing[key].id,
+                    **{column: row[column] for column in values_columns},
+                }
+                for key, row in rows.items()
+                if key in existing
+                and any(
+                    getattr(existing[key], column) != row[column]
+                    for column in values_columns
+                )
+            ]
+            if new_rows:
+                written = self._db.execute(
+                    self._insert(self._schema)
+                    .values(new_rows)
+                    .on_conflict_do_nothing(index_elements=["skill_type_id", "name"])
+                    .returning(self._schema.id)
+                ).all()
+                inserted += len(written)
+            if changed:
+                self._db.execute(update(self._schema), changed)
+                updated += len(changed)
+            skipped += len(rows) - len(new_rows) - len(changed)
+
+        stats = CatalogLoadStats(
+            skill_types_inserted=len(type_ids) - types_before,
+            inserted=inserted,
+            updated=updated,
+            skipped=skipped,
+        )
+        if stats.skill_types_inserted or stats.inserted or stats.updated:
+            self.bump_catalog_version()
+        return stats
+
+
+class AsyncSkillRepository(AsyncBaseRepository):
+    _repository = SkillRepository
+
+    async def get_catalog(self) -> SkillCatalog:
+        """Async variant of the SkillRepository.catalog property."""
+        return await self._db.run_sync(lambda session: SkillRepository(session).catalog)
+
+    async def get_skills_by_age(self, age: int) -> list[Skill]:
+        """Async variant of SkillRepository.get_skills_by_age."""
+        return await self._run(SkillRepository.get_skills_by_age, age)
+
+    async def get_skill(self, skill_id: int) -> Skill | None:
+        """Async variant of SkillRepository.get_skill."""
+        return await self._run(SkillRepository.get_skill, skill_id)
+
+    async def get_skills_list(self) -> list[Skill]:
+        """Async variant of SkillRepository.get_skills_list."""
+        return await self._run(SkillRepository.get_skills_list)
+
+    async def get_skill_types(self) -> list[SkillType]:
+        """Async variant of SkillRepository.get_skill_types."""
+        return await self._run(SkillRepository.get_skill_types)
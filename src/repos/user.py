@@ -1,15 +1,16 @@
 from sqlalchemy.sql.elements import ColumnElement
 
 from src.models.database.models import User as UserSchema
-from src.models.domain.models import User
-from src.repos.base import BaseRepository
+from src.models.domain.models import User, UserRead
+from src.repos.base import AsyncBaseRepository, BaseRepository
 
 
 class UserRepository(BaseRepository):
     _schema = UserSchema
     _model = User
+    _projection = UserRead
 
-    def get_by_telegram_id(self, telegram_id: int) -> User | None:
+    def get_by_telegram_id(self, telegram_id: int) -> UserRead | None:
         """
         Retrieves a user by their telegram_id.
 
@@ -17,13 +18,13 @@ class UserRepository(BaseRepository):
             telegram_id (int): The telegram ID of the user to retrieve.
 
         Returns:
-            User: The user with the specified telegram ID, or None if not found.
+            UserRead: The user with the specified telegram ID, or None if not found.
         """
         filters: list[ColumnElement] = [self._schema.telegram_id == telegram_id]
-        user = self._query(filters=filters).first()
-        return self._model.model_validate(user) if user else None
+        users = self._query_projection(self._projection, filters=filters)
+        return users[0] if users else None
 
-    def get_user(self, user_id: int) -> User | None:
+    def get_user(self, user_id: int) -> UserRead | None:
         """
         Retrieves a user by their id.
 
@@ -31,13 +32,13 @@ class UserRepository(BaseRepository):
             user_id (int): The ID of the user to retrieve.
 
         Returns:
-            User: The user with the specified ID, or None if not found.
+            UserRead: The user with the specified ID, or None if not found.
         """
         filters: list[ColumnElement] = [self._schema.id == user_id]
-        user = self._query(filters=filters).first()
-        return self._model.model_validate(user) if user else None
+        users = self._query_projection(self._projection, filters=filters)
+        return users[0] if users else None
 
-    def create_user(self, telegram_id: int) -> User:
+    def create_user(self, telegram_id: int) -> UserRead:
         """
         Creates a user if they not exists by their telegram_id.
 
@@ -45,11 +46,28 @@ class UserRepository(BaseRepository):
             telegram_id (int): The telegram_id ID of the user to create.
 
         Returns:
-            User: The created user.
+            UserRead: The created user.
         """
         user = self.get_by_telegram_id(telegram_id)
-        if not user:
-            user = self._schema(telegram_id=telegram_id)
-            self.add(user)
-            self.flush()
-        return self._model.model_validate(user)
+        if user:
+            return user
+        new_user = self._schema(telegram_id=telegram_id)
+        self.add(new_user)
+        self.flush()
+        return self._projection.model_validate(new_user)
+
+
+class AsyncUserRepository(AsyncBaseRepository):
+    _repository = UserRepository
+
+    async def get_by_telegram_id(self, telegram_id: int) -> UserRead | None:
+        """Async variant of UserRepository.get_by_telegram_id."""
+        return await self._run(UserRepository.get_by_telegram_id, telegram_id)
+
+    async def get_user(self, user_id: int) -> UserRead | None:
+        """Async variant of UserRepository.get_user."""
+        return await self._run(UserRepository.get_user, user_id)
+
+    async def create_user(self, telegram_id: int) -> UserRead:
+        """Async variant of UserRepository.create_user."""
+        return await self._run(UserRepository.create_user, telegram_id)
@@ -0,0 +1,70 @@
+from collections.abc import Mapping
+
+from src.repos.catalog import SkillTable
+
+
+def assess_skill_types(
+    table: SkillTable, answers: Mapping[int, bool]
+) -> dict[int, int]:
+    """
+    Computes the assessment age of every skill type from diagnosis answers.
+
+    Each skill type is assessed independently: its age is the highest actual
+    age of a mastered skill that is lower than the age of its youngest
+    unmastered skill. Two passes over the answers replace sorting them.
+
+    Args:
+        table (SkillTable): Lookup table of the skill catalog.
+        answers (Mapping[int, bool]): Mastered status by skill id, answers for
+            skills missing from the catalog are ignored.
+
+    Returns:
+        dict[int, int]: Assessment age by skill type id, 0 for skill types
+        without a mastered skill.
+    """
+    positions = table.skill_positions
+    skill_type_ids = table.skill_type_ids
+    ages = table.ages
+    rows = [
+        (positions[int(skill_id)], mastered)
+        for skill_id, mastered in answers.items()
+        if int(skill_id) in positions
+    ]
+
+    first_unmastered: dict[int, int] = {}
+    for position, mastered in rows:
+        if not mastered:
+            skill_type_id = skill_type_ids[position]
+            age = ages[position]
+            if age < first_unmastered.get(skill_type_id, age + 1):
+                first_unmastered[skill_type_id] = age
+
+    result = dict.fromkeys(table.skill_type_order, 0)
+    for position, mastered in rows:
+        if mastered:
+            skill_type_id = skill_type_ids[position]
+            age = ages[position]
+            limit = first_unmastered.get(skill_type_id)
+            if (limit is None or age < limit) and age > result[skill_type_id]:
+                result[skill_type_id] = age
+
+    return result
+
+
+def assess_children(
+    table: SkillTable, answers: Mapping[int, Mapping[int, bool]]
+) -> dict[int, dict[int, int]]:
+    """
+    Computes the assessment ages of many children at once.
+
+    Args:
+        table (SkillTable): Lookup table of the skill catalog.
+        answers (Mapping[int, Mapping[int, bool]]): Answers by child id.
+
+    Returns:
+        dict[int, dict[int, int]]: Assessment age by skill type id, by child id.
+    """
+    return {
+        child_id: assess_skill_types(table, child_answers)
+        for child_id, child_answers in answers.items()
+    }
@@ -0,0 +1,34 @@
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    from src.services.unit_of_work import UnitOfWork
+
+ResultT = TypeVar("ResultT")
+
+
+class UnitOfWorkRunner(Protocol):
+    """Runs a synchronous call against a UnitOfWork without blocking the loop."""
+
+    def __call__(
+        self, call: Callable[["UnitOfWork"], ResultT]
+    ) -> Awaitable[ResultT]: ...
+
+
+class AsyncService:
+    """Base class of the async service variants.
+
+    An async service exposes the methods of its synchronous counterpart as
+    coroutines. Each call is handed to a runner which provides the unit of
+    work and executes the synchronous service off the event loop, e.g.
+    AsyncUnitOfWork.run on the async engine. The business logic therefore
+    lives in the synchronous services only.
+    """
+
+    def __init__(self, runner: UnitOfWorkRunner) -> None:
+        """Instantiate the service with a unit of work runner.
+
+        Args:
+            runner: Executes calls against a UnitOfWork.
+        """
+        self._run = runner
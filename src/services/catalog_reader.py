@@ -0,0 +1,171 @@
+import csv
+import json
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, Literal, TextIO
+
+from src.repos.skill import CatalogEntry
+
+CatalogFormat = Literal["json", "jsonl", "csv"]
+
+FORMATS: dict[str, CatalogFormat] = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+}
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Parses the items of a top-level JSON array one by one.
+
+    The file is read in chunks and only the unparsed tail is kept, so the
+    memory used depends on the size of the largest item, not of the file.
+
+    Args:
+        file (TextIO): The file holding the JSON array.
+        chunk_size (int): Number of characters read at once.
+
+    Returns:
+        Iterator[Any]: The decoded items.
+
+    Raises:
+        ValueError: If the file is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+
+    def read() -> bool:
+        # Appends the next chunk and drops the parsed head of the buffer
+        nonlocal buffer, position
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return False
+        buffer, position = buffer[position:] + chunk, 0
+        return True
+
+    def peek() -> str:
+        # Skips whitespace, returns the next character or "" at the end
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not read():
+                return ""
+
+    if peek() != "[":
+        raise ValueError("The catalog must be a JSON array")
+    position += 1
+    if peek() == "]":
+        return
+
+    while True:
+        peek()
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if read():
+                continue
+            raise
+        # Numbers cut by the end of a chunk decode too early, an item counts
+        # only once the separator after it is in the buffer
+        after = end
+        while after < len(buffer) and buffer[after].isspace():
+            after += 1
+        if (after == len(buffer) or buffer[after] not in ",]") and read():
+            continue
+        yield item
+        position = end
+
+        separator = peek()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError("Expected , or ] after an item of the JSON array")
+        position += 1
+
+
+def iter_jsonl(file: TextIO) -> Iterator[Any]:
+    """
+    Parses a JSON Lines file, one JSON value per non-blank line.
+
+    Args:
+        file (TextIO): The JSON Lines file.
+
+    Returns:
+        Iterator[Any]: The decoded values.
+    """
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _age(value: Any) -> int | None:
+    # CSV cells are strings, an empty cell is a missing age
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def to_catalog_entry(record: Mapping[str, Any]) -> CatalogEntry:
+    """
+    Converts a catalog record to a CatalogEntry.
+
+    Records use the keys of src/data.json: skill_type, skill, criteria,
+    recommendation, age_start, age_end and age_actual.
+
+    Args:
+        record (Mapping[str, Any]): A JSON object or a CSV row.
+
+    Returns:
+        CatalogEntry: The catalog entry.
+
+    Raises:
+        KeyError: If skill_type, skill or recommendation is missing.
+    """
+    return CatalogEntry(
+        skill_type=record["skill_type"],
+        name=record["skill"],
+        criteria=record.get("criteria") or None,
+        recommendation=record["recommendation"],
+        age_start=_age(record.get("age_start")),
+        age_end=_age(record.get("age_end")),
+        age_actual=_age(record.get("age_actual")),
+    )
+
+
+def iter_catalog(
+    path: str | Path, catalog_format: CatalogFormat | None = None
+) -> Iterator[CatalogEntry]:
+    """
+    Streams the entries of a catalog file.
+
+    Args:
+        path (str | Path): The catalog file.
+        catalog_format (CatalogFormat | None): json, jsonl or csv, guessed from
+            the file extension by default.
+
+    Returns:
+        Iterator[CatalogEntry]: The catalog entries in file order.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    path = Path(path)
+    catalog_format = catalog_format or FORMATS.get(path.suffix.lower())
+    if catalog_format is None:
+        raise ValueError(f"Unknown catalog format of {path}")
+
+    with path.open(encoding="utf-8", newline="") as file:
+        if catalog_format == "json":
+            records: Iterator[Mapping[str, Any]] = iter_json_array(file)
+        elif catalog_format == "jsonl":
+            records = iter_jsonl(file)
+        else:
+            records = csv.DictReader(file)
+        for record in records:
+            yield to_catalog_entry(record)
@@ -1,23 +1,40 @@
 from datetime import date
 
-from src.models.domain.models import Child
+from src.models.domain.models import ChildRead
 from src.repos.child import ChildRepository
+from src.services.base import AsyncService
 
 
 class ChildService:
     def __init__(self, child_repository: ChildRepository):
         self.child_repository = child_repository
 
-    def get_child(self, child_id: int) -> Child | None:
+    def get_child(self, child_id: int) -> ChildRead | None:
         """Retrieves a child by their ID."""
         return self.child_repository.get_child(child_id)
 
-    def get_children(self, user_id: int) -> list[Child]:
+    def get_children(self, user_id: int) -> list[ChildRead]:
         """Retrieves a list of children by their parent's ID."""
         return self.child_repository.get_children(user_id)
 
-    def add_child(self, user_id: int, name: str, birth_date: date) -> Child:
+    def add_child(self, user_id: int, name: str, birth_date: date) -> ChildRead:
         """Creates a child by their parent's ID, name and birth_date."""
         child = self.child_repository.create_child(user_id, name, birth_date)
         self.child_repository.commit()
         return child
+
+
+class AsyncChildService(AsyncService):
+    async def get_child(self, child_id: int) -> ChildRead | None:
+        """Async variant of ChildService.get_child."""
+        return await self._run(lambda uow: uow.child_service.get_child(child_id))
+
+    async def get_children(self, user_id: int) -> list[ChildRead]:
+        """Async variant of ChildService.get_children."""
+        return await self._run(lambda uow: uow.child_service.get_children(user_id))
+
+    async def add_child(self, user_id: int, name: str, birth_date: date) -> ChildRead:
+        """Async variant of ChildService.add_child."""
+        return await self._run(
+            lambda uow: uow.child_service.add_child(user_id, name, birth_date)
+        )
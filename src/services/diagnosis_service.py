@@ -1,7 +1,19 @@
-from src.models.domain.models import DiagnosisHistory, DiagnosisResult, Skill
+import datetime
+
+from src.models.domain.models import (
+    DiagnosisChanges,
+    DiagnosisHistory,
+    DiagnosisResult,
+    DiagnosisSession,
+    Question,
+    Skill,
+)
+from src.repos.base import Page
 from src.repos.child import ChildRepository
 from src.repos.diagnosis import DiagnosisRepository
 from src.repos.skill import SkillRepository
+from src.services.assessment import assess_children, assess_skill_types
+from src.services.base import AsyncService
 
 
 class DiagnosisService:
@@ -18,17 +30,13 @@ class DiagnosisService:
     def _get_diagnosis_results(self, child_id: int) -> dict:
         """Retrieves the assessment ages of skill types by child's id."""
         skill_types = self.skill_repository.get_skill_types()
-        result = {}
-
-        for skill_type in skill_types:
-            if diagnosis := self.diagnosis_repository.get_diagnosis(
-                child_id, skill_type.id
-            ):
-                result[skill_type.id] = diagnosis.age_assessment
-            else:
-                result[skill_type.id] = 0
-
-        return result
+        latest = {
+            diagnosis.skill_types_id: diagnosis.age_assessment
+            for diagnosis in self.diagnosis_repository.get_latest_diagnoses(child_id)
+        }
+        return {
+            skill_type.id: latest.get(skill_type.id, 0) for skill_type in skill_types
+        }
 
     def start_diagnosis(self, child_id: int) -> list[Skill]:
         """Retrieves a list of skills by the age of the child."""
@@ -38,33 +46,70 @@ class DiagnosisService:
         else:
             raise ValueError("Child not found")
 
+    def get_questionnaire(self, child_id: int) -> tuple[Question, ...]:
+        """Snapshots the questions of a diagnosis for the age of the child."""
+        return tuple(
+            Question(skill.id, skill.skill_type_id, skill.criteria)
+            for skill in self.start_diagnosis(child_id)
+        )
+
     def save_diagnosis(self, child_id: int, result: dict) -> list[DiagnosisResult]:
         """Saves the results of the diagnosis."""
-        skills = self.skill_repository.get_skills_list()
-        skill_type_dict = {skill.id: skill.skill_type_id for skill in skills}
-        skill_age_dict = {skill.id: skill.age_actual for skill in skills}
-        child_skill_types_age = {skill.skill_type_id: 0 for skill in skills}
-        skill_type_age_skill_mastered = []
-
-        for key, value in result.items():
-            skill_type_age_skill_mastered.append(
-                [skill_type_dict[int(key)], skill_age_dict[int(key)], int(key), value]
-            )
-        skill_type_age_skill_mastered.sort(key=lambda el: (el[0], el[1]))
+        table = self.skill_repository.catalog.skill_table
+        diagnosis_results = self.diagnosis_repository.create_diagnosis_results(
+            child_id, assess_skill_types(table, result)
+        )
+        self.diagnosis_repository.commit()
+        return diagnosis_results
 
-        for el in skill_type_age_skill_mastered:
-            if not el[3] and (el[1] >= child_skill_types_age[el[0]]):
-                break
-            if el[3] and (el[1] >= child_skill_types_age[el[0]]):
-                child_skill_types_age[el[0]] = el[1]
+    def open_session(self, child_id: int) -> DiagnosisSession:
+        """Starts a diagnosis session grouping the answers of one diagnosis."""
+        session = self.diagnosis_repository.create_diagnosis_session(child_id)
+        self.diagnosis_repository.commit()
+        return session
 
-        diagnosis_results = []
+    def delete_empty_sessions(self) -> int:
+        """Deletes sessions abandoned before the first answer, opened before yesterday."""
+        deleted = self.diagnosis_repository.delete_empty_diagnosis_sessions(
+            datetime.date.today() - datetime.timedelta(days=1)
+        )
+        self.diagnosis_repository.commit()
+        return deleted
 
-        for key, value in child_skill_types_age.items():
-            diagnosis_results.append(
-                self.diagnosis_repository.create_diagnosis_result(child_id, key, value)
-            )
+    def complete_diagnosis(self, session_id: int) -> list[DiagnosisResult]:
+        """Scores the answers of a session, saves its results and summary.
+
+        The buffered answers of the child, the results and the summary are
+        written in one transaction. Completing a completed session returns
+        its saved results, so a repeated request, e.g. a second tap on the
+        result button, is safe.
+        """
+        session = self.diagnosis_repository.get_diagnosis_session(session_id, lock=True)
+        if not session:
+            raise ValueError("Diagnosis session not found")
+        if session.completed:
+            return self.diagnosis_repository.get_session_results(session_id)
+        self.diagnosis_repository.flush_diagnosis_history(session.child_id)
+        answers = self.diagnosis_repository.get_session_answers(session_id)
+        table = self.skill_repository.catalog.skill_table
+        skill_types_age = assess_skill_types(table, answers)
+        diagnosis_results = self.diagnosis_repository.create_diagnosis_results(
+            session.child_id, skill_types_age, session_id
+        )
+        self.diagnosis_repository.complete_diagnosis_session(
+            session_id, skill_types_age, answers
+        )
+        self.diagnosis_repository.commit()
+        return diagnosis_results
 
+    def save_diagnoses(
+        self, results: dict[int, dict[int, bool]]
+    ) -> dict[int, list[DiagnosisResult]]:
+        """Scores and saves the diagnoses of many children, e.g. after catalog edits."""
+        table = self.skill_repository.catalog.skill_table
+        diagnosis_results = self.diagnosis_repository.create_children_diagnosis_results(
+            assess_children(table, results)
+        )
         self.diagnosis_repository.commit()
         return diagnosis_results
 
@@ -78,26 +123,71 @@ class DiagnosisService:
         self.diagnosis_repository.commit()
         return diagnosis
 
+    def queue_answer(
+        self,
+        child_id: int,
+        skill_id: int,
+        skill_type: int,
+        answer: bool,
+        session_id: int | None = None,
+    ) -> int:
+        """Buffer the skill mastered status, returns the pending answers count."""
+        pending = self.diagnosis_repository.buffer_diagnosis_history(
+            child_id, skill_id, skill_type, answer, session_id
+        )
+        self.diagnosis_repository.commit()
+        return pending
+
+    def flush_answers(self, child_id: int) -> int:
+        """Write the buffered answers of the child, returns their count."""
+        written = self.diagnosis_repository.flush_diagnosis_history(child_id)
+        self.diagnosis_repository.commit()
+        return written
+
+    def flush_due_answers(self, force: bool = False) -> int:
+        """Write the buffered answers past the time threshold, or all of them."""
+        written = self.diagnosis_repository.flush_due_diagnosis_history(force)
+        self.diagnosis_repository.commit()
+        return written
+
+    def get_history_page(
+        self, child_id: int, cursor: str | None = None, size: int = 50
+    ) -> Page[DiagnosisHistory]:
+        """Retrieves one page of the child's answers, newest first."""
+        return self.diagnosis_repository.get_diagnosis_history_page(
+            child_id, cursor, size
+        )
+
+    def get_sessions_page(
+        self, child_id: int, cursor: str | None = None, size: int = 20
+    ) -> Page[DiagnosisSession]:
+        """Retrieves one page of the child's completed diagnoses, newest first."""
+        return self.diagnosis_repository.get_diagnosis_sessions_page(
+            child_id, cursor, size
+        )
+
+    def compare_diagnoses(self, child_id: int) -> DiagnosisChanges | None:
+        """Compares the last two completed diagnoses, None if there are fewer."""
+        sessions = self.diagnosis_repository.get_diagnosis_sessions_page(
+            child_id, size=2
+        ).items
+        if len(sessions) < 2:
+            return None
+        current, previous = sessions
+        return current.compare(previous)
+
     def finish_diagnosis(self, child_id: int) -> dict:
-        """Retrieves the results of the diagnosis."""
-        child = self.child_repository.get_child(child_id)
-        if not child:
+        """Retrieves the results of the last completed diagnosis."""
+        summary = self.diagnosis_repository.get_diagnosis_summary(child_id)
+        if not summary:
             raise ValueError("Child not found")
-        skill_types = self.skill_repository.get_skill_types()
-        skill_types_id_name = {skill.id: skill.name for skill in skill_types}
-        diagnosis_results = self._get_diagnosis_results(child_id)
+        child, session = summary
+        ages = (session.skill_types_age if session else None) or {}
         skill_types_age = {
-            skill_types_id_name[key]: value for key, value in diagnosis_results.items()
+            skill_type.name: ages.get(skill_type.id, 0)
+            for skill_type in self.skill_repository.get_skill_types()
         }
-        skill_history = self.diagnosis_repository.get_diagnosis_history(child_id)
-        skill_mastered = {}
-
-        if skill_history:
-            skill_history.sort(key=lambda el: el.date)
-            last_date = skill_history[-1].date
-            for el in skill_history:
-                if el.date == last_date:
-                    skill_mastered[el.skill_id] = el.mastered
+        skill_mastered = session.answers() if session else {}
 
         return {
             "child_name": child.name,
@@ -105,3 +195,120 @@ class DiagnosisService:
             "skill_types_age": skill_types_age,
             "skill_mastered": skill_mastered,
         }
+
+
+class AsyncDiagnosisService(AsyncService):
+    async def _get_diagnosis_results(self, child_id: int) -> dict:
+        """Async variant of DiagnosisService._get_diagnosis_results."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service._get_diagnosis_results(child_id)
+        )
+
+    async def start_diagnosis(self, child_id: int) -> list[Skill]:
+        """Async variant of DiagnosisService.start_diagnosis."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.start_diagnosis(child_id)
+        )
+
+    async def get_questionnaire(self, child_id: int) -> tuple[Question, ...]:
+        """Async variant of DiagnosisService.get_questionnaire."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.get_questionnaire(child_id)
+        )
+
+    async def save_diagnosis(
+        self, child_id: int, result: dict
+    ) -> list[DiagnosisResult]:
+        """Async variant of DiagnosisService.save_diagnosis."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.save_diagnosis(child_id, result)
+        )
+
+    async def open_session(self, child_id: int) -> DiagnosisSession:
+        """Async variant of DiagnosisService.open_session."""
+        return await self._run(lambda uow: uow.diagnosis_service.open_session(child_id))
+
+    async def delete_empty_sessions(self) -> int:
+        """Async variant of DiagnosisService.delete_empty_sessions."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.delete_empty_sessions()
+        )
+
+    async def complete_diagnosis(self, session_id: int) -> list[DiagnosisResult]:
+        """Async variant of DiagnosisService.complete_diagnosis."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.complete_diagnosis(session_id)
+        )
+
+    async def save_diagnoses(
+        self, results: dict[int, dict[int, bool]]
+    ) -> dict[int, list[DiagnosisResult]]:
+        """Async variant of DiagnosisService.save_diagnoses."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.save_diagnoses(results)
+        )
+
+    async def submit_question(
+        self, child_id: int, skill_id: int, skill_type: int, answer: bool
+    ) -> DiagnosisHistory:
+        """Async variant of DiagnosisService.submit_question."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.submit_question(
+                child_id, skill_id, skill_type, answer
+            )
+        )
+
+    async def queue_answer(
+        self,
+        child_id: int,
+        skill_id: int,
+        skill_type: int,
+        answer: bool,
+        session_id: int | None = None,
+    ) -> int:
+        """Async variant of DiagnosisService.queue_answer."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.queue_answer(
+                child_id, skill_id, skill_type, answer, session_id
+            )
+        )
+
+    async def flush_answers(self, child_id: int) -> int:
+        """Async variant of DiagnosisService.flush_answers."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.flush_answers(child_id)
+        )
+
+    async def flush_due_answers(self, force: bool = False) -> int:
+        """Async variant of DiagnosisService.flush_due_answers."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.flush_due_answers(force)
+        )
+
+    async def get_history_page(
+        self, child_id: int, cursor: str | None = None, size: int = 50
+    ) -> Page[DiagnosisHistory]:
+        """Async variant of DiagnosisService.get_history_page."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.get_history_page(child_id, cursor, size)
+        )
+
+    async def get_sessions_page(
+        self, child_id: int, cursor: str | None = None, size: int = 20
+    ) -> Page[DiagnosisSession]:
+        """Async variant of DiagnosisService.get_sessions_page."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.get_sessions_page(child_id, cursor, size)
+        )
+
+    async def compare_diagnoses(self, child_id: int) -> DiagnosisChanges | None:
+        """Async variant of DiagnosisService.compare_diagnoses."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.compare_diagnoses(child_id)
+        )
+
+    async def finish_diagnosis(self, child_id: int) -> dict:
+        """Async variant of DiagnosisService.finish_diagnosis."""
+        return await self._run(
+            lambda uow: uow.diagnosis_service.finish_diagnosis(child_id)
+        )
@@ -1,8 +1,9 @@
-import datetime
+from collections.abc import Sequence
 
 from src.repos.child import ChildRepository
 from src.repos.diagnosis import DiagnosisRepository
 from src.repos.skill import SkillRepository
+from src.services.base import AsyncService
 
 
 class RecommendationService:
@@ -17,47 +18,78 @@ class RecommendationService:
         self.diagnosis_repository = diagnosis_repository
 
     def get_recommendations(
-        self, child_id: int, date: datetime.date | None
-    ) -> list[str]:
-        """Retrieves a list of recommendations by child's id."""
-        results = []
-        skill_types = self.skill_repository.get_skill_types()
+        self, child_id: int, session_id: int | None = None
+    ) -> tuple[int, ...]:
+        """
+        Retrieves the ids of the skills to recommend by child's id.
 
-        for skill_type in skill_types:
-            if diagnosis := self.diagnosis_repository.get_diagnosis(
-                child_id, skill_type.id
-            ):
-                results.append(diagnosis)
+        The assessment ages and answers come from the summary of one
+        diagnosis session and the candidate skills from the recommendation
+        index of the skill catalog, so only the child and the session row
+        are queried. The ids are computed once per diagnosis and rendered
+        page by page with get_recommendation_texts.
 
-        if not results:
-            return []
+        Args:
+            child_id (int): The ID of the child.
+            session_id (int | None): The ID of a completed diagnosis session
+                of the child, the last completed one by default.
+
+        Returns:
+            tuple[int, ...]: The skill ids ordered by actual age of the skills.
+        """
+        if session_id is None:
+            session = self.diagnosis_repository.get_latest_diagnosis_session(child_id)
+        else:
+            session = self.diagnosis_repository.get_diagnosis_session(session_id)
+        # A session without assessment ages is not completed yet
+        if (
+            not session
+            or session.skill_types_age is None
+            or session.child_id != child_id
+        ):
+            return ()
 
         child = self.child_repository.get_child(child_id)
-        mastered = self.diagnosis_repository.mastered_skill(
-            child_id=child_id, date=date
+        if not child:
+            raise ValueError("Child not found")
+        skills = self.skill_repository.catalog.recommendation_index.select(
+            session.skill_types_age, session.failed_skills, child.age_months
         )
-        if child:
-            skill_type_age = {
-                result.skill_types_id: result.age_assessment for result in results
-            }
-            skills = self.skill_repository.get_skills_list()
-            skills.sort(
-                key=lambda skill: skill.age_actual if skill.age_actual else float("inf")
-            )
-            recommendations = []
-            mastered = self.diagnosis_repository.mastered_skill(
-                child_id=child_id, date=date
+        return tuple(skill.id for skill in skills)
+
+    def get_recommendation_texts(self, skill_ids: Sequence[int]) -> list[str]:
+        """
+        Retrieves the recommendations of skills from the skill catalog.
+
+        Args:
+            skill_ids (Sequence[int]): The skill ids, e.g. a page of the ids
+                returned by get_recommendations.
+
+        Returns:
+            list[str]: The recommendations in the order of the ids, skills
+            removed from the catalog are left out.
+        """
+        skills_by_id = self.skill_repository.catalog.skills_by_id
+        return [
+            skills_by_id[skill_id].recommendation
+            for skill_id in skill_ids
+            if skill_id in skills_by_id
+        ]
+
+
+class AsyncRecommendationService(AsyncService):
+    async def get_recommendations(
+        self, child_id: int, session_id: int | None = None
+    ) -> tuple[int, ...]:
+        """Async variant of RecommendationService.get_recommendations."""
+        return await self._run(
+            lambda uow: uow.recommendation_service.get_recommendations(
+                child_id, session_id
             )
-            for skill in skills:
-                if skill.skill_type_id in skill_type_age:
-                    if (
-                        skill.age_actual is not None
-                        and child.age_months >= skill.age_actual
-                        and skill.age_actual > skill_type_age[skill.skill_type_id]  # type: ignore
-                        and mastered.get(skill.id) == False
-                    ):
-                        recommendations.append(skill.recommendation)
-
-            return recommendations
-        else:
-            raise ValueError("Child not found")
+        )
+
+    async def get_recommendation_texts(self, skill_ids: Sequence[int]) -> list[str]:
+        """Async variant of RecommendationService.get_recommendation_texts."""
+        return await self._run(
+            lambda uow: uow.recommendation_service.get_recommendation_texts(skill_ids)
+        )
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.repos.child import AsyncChildRepository, ChildRepository
+from src.repos.diagnosis import AsyncDiagnosisRepository, DiagnosisRepository
+from src.repos.skill import AsyncSkillRepository, SkillRepository
+from src.repos.user import AsyncUserRepository, UserRepository
+from src.services.child_service import AsyncChildService, ChildService
+from src.services.diagnosis_service import AsyncDiagnosisService, DiagnosisService
+from src.services.recommendation_service import (
+    AsyncRecommendationService,
+    RecommendationService,
+)
+from src.services.user_service import AsyncUserService, UserService
+
+ResultT = TypeVar("ResultT")
+
+
+class UnitOfWork:
+    """Shares one session between all repositories and services of a request.
+
+    Repositories and services are created lazily on first access and then
+    reused, so every query of the request goes through a single pooled
+    connection. The owner of the unit of work is responsible for close().
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    @cached_property
+    def user_repository(self) -> UserRepository:
+        return UserRepository(self.session)
+
+    @cached_property
+    def child_repository(self) -> ChildRepository:
+        return ChildRepository(self.session)
+
+    @cached_property
+    def diagnosis_repository(self) -> DiagnosisRepository:
+        return DiagnosisRepository(self.session)
+
+    @cached_property
+    def skill_repository(self) -> SkillRepository:
+        return SkillRepository(self.session)
+
+    @cached_property
+    def user_service(self) -> UserService:
+        return UserService(self.user_repository)
+
+    @cached_property
+    def child_service(self) -> ChildService:
+        return ChildService(self.child_repository)
+
+    @cached_property
+    def diagnosis_service(self) -> DiagnosisService:
+        return DiagnosisService(
+            self.diagnosis_repository, self.child_repository, self.skill_repository
+        )
+
+    @cached_property
+    def recommendation_service(self) -> RecommendationService:
+        return RecommendationService(
+            self.child_repository, self.skill_repository, self.diagnosis_repository
+        )
+
+    def commit(self) -> None:
+        """Commit all changes of the unit of work."""
+        self.session.commit()
+
+    def rollback(self) -> None:
+        """Discard all uncommitted changes of the unit of work."""
+        self.session.rollback()
+
+    def close(self) -> None:
+        """Roll back uncommitted changes and return the connection to the pool."""
+        self.session.close()
+
+
+class AsyncUnitOfWork:
+    """Async variant of UnitOfWork working on one AsyncSession.
+
+    The sync services run on the session through AsyncSession.run_sync, so
+    their queries go through the async driver instead of blocking the loop.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._sync = UnitOfWork(session.sync_session)
+
+    async def run(self, call: Callable[[UnitOfWork], ResultT]) -> ResultT:
+        """
+        Runs a synchronous call against the unit of work on the async session.
+
+        Args:
+            call (Callable): Receives the sync UnitOfWork of this session.
+
+        Returns:
+            The value returned by the call.
+        """
+        return await self.session.run_sync(lambda _: call(self._sync))
+
+    @cached_property
+    def user_repository(self) -> AsyncUserRepository:
+        return AsyncUserRepository(self.session)
+
+    @cached_property
+    def child_repository(self) -> AsyncChildRepository:
+        return AsyncChildRepository(self.session)
+
+    @cached_property
+    def diagnosis_repository(self) -> AsyncDiagnosisRepository:
+        return AsyncDiagnosisRepository(self.session)
+
+    @cached_property
+    def skill_repository(self) -> AsyncSkillRepository:
+        return AsyncSkillRepository(self.session)
+
+    @cached_property
+    def user_service(self) -> AsyncUserService:
+        return AsyncUserService(self.run)
+
+    @cached_property
+    def child_service(self) -> AsyncChildService:
+        return AsyncChildService(self.run)
+
+    @cached_property
+    def diagnosis_service(self) -> AsyncDiagnosisService:
+        return AsyncDiagnosisService(self.run)
+
+    @cached_property
+    def recommendation_service(self) -> AsyncRecommendationService:
+        return AsyncRecommendationService(self.run)
+
+    async def commit(self) -> None:
+        """Commit all changes of the unit of work."""
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        """Discard all uncommitted changes of the unit of work."""
+        await self.session.rollback()
+
+    async def close(self) -> None:
+        """Roll back uncommitted changes and return the connection to the pool."""
+        await self.session.close()
+
+
+class ThreadPoolUnitOfWorkRunner:
+    """Runs synchronous calls against a UnitOfWork in a bounded thread pool.
+
+    Every call gets its own session which is closed when the call returns.
+    The runner keeps counters of the queue depth and of the time calls spend
+    waiting for a free worker.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_workers: int):
+        """Instantiate the runner.
+
+        Args:
+            session_factory: Creates the session of each call.
+            max_workers: Size of the thread pool, usually the size of the
+                SQLAlchemy connection pool.
+        """
+        self._session_factory = session_factory
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="service"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def __call__(self, call: Callable[[UnitOfWork], ResultT]) -> ResultT:
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def work() -> ResultT:
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._started += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            uow = UnitOfWork(self._session_factory())
+            try:
+                return call(uow)
+            finally:
+                uow.close()
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, work)
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Returns the counters of the runner.
+
+        Returns:
+            dict: queue_depth, running, completed, total_wait, max_wait
+            and avg_wait in seconds.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "total_wait": self._total_wait,
+                "max_wait": self._max_wait,
+                "avg_wait": self._total_wait / self._started if self._started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Wait for the running calls and stop the thread pool."""
+        self._executor.shutdown(wait=True)
@@ -1,23 +1,40 @@
-from src.models.domain.models import User
+from src.models.domain.models import UserRead
 from src.repos.user import UserRepository
+from src.services.base import AsyncService
 
 
 class UserService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    def get_user_by_telegram_id(self, telegram_id: int) -> User | None:
+    def get_user_by_telegram_id(self, telegram_id: int) -> UserRead | None:
         """Retrieves a user by their telegram_id."""
         return self.user_repository.get_by_telegram_id(telegram_id)
 
-    def get_user(self, user_id: int) -> User | None:
+    def get_user(self, user_id: int) -> UserRead | None:
         """Retrieves a user by their id."""
         return self.user_repository.get_user(user_id)
 
-    def register_user(self, telegram_id: int) -> User:
+    def register_user(self, telegram_id: int) -> UserRead:
         """
         Creates a user by their telegram_id.
         """
         user = self.user_repository.create_user(telegram_id)
         self.user_repository.commit()
         return user
+
+
+class AsyncUserService(AsyncService):
+    async def get_user_by_telegram_id(self, telegram_id: int) -> UserRead | None:
+        """Async variant of UserService.get_user_by_telegram_id."""
+        return await self._run(
+            lambda uow: uow.user_service.get_user_by_telegram_id(telegram_id)
+        )
+
+    async def get_user(self, user_id: int) -> UserRead | None:
+        """Async variant of UserService.get_user."""
+        return await self._run(lambda uow: uow.user_service.get_user(user_id))
+
+    async def register_user(self, telegram_id: int) -> UserRead:
+        """Async variant of UserService.register_user."""
+        return await self._run(lambda uow: uow.user_service.register_user(telegram_id))
@@ -0,0 +1,147 @@
+# type: ignore
+import asyncio
+import pickle
+
+import pytest
+
+from src.bot.persistence import (
+    USER_DATA,
+    IncrementalPersistence,
+    SQLitePersistenceStore,
+    import_pickle_persistence,
+)
+from src.bot.session import SessionState
+from src.models.domain.models import UserRead
+
+
+class RecordingStore(SQLitePersistenceStore):
+    """SQLite store that records the written entries and can fail writes."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.writes = []
+        self.failures = 0
+
+    def write(self, entries):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.writes.append(sorted((kind, key) for kind, key, _ in entries))
+        super().write(entries)
+
+
+@pytest.fixture
+def store(tmp_path) -> RecordingStore:
+    """
+    Fixture that provides a SQLite persistence store in a temporary file.
+
+    Args:
+        tmp_path: The pytest tmp_path fixture.
+
+    Returns:
+        RecordingStore: The store, closed after the test.
+    """
+    store = RecordingStore(str(tmp_path / "bot.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_incremental_persistence(store: RecordingStore):
+    """
+    Test IncrementalPersistence on the SQLite store.
+
+    This test checks if only changed entries are written, dropped users are
+    deleted, conversation keys survive a reload and flushes are counted.
+
+    Args:
+        store (RecordingStore): The store fixture.
+    """
+
+    async def run():
+        persistence = IncrementalPersistence(store)
+        assert await persistence.get_user_data() == {}
+        await persistence.update_user_data(1, SessionState(user_id=1))
+        await persistence.update_user_data(2, SessionState(user_id=2))
+        await persistence.flush()
+        assert store.writes == [[(USER_DATA, "1"), (USER_DATA, "2")]]
+
+        await persistence.update_user_data(1, SessionState(user_id=1))
+        await persistence.update_user_data(2, SessionState(user_id=2, child_id=3))
+        await persistence.flush()
+        assert store.writes[-1] == [(USER_DATA, "2")]
+
+        await persistence.drop_user_data(1)
+        await persistence.update_conversation("conversation", (10, 20), 3)
+        await persistence.flush()
+        await persistence.flush()
+        assert len(store.writes) == 3
+
+        reloaded = IncrementalPersistence(store)
+        assert await reloaded.get_user_data() == {
+            2: SessionState(user_id=2, child_id=3)
+        }
+        assert await reloaded.get_conversations("conversation") == {(10, 20): 3}
+
+        metrics = persistence.metrics.snapshot()
+        assert metrics["flushes"] == 3
+        assert metrics["entries_written"] == 5
+        assert metrics["bytes_written"] > 0
+        assert metrics["max_latency"] >= metrics["avg_latency"] > 0
+
+    asyncio.run(run())
+
+
+def test_incremental_persistence_retry(store: RecordingStore):
+    """
+    Test the scheduled flush of IncrementalPersistence.
+
+    This test checks if a failed write keeps the entries dirty and is retried
+    after update_interval with the changes made meanwhile.
+
+    Args:
+        store (RecordingStore): The store fixture.
+    """
+
+    async def run():
+        persistence = IncrementalPersistence(store, update_interval=0.01)
+        store.failures = 1
+        await persistence.update_user_data(1, SessionState(user_id=1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await persistence.update_user_data(2, SessionState(user_id=2))
+        await asyncio.wait_for(persistence._flush_task, 1)
+        assert store.writes == [[(USER_DATA, "1"), (USER_DATA, "2")]]
+        assert persistence.metrics.flushes == 1
+
+    asyncio.run(run())
+
+
+def test_import_pickle_persistence(store: RecordingStore, tmp_path):
+    """
+    Test the import_pickle_persistence function.
+
+    This test checks if the user data of a PicklePersistence file is
+    converted, conversations are skipped and the import runs once.
+
+    Args:
+        store (RecordingStore): The store fixture.
+        tmp_path: The pytest tmp_path fixture.
+    """
+    path = tmp_path / "databot"
+    legacy = {
+        "user_data": {7: {"user": UserRead(id=1, telegram_id=7), "current_child": 3}},
+        "chat_data": {7: {}},
+        "bot_data": {},
+        "conversations": {"conversation": {(7, 7): 7}},
+        "callback_data": None,
+    }
+    path.write_bytes(pickle.dumps(legacy))
+
+    imported = import_pickle_persistence(str(path), store, SessionState.from_legacy)
+    assert imported == 2
+    assert pickle.loads(store.load(USER_DATA)["7"]) == SessionState(
+        user_id=1, child_id=3
+    )
+    assert store.load("conversation:conversation") == {}
+    assert import_pickle_persistence(str(path), store) == 0
+    assert import_pickle_persistence(str(tmp_path / "missing"), store) == 0
@@ -0,0 +1,90 @@
+# type: ignore
+import pickle
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from src.bot.session import SessionState, get_session, measure_sessions, session_size
+from src.models.domain.models import Question, UserRead
+
+
+def test_session_state_slots():
+    """
+    Test the SessionState class.
+
+    This test checks if the state keeps its fields in slots, rejects unknown
+    attributes and resets the diagnosis when restarted or when another child
+    is selected.
+    """
+    session = SessionState(user_id=1)
+    assert not hasattr(session, "__dict__")
+    with pytest.raises(AttributeError):
+        session.children = []
+
+    session.select_child(3)
+    session.questions = (Question(1, 1, "Count to 10"),)
+    session.diagnosis_id = 5
+    session.question_index = 1
+    session.new_child_name = "Jane"
+    session.select_child(4)
+    assert (session.user_id, session.child_id) == (1, 4)
+    assert session.questions is None and session.diagnosis_id is None
+    assert session.question_index == 0
+    assert session.new_child_name == "Jane"
+
+    session.new_child_birth_date = date(2024, 10, 15)
+    session.reset()
+    assert session == SessionState(user_id=1)
+
+
+def test_session_size():
+    """
+    Test the session_size and measure_sessions functions.
+
+    This test checks if the size is the size of the pickle written by the
+    persistence and if the sizes of several sessions are summarized.
+    """
+    session = SessionState(user_id=1, questions=(Question(1, 1, "Count to 10"),))
+    size = session_size(session)
+    assert size == len(pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL))
+    assert session_size(SessionState()) < size
+
+    report = measure_sessions([session, SessionState()])
+    assert report["sessions"] == 2
+    assert report["total_bytes"] == size + session_size(SessionState())
+    assert report["max_bytes"] == size
+    assert report["avg_bytes"] == report["total_bytes"] / 2
+    assert measure_sessions([]) == {
+        "sessions": 0,
+        "total_bytes": 0,
+        "avg_bytes": 0.0,
+        "max_bytes": 0,
+    }
+
+
+def test_session_state_from_legacy():
+    """
+    Test the from_legacy method of SessionState.
+
+    This test checks if the user and the selected child of a user_data dict
+    of the old format are kept.
+    """
+    legacy = {"user": UserRead(id=1, telegram_id=7), "current_child": 3}
+    assert SessionState.from_legacy(legacy) == SessionState(user_id=1, child_id=3)
+    assert SessionState.from_legacy({}) == SessionState()
+    session = SessionState(user_id=2)
+    assert SessionState.from_legacy(session) is session
+
+
+def test_get_session():
+    """
+    Test the get_session function.
+
+    This test checks if the session of the update is returned and an update
+    without a user is rejected.
+    """
+    session = SessionState(user_id=1)
+    assert get_session(SimpleNamespace(user_data=session)) is session
+    with pytest.raises(ValueError):
+        get_session(SimpleNamespace(user_data=None))
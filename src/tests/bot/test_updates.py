@@ -0,0 +1,43 @@
+# type: ignore
+import asyncio
+from datetime import datetime
+
+from telegram import Chat, Message, Update, User
+
+from src.bot.updates import ConversationUpdateProcessor
+
+
+def _update(update_id: int, user_id: int) -> Update:
+    user = User(user_id, "user", is_bot=False)
+    chat = Chat(user_id, Chat.PRIVATE)
+    message = Message(update_id, datetime.now(), chat, from_user=user, text="1")
+    return Update(update_id, message=message)
+
+
+def test_conversation_update_processor():
+    """
+    Test the ConversationUpdateProcessor class.
+
+    This test checks if the updates of one user are processed one at a time
+    in the order they arrived, while the updates of another user run
+    concurrently, and if the locks are dropped afterwards.
+    """
+    events = []
+
+    async def handle(name: str) -> None:
+        events.append(f"start {name}")
+        await asyncio.sleep(0.01)
+        events.append(f"end {name}")
+
+    async def run():
+        processor = ConversationUpdateProcessor(4)
+        await asyncio.gather(
+            processor.process_update(_update(1, 1), handle("1a")),
+            processor.process_update(_update(2, 1), handle("1b")),
+            processor.process_update(_update(3, 2), handle("2a")),
+        )
+        assert processor._locks == {} and processor._waiting == {}
+
+    asyncio.run(run())
+    assert events.index("end 1a") < events.index("start 1b")
+    assert events.index("start 2a") < events.index("end 1a")
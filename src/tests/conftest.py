@@ -4,8 +4,10 @@ import pytest
 from sqlalchemy.orm import Session
 
 from src.models.database.models import Base
+from src.repos.buffer import diagnosis_history_buffer
+from src.repos.catalog import invalidate_skill_catalog
 from src.tests.seed_data import SEED_DATA
-from src.tests.test_helpers import create_in_memory_database
+from src.tests.test_helpers import LazyLoadGuard, create_in_memory_database
 
 
 @pytest.fixture(scope="function")
@@ -38,13 +40,22 @@ def setup_and_teardown_db(db_session: Session) -> Generator:
     Args:
         db_session (Session): The SQLAlchemy session fixture.
     """
+    # Every test database is a fresh one, so the cached catalog is outdated
+    invalidate_skill_catalog()
+    diagnosis_history_buffer.clear()
     # Begin a new transaction
     transaction = db_session.begin_nested()
-    yield
-    # Roll back the transaction after the test function completes
-    transaction.rollback()
+    # Fail the test on N+1 lazy loading
+    with LazyLoadGuard(db_session):
+        yield
+    # Roll back the transaction after the test function completes, unless
+    # the code under test already ended it with a commit
+    if transaction.is_active:
+        transaction.rollback()
     # Re-populate the database with seed data
+    seeded_tables = {model.__table__ for model in SEED_DATA}
     for table in reversed(Base.metadata.sorted_tables):
-        db_session.execute(table.delete())
+        if table in seeded_tables:
+            db_session.execute(table.delete())
     db_session.commit()
     create_in_memory_database(SEED_DATA)
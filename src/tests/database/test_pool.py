@@ -0,0 +1,34 @@
+# type: ignore
+from sqlalchemy import create_engine, text
+
+from src.database.pool import MeteredQueuePool
+
+
+def test_metered_queue_pool_recreate(tmp_path):
+    """
+    Test the recreate method of MeteredQueuePool.
+
+    This test checks if the pool that replaces a disposed one is metered,
+    keeps the pool settings and carries the checkout counters over.
+
+    Args:
+        tmp_path: The pytest tmp_path fixture.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=3,
+        max_overflow=2,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    metrics = engine.pool.metrics
+    engine.dispose()
+
+    assert type(engine.pool) is MeteredQueuePool
+    assert engine.pool.metrics is metrics
+    assert (engine.pool.size(), engine.pool._max_overflow) == (3, 2)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert engine.pool.status_metrics()["checkouts"] == 2
+    engine.dispose()
@@ -0,0 +1,90 @@
+# type: ignore
+import asyncio
+
+from src.repos.child import AsyncChildRepository
+from src.repos.diagnosis import AsyncDiagnosisRepository
+from src.repos.skill import AsyncSkillRepository
+from src.repos.user import AsyncUserRepository
+from src.tests.seed_data import SEED_DATA
+from src.tests.test_helpers import create_async_in_memory_database
+
+
+def test_async_user_repository():
+    """
+    Test the AsyncUserRepository.
+
+    This test checks if the async repository retrieves and creates users
+    on an AsyncSession.
+    """
+
+    async def run():
+        db = await create_async_in_memory_database(SEED_DATA)
+        user_repository = AsyncUserRepository(db)
+        user = await user_repository.get_by_telegram_id(123456789)
+        assert user is not None
+        assert user.id == 1
+        assert await user_repository.get_user(-123) is None
+        created = await user_repository.create_user(111111111)
+        await user_repository.commit()
+        assert created.telegram_id == 111111111
+        await db.close()
+
+    asyncio.run(run())
+
+
+def test_async_child_repository():
+    """
+    Test the AsyncChildRepository.
+
+    This test checks if the async repository retrieves children
+    by their parent's id.
+    """
+
+    async def run():
+        db = await create_async_in_memory_database(SEED_DATA)
+        children = await AsyncChildRepository(db).get_children(1)
+        assert len(children) == 2
+        for child in children:
+            assert child.user_id == 1
+        await db.close()
+
+    asyncio.run(run())
+
+
+def test_async_skill_repository():
+    """
+    Test the AsyncSkillRepository.
+
+    This test checks if the async repository serves the skill catalog.
+    """
+
+    async def run():
+        db = await create_async_in_memory_database(SEED_DATA)
+        skill_repository = AsyncSkillRepository(db)
+        catalog = await skill_repository.get_catalog()
+        assert len(await skill_repository.get_skill_types()) == 2
+        assert len(await skill_repository.get_skills_list()) == len(catalog.skills)
+        assert (await skill_repository.get_skill(1)).id == 1
+        await db.close()
+
+    asyncio.run(run())
+
+
+def test_async_diagnosis_repository():
+    """
+    Test the AsyncDiagnosisRepository.
+
+    This test checks if the async repository retrieves the latest diagnosis
+    results and the diagnosis history of a child.
+    """
+
+    async def run():
+        db = await create_async_in_memory_database(SEED_DATA)
+        diagnosis_repository = AsyncDiagnosisRepository(db)
+        diagnoses = await diagnosis_repository.get_latest_diagnoses(2)
+        assert [diagnosis.skill_types_id for diagnosis in diagnoses] == [1, 2]
+        history = await diagnosis_repository.get_diagnosis_history(2)
+        assert len(history) == 4
+        await db.close()
+
+    asyncio.run(run())
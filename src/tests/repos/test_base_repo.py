@@ -0,0 +1,168 @@
+# type: ignore
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
+
+from src.models.database.models import Child as ChildSchema
+from src.models.database.models import User as UserSchema
+from src.repos.cache_stats import StatementCacheStats
+from src.repos.child import ChildRepository
+from src.tests.conftest import db_session
+from src.tests.test_helpers import LazyLoadError, LazyLoadGuard
+
+
+@pytest.fixture
+def child_repository(db_session: Session) -> ChildRepository:
+    """
+    Fixture that provides an instance of ChildRepository for use in tests.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+
+    Returns:
+        ChildRepository: An instance of ChildRepository.
+    """
+    return ChildRepository(db_session)
+
+
+def test_query_raises_on_unrequested_relationship(child_repository: ChildRepository):
+    """
+    Test the _query method of BaseRepository.
+
+    This test checks if relationships without a loader option raise instead
+    of being lazy loaded.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    children = child_repository._query(filters=[ChildSchema.user_id == 1]).all()
+    with pytest.raises(InvalidRequestError):
+        _ = children[0].diagnosis_history
+
+
+def test_query_loads_requested_relationship(child_repository: ChildRepository):
+    """
+    Test the _query method of BaseRepository with loader options.
+
+    This test checks if relationships named by a loader option are loaded
+    with the query.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    children = child_repository._query(
+        filters=[ChildSchema.user_id == 1],
+        options=[selectinload(ChildSchema.diagnosis_history)],
+    ).all()
+    assert {child.id: len(child.diagnosis_history) for child in children}[1] > 0
+    with pytest.raises(InvalidRequestError):
+        _ = children[0].diagnosis_result
+
+
+def test_lazy_load_guard(db_session: Session):
+    """
+    Test the LazyLoadGuard class.
+
+    This test checks if the guard allows a single lazy load of a relationship
+    and raises once the relationship is lazy loaded row by row.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    users = db_session.query(UserSchema).order_by(UserSchema.id).all()
+    with LazyLoadGuard(db_session) as guard:
+        _ = users[0].children
+        with pytest.raises(LazyLoadError):
+            _ = users[1].children
+        guard.reset()
+        assert guard.lazy_loads == {}
+
+
+def test_stream_all(child_repository: ChildRepository):
+    """
+    Test the stream_all method of BaseRepository.
+
+    This test checks if the method yields the same rows as all() in chunks.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    streamed = [child.id for child in child_repository.stream_all(chunk_size=2)]
+    assert sorted(streamed) == sorted(child.id for child in child_repository.all())
+
+
+@pytest.mark.parametrize(
+    "order_by, order_type",
+    [("date DESC", "desc"), ("missing", None), ("id", "sideways"), ("id", "1; --")],
+)
+def test_query_rejects_invalid_order(
+    child_repository: ChildRepository, order_by: str, order_type: str
+):
+    """
+    Test the _query method of BaseRepository with invalid ordering.
+
+    This test checks if unknown columns and directions are rejected instead
+    of being passed to the database as raw SQL.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+        order_by (str): The order_by argument.
+        order_type (str): The order_type argument.
+    """
+    with pytest.raises(ValueError):
+        child_repository._query(order_by=order_by, order_type=order_type)
+
+
+def test_query_page(child_repository: ChildRepository):
+    """
+    Test the _query method of BaseRepository with a page.
+
+    This test checks if a page of the given size is returned and if a page
+    without a size is rejected.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    page = child_repository._query(order_by="id", order_type="asc", size=2, page=2)
+    assert [child.id for child in page] == [3]
+    with pytest.raises(ValueError):
+        child_repository._query(page=2)
+    with pytest.raises(ValueError):
+        child_repository._query_schema(schema=ChildSchema, page=2)
+
+
+def test_query_order_by_column(child_repository: ChildRepository):
+    """
+    Test the _query method of BaseRepository with a column to order by.
+
+    This test checks if columns and column names are ordered in the given
+    direction.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    ascending = child_repository._query(order_by=ChildSchema.id, order_type="asc")
+    descending = child_repository._query(order_by="id")
+    assert [child.id for child in ascending] == [1, 2, 3]
+    assert [child.id for child in descending] == [3, 2, 1]
+
+
+def test_statement_cache_stats(child_repository: ChildRepository):
+    """
+    Test the StatementCacheStats class.
+
+    This test checks if repeated repository queries are counted as compiled
+    cache hits.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    stats = StatementCacheStats()
+    stats.attach(child_repository.session.get_bind())
+    for child_id in (1, 2, 3):
+        child_repository._query(
+            filters=[ChildSchema.id == child_id], order_by="name", order_type="asc"
+        ).all()
+    snapshot = stats.snapshot()
+    assert snapshot["hits"] >= 2
+    assert snapshot["hit_rate"] > 0.5
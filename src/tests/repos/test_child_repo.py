@@ -2,6 +2,7 @@
 from datetime import datetime
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from src.repos.child import ChildRepository
@@ -71,6 +72,30 @@ def test_get_children(child_repository: ChildRepository):
         assert child.user_id == user_id
 
 
+def test_get_children_selects_child_columns_only(child_repository: ChildRepository):
+    """
+    Test the get_children method of ChildRepository.
+
+    This test checks if the method lists children with one statement that
+    never touches their diagnosis history or results.
+
+    Args:
+        child_repository (ChildRepository): The ChildRepository fixture.
+    """
+    statements = []
+    event.listen(
+        child_repository.session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    children = child_repository.get_children(1)
+    queries = [el for el in statements if el.startswith("SELECT")]
+    assert len(queries) == 1
+    assert "diagnosis" not in queries[0]
+    assert [child.age_months for child in children]
+    assert not hasattr(children[0], "diagnosis_history")
+
+
 def test_get_children_not_found(child_repository: ChildRepository):
     """
     Test the get_children method of ChildRepository when the children
@@ -1,9 +1,13 @@
 # type: ignore
 import datetime
+from types import GeneratorType
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.repos.buffer import DiagnosisHistoryBuffer, PendingAnswer
 from src.repos.diagnosis import DiagnosisRepository
 from src.tests.conftest import db_session
 
@@ -71,6 +75,41 @@ def test_get_diagnosis_not_found_child(diagnosis_repository: DiagnosisRepository
     assert diagnosis is None
 
 
+def test_get_latest_diagnoses(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the get_latest_diagnoses method of DiagnosisRepository.
+
+    This test checks if the method correctly retrieves the last child's
+    diagnosis result of every skill type.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = 2
+    diagnosis_repository.create_diagnosis_result(child_id, 2, 7)
+    diagnoses = diagnosis_repository.get_latest_diagnoses(child_id)
+    assert [diagnosis.skill_types_id for diagnosis in diagnoses] == [1, 2]
+    assert diagnoses[0].age_assessment == 4
+    assert diagnoses[1].age_assessment == 7
+    for diagnosis in diagnoses:
+        assert diagnosis.child_id == child_id
+
+
+def test_get_latest_diagnoses_not_found(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the get_latest_diagnoses method of DiagnosisRepository.
+
+    This test checks if the method correctly returns empty list when diagnosis
+    results with the specified child id do not exist.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = -123
+    diagnoses = diagnosis_repository.get_latest_diagnoses(child_id)
+    assert diagnoses == list()
+
+
 def test_create_diagnosis_history(diagnosis_repository: DiagnosisRepository):
     """
     Test the create_diagnosis_history method of DiagnosisRepository.
@@ -94,6 +133,240 @@ def test_create_diagnosis_history(diagnosis_repository: DiagnosisRepository):
     assert history.skill_type_id == skill_type_id
 
 
+def test_create_diagnosis_histories(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the create_diagnosis_histories method of DiagnosisRepository.
+
+    This test checks if the method inserts several answers at once.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = 3
+    today = datetime.date.today()
+    answers = [
+        PendingAnswer(child_id, 1, 1, True, today),
+        PendingAnswer(child_id, 2, 2, False, today),
+    ]
+    assert diagnosis_repository.create_diagnosis_histories(answers) == 2
+    history = diagnosis_repository.get_diagnosis_history(child_id)
+    assert [(el.skill_id, el.mastered) for el in history] == [(1, True), (2, False)]
+
+
+@pytest.fixture
+def long_history(diagnosis_repository: DiagnosisRepository) -> int:
+    """
+    Fixture that adds 120 answers over 40 days for the child with id 3.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+
+    Returns:
+        int: The ID of the child.
+    """
+    child_id = 3
+    start = datetime.date(2024, 1, 1)
+    diagnosis_repository.create_diagnosis_histories(
+        [
+            PendingAnswer(
+                child_id, i % 5 + 1, 1, i % 2 == 0, start + datetime.timedelta(i // 3)
+            )
+            for i in range(120)
+        ]
+    )
+    return child_id
+
+
+def test_get_diagnosis_history_is_not_capped(
+    diagnosis_repository: DiagnosisRepository, long_history: int
+):
+    """
+    Test the get_diagnosis_history method of DiagnosisRepository.
+
+    This test checks if the method returns the whole history of the child.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+        long_history (int): The ID of the child with a long history.
+    """
+    assert len(diagnosis_repository.get_diagnosis_history(long_history)) == 120
+
+
+def test_get_diagnosis_history_page(
+    diagnosis_repository: DiagnosisRepository, long_history: int
+):
+    """
+    Test the get_diagnosis_history_page method of DiagnosisRepository.
+
+    This test checks if the pages continue each other newest answers first
+    and the last page has no cursor.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+        long_history (int): The ID of the child with a long history.
+    """
+    pages = [diagnosis_repository.get_diagnosis_history_page(long_history)]
+    while pages[-1].next_cursor:
+        pages.append(
+            diagnosis_repository.get_diagnosis_history_page(
+                long_history, cursor=pages[-1].next_cursor
+            )
+        )
+    assert [len(page.items) for page in pages] == [50, 50, 20]
+    answers = [el for page in pages for el in page.items]
+    keys = [(el.date, el.id) for el in answers]
+    assert keys == sorted(keys, reverse=True)
+    assert len(set(keys)) == 120
+
+
+def test_get_diagnosis_history_page_invalid_cursor(
+    diagnosis_repository: DiagnosisRepository,
+):
+    """
+    Test the get_diagnosis_history_page method of DiagnosisRepository.
+
+    This test checks if a malformed cursor is rejected.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    with pytest.raises(ValueError):
+        diagnosis_repository.get_diagnosis_history_page(1, cursor="not a cursor")
+
+
+def test_stream_diagnosis_history(
+    diagnosis_repository: DiagnosisRepository, long_history: int
+):
+    """
+    Test the stream_diagnosis_history method of DiagnosisRepository.
+
+    This test checks if the method lazily yields the history of one child or
+    of the whole table in child, date and id order.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+        long_history (int): The ID of the child with a long history.
+    """
+    stream = diagnosis_repository.stream_diagnosis_history(long_history, chunk_size=7)
+    assert isinstance(stream, GeneratorType)
+    keys = [(el.date, el.id) for el in stream]
+    assert len(keys) == 120
+    assert keys == sorted(keys)
+
+    answers = list(diagnosis_repository.stream_diagnosis_history(chunk_size=7))
+    keys = [(el.child_id, el.date, el.id) for el in answers]
+    assert keys == sorted(keys)
+    assert len(keys) == len(diagnosis_repository.all())
+
+
+def test_mastered_skill(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the mastered_skill method of DiagnosisRepository.
+
+    This test checks if the method returns the mastered status by skill id
+    for a date and for the whole history.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    expected = {2: True, 3: False, 4: False, 5: False}
+    assert diagnosis_repository.mastered_skill(2, datetime.date(2023, 2, 1)) == expected
+    assert diagnosis_repository.mastered_skill(2, None) == expected
+    assert diagnosis_repository.mastered_skill(2, datetime.date(2024, 1, 1)) == {}
+
+
+def test_mastered_skill_latest_answer(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the mastered_skill method of DiagnosisRepository.
+
+    This test checks if a skill answered on two dates with opposite answers
+    keeps the answer of the latest date.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    diagnosis_repository.create_diagnosis_history(2, 2, 2, False)
+    diagnosis_repository.create_diagnosis_history(2, 3, 2, True)
+    assert diagnosis_repository.mastered_skill(2, None) == {
+        2: False,
+        3: True,
+        4: False,
+        5: False,
+    }
+    expected = {2: True, 3: False, 4: False, 5: False}
+    assert diagnosis_repository.mastered_skill(2, datetime.date(2023, 2, 1)) == expected
+
+
+def test_buffer_diagnosis_history(db_session: Session):
+    """
+    Test the buffer_diagnosis_history method of DiagnosisRepository.
+
+    This test checks if buffered answers are written once the count threshold
+    is reached, and that reading the history does not write pending answers.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    child_id = 3
+    buffer = DiagnosisHistoryBuffer(max_answers=2)
+    diagnosis_repository = DiagnosisRepository(db_session, buffer=buffer)
+    assert diagnosis_repository.buffer_diagnosis_history(child_id, 1, 1, True) == 1
+    assert diagnosis_repository.buffer_diagnosis_history(child_id, 2, 2, True) == 0
+    assert diagnosis_repository.buffer_diagnosis_history(child_id, 3, 2, False) == 1
+    assert len(diagnosis_repository.get_diagnosis_history(child_id)) == 2
+    assert buffer.pending(child_id) == 1
+    assert diagnosis_repository.flush_diagnosis_history(child_id) == 1
+    assert len(diagnosis_repository.get_diagnosis_history(child_id)) == 3
+
+
+def test_flush_diagnosis_history_rollback(db_session: Session):
+    """
+    Test the flush_diagnosis_history method of DiagnosisRepository.
+
+    This test checks if written answers are kept until the caller commits
+    and go back into the buffer when the transaction is rolled back.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    child_id = 3
+    buffer = DiagnosisHistoryBuffer()
+    diagnosis_repository = DiagnosisRepository(db_session, buffer=buffer)
+    diagnosis_repository.buffer_diagnosis_history(child_id, 1, 1, True)
+    assert diagnosis_repository.flush_diagnosis_history(child_id) == 1
+    assert buffer.pending(child_id) == 0
+    db_session.rollback()
+    assert buffer.pending(child_id) == 1
+    assert diagnosis_repository.get_diagnosis_history(child_id) == []
+
+    assert diagnosis_repository.flush_diagnosis_history(child_id) == 1
+    diagnosis_repository.commit()
+    db_session.rollback()
+    assert buffer.pending(child_id) == 0
+    assert len(diagnosis_repository.get_diagnosis_history(child_id)) == 1
+
+
+def test_flush_diagnosis_history_failure(db_session: Session):
+    """
+    Test the flush_diagnosis_history method of DiagnosisRepository.
+
+    This test checks if a failed write puts the answers back into the buffer
+    without rolling back what the caller already wrote in the transaction.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    child_id = 3
+    buffer = DiagnosisHistoryBuffer()
+    diagnosis_repository = DiagnosisRepository(db_session, buffer=buffer)
+    diagnosis_repository.create_diagnosis_history(child_id, 1, 1, True)
+    buffer.add(PendingAnswer(child_id, None, 1, True, datetime.date.today()))
+    with pytest.raises(IntegrityError):
+        diagnosis_repository.flush_diagnosis_history(child_id)
+    assert buffer.pending(child_id) == 1
+    assert len(diagnosis_repository.get_diagnosis_history(child_id)) == 1
+
+
 def test_get_diagnosis_history(diagnosis_repository: DiagnosisRepository):
     """
     Test the get_diagnosis_history method of DiagnosisRepository.
@@ -148,3 +421,143 @@ def test_create_diagnosis_result(diagnosis_repository: DiagnosisRepository):
     assert result.skill_types_id == skill_type_id
     assert result.age_assessment == age_assessment
     assert result.date == datetime.date.today()
+
+
+def test_create_diagnosis_results(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the create_diagnosis_results method of DiagnosisRepository.
+
+    This test checks if the method creates diagnosis results of several
+    skill types with one statement and returns them in the given order.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = 3
+    statements = []
+    event.listen(
+        diagnosis_repository.session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    results = diagnosis_repository.create_diagnosis_results(child_id, {2: 7, 1: 5})
+    assert len([el for el in statements if el.startswith("INSERT")]) == 1
+    assert [result.skill_types_id for result in results] == [2, 1]
+    assert [result.age_assessment for result in results] == [7, 5]
+    for result in results:
+        assert result.id is not None
+        assert result.child_id == child_id
+        assert result.date == datetime.date.today()
+    assert len(diagnosis_repository.get_latest_diagnoses(child_id)) == 2
+
+
+def test_create_children_diagnosis_results(
+    diagnosis_repository: DiagnosisRepository,
+):
+    """
+    Test the create_children_diagnosis_results method of DiagnosisRepository.
+
+    This test checks if the method creates the diagnosis results of several
+    children with one statement and returns them by child in the given order.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    statements = []
+    event.listen(
+        diagnosis_repository.session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    results = diagnosis_repository.create_children_diagnosis_results(
+        {3: {2: 7, 1: 5}, 1: {1: 4}, 2: {}}
+    )
+    assert len([el for el in statements if el.startswith("INSERT")]) == 1
+    assert list(results) == [3, 1, 2]
+    assert [(r.child_id, r.skill_types_id, r.age_assessment) for r in results[3]] == [
+        (3, 2, 7),
+        (3, 1, 5),
+    ]
+    assert [(r.child_id, r.age_assessment) for r in results[1]] == [(1, 4)]
+    assert results[2] == []
+    assert diagnosis_repository.create_children_diagnosis_results({}) == {}
+
+
+def test_get_latest_diagnosis_session(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the get_latest_diagnosis_session method of DiagnosisRepository.
+
+    This test checks if open sessions are skipped until their summary is
+    stored, and if the summary is read back from the session row.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = 2
+    opened = diagnosis_repository.create_diagnosis_session(child_id)
+    assert not opened.completed
+    assert diagnosis_repository.get_latest_diagnosis_session(child_id).id == 2
+
+    diagnosis_repository.create_diagnosis_history(child_id, 3, 2, True, opened.id)
+    answers = diagnosis_repository.get_session_answers(opened.id)
+    assert answers == {3: True}
+    diagnosis_repository.complete_diagnosis_session(opened.id, {2: 35}, answers)
+    latest = diagnosis_repository.get_latest_diagnosis_session(child_id)
+    assert latest.id == opened.id
+    assert latest.skill_types_age == {2: 35}
+    assert latest.answers() == {3: True}
+    assert diagnosis_repository.get_latest_diagnosis_session(3) is None
+
+
+def test_delete_empty_diagnosis_sessions(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the delete_empty_diagnosis_sessions method of DiagnosisRepository.
+
+    This test checks if only unfinished sessions without answers opened
+    before the given date are deleted.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = 2
+    empty = diagnosis_repository.create_diagnosis_session(child_id)
+    answered = diagnosis_repository.create_diagnosis_session(child_id)
+    diagnosis_repository.create_diagnosis_history(child_id, 3, 2, True, answered.id)
+    today = datetime.date.today()
+    assert diagnosis_repository.delete_empty_diagnosis_sessions(today) == 0
+    tomorrow = today + datetime.timedelta(days=1)
+    assert diagnosis_repository.delete_empty_diagnosis_sessions(tomorrow) == 1
+    assert diagnosis_repository.get_diagnosis_session(empty.id) is None
+    assert diagnosis_repository.get_diagnosis_session(answered.id) is not None
+    assert diagnosis_repository.get_diagnosis_session(2).completed
+
+
+def test_get_diagnosis_summary(diagnosis_repository: DiagnosisRepository):
+    """
+    Test the get_diagnosis_summary method of DiagnosisRepository.
+
+    This test checks if the child and the last completed session are read
+    with one statement, open sessions are skipped, and children without a
+    completed diagnosis or unknown ids are handled.
+
+    Args:
+        diagnosis_repository (DiagnosisRepository): The DiagnosisRepository fixture.
+    """
+    child_id = 2
+    diagnosis_repository.create_diagnosis_session(child_id)
+    statements = []
+    event.listen(
+        diagnosis_repository.session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    child, session = diagnosis_repository.get_diagnosis_summary(child_id)
+    assert len(statements) == 1
+    assert (child.id, child.name) == (child_id, "Jane")
+    assert session == diagnosis_repository.get_latest_diagnosis_session(child_id)
+    assert session.skill_types_age == {1: 4, 2: 2}
+    assert session.answers() == {2: True, 3: False, 4: False, 5: False}
+
+    child, session = diagnosis_repository.get_diagnosis_summary(3)
+    assert child.id == 3 and session is None
+    assert diagnosis_repository.get_diagnosis_summary(404) is None
@@ -1,8 +1,10 @@
 # type: ignore
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from src.repos.skill import SkillRepository
+from src.repos.catalog import invalidate_skill_catalog, skill_catalog_cache
+from src.repos.skill import CatalogEntry, CatalogLoadStats, SkillRepository
 from src.tests.conftest import db_session
 
 
@@ -54,6 +56,40 @@ def test_get_skills_by_age_not_found(skill_repository: SkillRepository):  # type
     assert skills == list()
 
 
+def test_get_skills_by_age_matches_database(db_session: Session):  # type: ignore
+    """
+    Test the get_skills_by_age method of SkillRepository with the catalog.
+
+    This test checks if the age index of the catalog returns the same skills
+    as the database query for every age, including the interval bounds.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    cached_repository = SkillRepository(db_session)
+    uncached_repository = SkillRepository(db_session, use_catalog=False)
+    for age in range(-1, 1003):
+        cached = [skill.id for skill in cached_repository.get_skills_by_age(age)]
+        uncached = [skill.id for skill in uncached_repository.get_skills_by_age(age)]
+        assert cached == sorted(uncached)
+
+
+def test_skills_for_age_reused(skill_repository: SkillRepository):  # type: ignore
+    """
+    Test the skills_for_age method of SkillCatalog.
+
+    This test checks if repeated lookups for ages of the same interval
+    return the precomputed result instead of recomputing it.
+
+    Args:
+        skill_repository (SkillRepository): The SkillRepository fixture.
+    """
+    catalog = skill_repository.catalog
+    assert catalog.skills_for_age(3) is catalog.skills_for_age(3)
+    assert catalog.skills_for_age(3) is catalog.skills_for_age(4)
+    assert catalog.skills_for_age(-123) == ()
+
+
 def test_get_skill(skill_repository: SkillRepository):  # type: ignore
     """
     Test the get_skill method of SkillRepository.
@@ -112,3 +148,133 @@ def test_get_skill_types(skill_repository: SkillRepository):  # type: ignore
     skill_types = skill_repository.get_skill_types()
     assert len(skill_types) > 0
     assert len(skill_types) == 2
+
+
+def test_skill_catalog_shared(db_session: Session):  # type: ignore
+    """
+    Test the catalog property of SkillRepository.
+
+    This test checks if the skill catalog is loaded once and reused
+    by every repository instance without querying the database again.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    catalog = SkillRepository(db_session).catalog
+    statements = []
+    event.listen(
+        db_session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    repository = SkillRepository(db_session)
+    assert repository.catalog is catalog
+    assert len(repository.get_skill_types()) == 2
+    assert len(repository.get_skills_list()) == 5
+    assert repository.get_skill(1) is not None
+    assert statements == []
+
+
+def test_skill_catalog_invalidate(skill_repository: SkillRepository):  # type: ignore
+    """
+    Test the catalog property of SkillRepository after invalidation.
+
+    This test checks if the skill catalog of the process is reloaded once it
+    is dropped.
+
+    Args:
+        skill_repository (SkillRepository): The SkillRepository fixture.
+    """
+    catalog = skill_repository.catalog
+    invalidate_skill_catalog()
+    reloaded = skill_repository.catalog
+    assert reloaded is not catalog
+    assert reloaded.version == catalog.version
+    assert len(reloaded.skills) == len(catalog.skills)
+
+
+def test_skill_catalog_version(
+    skill_repository: SkillRepository, monkeypatch: pytest.MonkeyPatch
+):  # type: ignore
+    """
+    Test the catalog property of SkillRepository after a catalog load.
+
+    This test checks if the catalog version stored in the database is bumped
+    and if the cached catalog is reloaded once the new version is read.
+
+    Args:
+        skill_repository (SkillRepository): The SkillRepository fixture.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    catalog = skill_repository.catalog
+    assert catalog.version == skill_repository.get_catalog_version() == 0
+    assert skill_repository.bump_catalog_version() == 1
+    # The version is read at most every check_interval seconds
+    assert skill_repository.catalog is catalog
+    monkeypatch.setattr(skill_catalog_cache, "check_interval", 0)
+    reloaded = skill_repository.catalog
+    assert reloaded is not catalog
+    assert reloaded.version == 1
+    assert skill_repository.catalog is reloaded
+
+
+def test_upsert_catalog(db_session: Session):  # type: ignore
+    """
+    Test the upsert_catalog method of SkillRepository.
+
+    This test checks if new skills and skill types are inserted, changed
+    skills are updated in place, and unchanged or repeated skills are
+    skipped, so loading the same catalog twice writes nothing and bumps the
+    catalog version once. Changed skills are updated without an INSERT.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    repository = SkillRepository(db_session, use_catalog=False)
+    entries = [
+        CatalogEntry(
+            "Cognitive",
+            "Counting",
+            "Count to 10",
+            "Practice counting objects",
+            3,
+            5,
+            4,
+        ),
+        CatalogEntry("Motor", "Walking", "Walking 20 meters", "Walk more", 1, 2, 2),
+        CatalogEntry(
+            "Speech", "Babbling", "Says syllables", "Talk to the child", 0, 1, 1
+        ),
+        CatalogEntry("Speech", "Babbling", "Says syllables", "Read aloud", 0, 1, 1),
+    ]
+    stats = repository.upsert_catalog(entries, batch_size=2)
+    assert stats == CatalogLoadStats(
+        skill_types_inserted=1, inserted=1, updated=1, skipped=2
+    )
+    skills = {skill.name: skill for skill in repository.get_skills_list()}
+    assert len(skills) == 6
+    assert skills["Walking"].id == 2
+    assert skills["Walking"].criteria == "Walking 20 meters"
+    assert skills["Babbling"].recommendation == "Read aloud"
+    assert repository.get_catalog_version() == 1
+
+    stats = repository.upsert_catalog(entries)
+    assert stats == CatalogLoadStats(
+        skill_types_inserted=0, inserted=0, updated=0, skipped=4
+    )
+    assert repository.get_catalog_version() == 1
+
+    # Existing skills are updated without an INSERT, which would take
+    # values of the id sequence
+    statements = []
+    event.listen(
+        db_session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    stats = repository.upsert_catalog([entries[0]._replace(age_actual=5)])
+    assert stats == CatalogLoadStats(
+        skill_types_inserted=0, inserted=0, updated=1, skipped=0
+    )
+    assert not [el for el in statements if el.startswith("INSERT INTO skills")]
+    assert repository.get_catalog_version() == 2
@@ -2,15 +2,19 @@ from datetime import date
 
 from src.models.database.models import (
     Base,
+    CatalogVersion,
     Child,
     DiagnosisHistory,
     DiagnosisResult,
+    DiagnosisSession,
     Skill,
     SkillType,
     User,
 )
+from src.models.domain.models import SkillBitset
 
 SEED_DATA = {
+    CatalogVersion: [{"id": 1, "version": 0}],
     User: [{"id": 1, "telegram_id": 123456789}, {"id": 2, "telegram_id": 987654321}],
     Child: [
         {"id": 1, "user_id": 1, "name": "John", "birth_date": date(2020, 1, 1)},
@@ -70,6 +74,24 @@ SEED_DATA = {
             "age_actual": 1001,
         },
     ],
+    DiagnosisSession: [
+        {
+            "id": 1,
+            "child_id": 1,
+            "date": date(2023, 1, 1),
+            "skill_types_age": {"1": 4},
+            "answered": SkillBitset.from_ids([1]).to_bytes(),
+            "mastered": SkillBitset.from_ids([1]).to_bytes(),
+        },
+        {
+            "id": 2,
+            "child_id": 2,
+            "date": date(2023, 2, 1),
+            "skill_types_age": {"1": 4, "2": 2},
+            "answered": SkillBitset.from_ids([2, 3, 4, 5]).to_bytes(),
+            "mastered": SkillBitset.from_ids([2]).to_bytes(),
+        },
+    ],
     DiagnosisHistory: [
         {
             "id": 1,
@@ -78,6 +100,7 @@ SEED_DATA = {
             "date": date(2023, 1, 1),
             "mastered": True,
             "child_id": 1,
+            "session_id": 1,
         },
         {
             "id": 2,
@@ -86,6 +109,7 @@ SEED_DATA = {
             "date": date(2023, 2, 1),
             "mastered": True,
             "child_id": 2,
+            "session_id": 2,
         },
         {
             "id": 3,
@@ -94,6 +118,7 @@ SEED_DATA = {
             "date": date(2023, 2, 1),
             "mastered": False,
             "child_id": 2,
+            "session_id": 2,
         },
         {
             "id": 4,
@@ -102,6 +127,7 @@ SEED_DATA = {
             "date": date(2023, 2, 1),
             "mastered": False,
             "child_id": 2,
+            "session_id": 2,
         },
         {
             "id": 5,
@@ -110,12 +136,14 @@ SEED_DATA = {
             "date": date(2023, 2, 1),
             "mastered": False,
             "child_id": 2,
+            "session_id": 2,
         },
     ],
     DiagnosisResult: [
         {
             "id": 1,
             "child_id": 1,
+            "session_id": 1,
             "date": date(2023, 3, 1),
             "skill_types_id": 1,
             "age_assessment": 4,
@@ -123,6 +151,7 @@ SEED_DATA = {
         {
             "id": 2,
             "child_id": 2,
+            "session_id": 2,
             "date": date(2023, 4, 1),
             "skill_types_id": 2,
             "age_assessment": 2,
@@ -130,6 +159,7 @@ SEED_DATA = {
         {
             "id": 3,
             "child_id": 2,
+            "session_id": 2,
             "date": date(2023, 4, 1),
             "skill_types_id": 1,
             "age_assessment": 4,
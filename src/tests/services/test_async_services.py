@@ -0,0 +1,47 @@
+# type: ignore
+import asyncio
+
+from src.services.unit_of_work import AsyncUnitOfWork
+from src.tests.seed_data import SEED_DATA
+from src.tests.test_helpers import create_async_in_memory_database
+
+
+def test_async_services_share_session():
+    """
+    Test the async services of AsyncUnitOfWork.
+
+    This test checks if the async services run the synchronous services
+    on the session of the async unit of work.
+    """
+
+    async def run():
+        uow = AsyncUnitOfWork(await create_async_in_memory_database(SEED_DATA))
+        user = await uow.user_service.register_user(111111111)
+        assert user.telegram_id == 111111111
+        assert await uow.user_service.get_user(user.id) is not None
+        children = await uow.child_service.get_children(1)
+        assert len(children) == 2
+        await uow.close()
+
+    asyncio.run(run())
+
+
+def test_async_diagnosis_service():
+    """
+    Test the AsyncDiagnosisService.
+
+    This test checks if the async diagnosis service saves answers and
+    diagnosis results.
+    """
+
+    async def run():
+        uow = AsyncUnitOfWork(await create_async_in_memory_database(SEED_DATA))
+        service = uow.diagnosis_service
+        history = await service.submit_question(2, 2, 2, True)
+        assert history.mastered is True
+        results = await service.save_diagnosis(1, {1: True, 2: True, 3: False})
+        assert [result.age_assessment for result in results] == [4, 2]
+        assert await service._get_diagnosis_results(1) == {1: 4, 2: 2}
+        await uow.close()
+
+    asyncio.run(run())
@@ -0,0 +1,129 @@
+# type: ignore
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.repos.skill import CatalogEntry, CatalogLoadStats, SkillRepository
+from src.services.catalog_reader import iter_catalog, iter_json_array
+from src.tests.conftest import db_session
+
+RECORDS = [
+    {
+        "skill_type": "Speech",
+        "skill": f"Word {index}",
+        "criteria": "Says a word",
+        "recommendation": "Read aloud, 1.5 hours",
+        "age_start": index,
+        "age_end": index + 2,
+        "age_actual": index + 1,
+    }
+    for index in range(25)
+]
+
+
+@pytest.fixture(params=["json", "jsonl", "csv"])
+def catalog_file(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    """
+    Fixture that writes RECORDS to a catalog file of every supported format.
+
+    Args:
+        request (pytest.FixtureRequest): The request with the format.
+        tmp_path (Path): The temporary directory fixture.
+
+    Returns:
+        Path: The catalog file.
+    """
+    path = tmp_path / f"catalog.{request.param}"
+    with path.open("w", encoding="utf-8", newline="") as file:
+        if request.param == "json":
+            json.dump(RECORDS, file, ensure_ascii=False, indent=2)
+        elif request.param == "jsonl":
+            file.writelines(json.dumps(record) + "\n" for record in RECORDS)
+        else:
+            writer = csv.DictWriter(file, fieldnames=list(RECORDS[0]))
+            writer.writeheader()
+            writer.writerows(RECORDS)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+def test_iter_json_array(chunk_size: int):
+    """
+    Test the iter_json_array function.
+
+    This test checks if the items are parsed correctly whatever the chunk
+    boundaries cut, including numbers and strings holding separators.
+
+    Args:
+        chunk_size (int): Number of characters read at once.
+    """
+    items = [*RECORDS, 12345, -0.25e-2, "a, ]", None, [1, {"k": "]"}]]
+    text = json.dumps(items)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == items
+    assert list(iter_json_array(io.StringIO(" [ ] "), chunk_size)) == []
+
+
+@pytest.mark.parametrize("text", ["{}", "[1 2]", "[1,", ""])
+def test_iter_json_array_invalid(text: str):
+    """
+    Test the iter_json_array function with invalid input.
+
+    This test checks if anything but a complete JSON array raises ValueError.
+
+    Args:
+        text (str): The invalid input.
+    """
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), 1))
+
+
+def test_iter_catalog(catalog_file: Path):
+    """
+    Test the iter_catalog function.
+
+    This test checks if every format yields the same catalog entries, with
+    the ages of CSV rows converted to integers.
+
+    Args:
+        catalog_file (Path): The catalog file fixture.
+    """
+    entries = list(iter_catalog(catalog_file))
+    assert len(entries) == len(RECORDS)
+    assert entries[3] == CatalogEntry(
+        "Speech", "Word 3", "Says a word", "Read aloud, 1.5 hours", 3, 5, 4
+    )
+
+
+def test_iter_catalog_unknown_format(tmp_path: Path):
+    """
+    Test the iter_catalog function with an unknown file extension.
+
+    This test checks if the function raises ValueError.
+
+    Args:
+        tmp_path (Path): The temporary directory fixture.
+    """
+    with pytest.raises(ValueError):
+        next(iter_catalog(tmp_path / "catalog.xml"))
+
+
+def test_load_catalog_stream(db_session: Session, catalog_file: Path):
+    """
+    Test the upsert_catalog method of SkillRepository with a streamed file.
+
+    This test checks if a catalog file is loaded batch by batch.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+        catalog_file (Path): The catalog file fixture.
+    """
+    repository = SkillRepository(db_session, use_catalog=False)
+    stats = repository.upsert_catalog(iter_catalog(catalog_file), batch_size=10)
+    assert stats == CatalogLoadStats(
+        skill_types_inserted=1, inserted=len(RECORDS), updated=0, skipped=0
+    )
+    assert len(repository.get_skills_list()) == 5 + len(RECORDS)
@@ -2,6 +2,7 @@
 import pytest
 from sqlalchemy.orm import Session
 
+from src.models.domain.models import SkillBitset
 from src.repos.child import ChildRepository
 from src.repos.diagnosis import DiagnosisRepository
 from src.repos.skill import SkillRepository
@@ -61,6 +62,24 @@ def test_start_diagnosis(diagnosis_service: DiagnosisService):
     assert len(result) == 3
 
 
+def test_get_questionnaire(diagnosis_service: DiagnosisService):
+    """
+    Test the get_questionnaire method of DiagnosisService.
+
+    This test checks if the method snapshots the skills of start_diagnosis as
+    tuples of skill id, skill type id and criteria.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    questionnaire = diagnosis_service.get_questionnaire(1)
+    skills = diagnosis_service.start_diagnosis(1)
+    assert isinstance(questionnaire, tuple)
+    assert questionnaire == tuple(
+        (skill.id, skill.skill_type_id, skill.criteria) for skill in skills
+    )
+
+
 def test_save_diagnosis(diagnosis_service: DiagnosisService):
     """
     Test the save_diagnosis method of DiagnosisService.
@@ -79,6 +98,143 @@ def test_save_diagnosis(diagnosis_service: DiagnosisService):
     assert results[1].age_assessment == 3
 
 
+def test_save_diagnosis_assesses_skill_types_independently(
+    diagnosis_service: DiagnosisService,
+):
+    """
+    Test the save_diagnosis method of DiagnosisService.
+
+    This test checks if an unmastered skill only stops the assessment of its
+    own skill type.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    result = {1: False, 2: True, 3: True, 4: False, 5: True}
+    results = diagnosis_service.save_diagnosis(1, result)
+    assert [(r.skill_types_id, r.age_assessment) for r in results] == [(1, 0), (2, 3)]
+
+
+def test_save_diagnoses(diagnosis_service: DiagnosisService):
+    """
+    Test the save_diagnoses method of DiagnosisService.
+
+    This test checks if the method scores and saves the diagnoses of several
+    children in one call.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    results = diagnosis_service.save_diagnoses(
+        {1: {1: True, 2: True, 3: False}, 2: {"2": True, "3": True, "4": True}}
+    )
+    assert [r.age_assessment for r in results[1]] == [4, 2]
+    assert [r.age_assessment for r in results[2]] == [0, 35]
+    assert all(r.child_id == 2 for r in results[2])
+
+
+def test_complete_diagnosis(diagnosis_service: DiagnosisService):
+    """
+    Test the complete_diagnosis method of DiagnosisService.
+
+    This test checks if the method scores the answers of one session only,
+    even with two diagnoses of the child on the same day, and stores the
+    summary of the session. Completing a session again returns the same
+    results.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    child_id = 3
+    first = diagnosis_service.open_session(child_id)
+    second = diagnosis_service.open_session(child_id)
+    for skill_id, skill_type_id, answer in [(1, 1, True), (2, 2, True), (3, 2, False)]:
+        diagnosis_service.queue_answer(
+            child_id, skill_id, skill_type_id, answer, session_id=first.id
+        )
+    diagnosis_service.queue_answer(child_id, 1, 1, False, session_id=second.id)
+
+    results = diagnosis_service.complete_diagnosis(first.id)
+    assert {r.skill_types_id: r.age_assessment for r in results} == {1: 4, 2: 2}
+    assert all(r.child_id == child_id and r.session_id == first.id for r in results)
+    session = diagnosis_service.diagnosis_repository.get_diagnosis_session(first.id)
+    assert session.skill_types_age == {1: 4, 2: 2}
+    assert session.answers() == {1: True, 2: True, 3: False}
+
+    results = diagnosis_service.complete_diagnosis(second.id)
+    assert {r.skill_types_id: r.age_assessment for r in results} == {1: 0, 2: 0}
+    # Completing again returns the saved results
+    assert diagnosis_service.complete_diagnosis(second.id) == results
+    with pytest.raises(ValueError):
+        diagnosis_service.complete_diagnosis(-1)
+
+
+def test_get_sessions_page(diagnosis_service: DiagnosisService):
+    """
+    Test the get_sessions_page method of DiagnosisService.
+
+    This test checks if only completed sessions are listed, newest first.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    child_id = 2
+    opened = diagnosis_service.open_session(child_id)
+    page = diagnosis_service.get_sessions_page(child_id)
+    assert [session.id for session in page.items] == [2]
+    assert page.next_cursor is None
+    diagnosis_service.complete_diagnosis(opened.id)
+    page = diagnosis_service.get_sessions_page(child_id, size=1)
+    assert [session.id for session in page.items] == [opened.id]
+    page = diagnosis_service.get_sessions_page(child_id, page.next_cursor, size=1)
+    assert [session.id for session in page.items] == [2]
+
+
+def test_skill_bitset():
+    """
+    Test the SkillBitset class.
+
+    This test checks if set operations keep the expected skill ids and if
+    the bytes round trip keeps the skills.
+    """
+    first = SkillBitset.from_ids([1, 3, 64, 200])
+    second = SkillBitset.from_ids([3, 5, 200])
+    assert list(first | second) == [1, 3, 5, 64, 200]
+    assert list(first & second) == [3, 200]
+    assert list(first - second) == [1, 64]
+    assert list(first ^ second) == [1, 5, 64]
+    assert len(first) == 4 and 64 in first and 2 not in first and -1 not in first
+    assert SkillBitset.from_bytes(first.to_bytes()) == first
+    assert SkillBitset.from_bytes(None) == SkillBitset() and not SkillBitset()
+    assert SkillBitset().to_bytes() == b""
+
+
+def test_compare_diagnoses(diagnosis_service: DiagnosisService):
+    """
+    Test the compare_diagnoses method of DiagnosisService.
+
+    This test checks if skills mastered since the previous diagnosis, asked
+    before or not, are newly mastered and skills mastered before and failed
+    now are regressed.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    child_id = 2
+    assert diagnosis_service.compare_diagnoses(child_id) is None
+    opened = diagnosis_service.open_session(child_id)
+    for skill_id, skill_type_id, answer in [(1, 1, True), (2, 2, False), (3, 2, True)]:
+        diagnosis_service.queue_answer(
+            child_id, skill_id, skill_type_id, answer, session_id=opened.id
+        )
+    diagnosis_service.complete_diagnosis(opened.id)
+
+    changes = diagnosis_service.compare_diagnoses(child_id)
+    assert (changes.previous_id, changes.current_id) == (2, opened.id)
+    assert list(changes.newly_mastered) == [1, 3]
+    assert list(changes.regressed) == [2]
+
+
 def test_submit_question(diagnosis_service: DiagnosisService):
     """
     Test the submit_question method of DiagnosisService.
@@ -101,6 +257,26 @@ def test_submit_question(diagnosis_service: DiagnosisService):
     assert result.mastered == answer
 
 
+def test_queue_answer(diagnosis_service: DiagnosisService):
+    """
+    Test the queue_answer method of DiagnosisService.
+
+    This test checks if answers are buffered until they are flushed
+    and then written once.
+
+    Args:
+        diagnosis_service (DiagnosisService): The DiagnosisService fixture.
+    """
+    child_id = 3
+    assert diagnosis_service.queue_answer(child_id, 1, 1, True) == 1
+    assert diagnosis_service.queue_answer(child_id, 2, 2, False) == 2
+    repository = diagnosis_service.diagnosis_repository
+    assert diagnosis_service.flush_answers(child_id) == 2
+    assert diagnosis_service.flush_answers(child_id) == 0
+    history = repository.get_diagnosis_history(child_id)
+    assert [(el.skill_id, el.mastered) for el in history] == [(1, True), (2, False)]
+
+
 def test_finish_diagnosis(diagnosis_service: DiagnosisService):
     """
     Test the finish_diagnosis method of DiagnosisService.
@@ -1,7 +1,11 @@
 # type: ignore
+import itertools
+
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from src.models.domain.models import SkillBitset
 from src.repos.child import ChildRepository
 from src.repos.diagnosis import DiagnosisRepository
 from src.repos.skill import SkillRepository
@@ -32,13 +36,100 @@ def test_get_recommendations(recommendation_service: RecommendationService):
     """
     Test the get_recommendations method of RecommendationService.
 
-    This test checks if the method correctly retrieves skills recommendations
-    by child's id.
+    This test checks if the method correctly retrieves the ids of the skills
+    to recommend by child's id.
 
     Args:
         recommendation_service (RecommendationService): The RecommendationService fixture.
     """
     child_id = 2
     recommendations = recommendation_service.get_recommendations(child_id)
-    assert len(recommendations) > 0
+    assert isinstance(recommendations, tuple)
     assert len(recommendations) == 1
+
+
+def test_recommendation_index(db_session: Session):
+    """
+    Test the recommend method of RecommendationIndex.
+
+    This test checks if the index selects the same recommendations in the
+    same order as a scan of the age-sorted catalog, for every combination of
+    answers, assessment ages and child ages.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+    """
+    catalog = SkillRepository(db_session).catalog
+    skills = sorted(catalog.skills, key=lambda skill: skill.age_actual)
+    for answers in itertools.product([True, False, None], repeat=len(skills)):
+        mastered = {
+            skill.id: answer
+            for skill, answer in zip(skills, answers, strict=True)
+            if answer is not None
+        }
+        for cognitive, motor, age in itertools.product(range(6), range(6), range(7)):
+            skill_types_age = {1: cognitive, 2: motor}
+            expected = [
+                skill.recommendation
+                for skill in skills
+                if age >= skill.age_actual > skill_types_age[skill.skill_type_id]
+                and mastered.get(skill.id) is False
+            ]
+            failed = SkillBitset.from_ids(
+                skill_id for skill_id, answer in mastered.items() if not answer
+            )
+            assert (
+                catalog.recommendation_index.recommend(skill_types_age, failed, age)
+                == expected
+            )
+
+
+def test_get_recommendations_queries(
+    db_session: Session, recommendation_service: RecommendationService
+):
+    """
+    Test the get_recommendations method of RecommendationService.
+
+    This test checks if the method reads the summary of the last diagnosis
+    session and the child with at most two queries.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+        recommendation_service (RecommendationService): The RecommendationService fixture.
+    """
+    child_id = 2
+    expected = recommendation_service.get_recommendations(child_id)
+    statements = []
+    event.listen(
+        db_session.bind,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    assert recommendation_service.get_recommendations(child_id, session_id=2) == (
+        expected
+    )
+    assert len(statements) <= 2
+    assert recommendation_service.get_recommendations(child_id, session_id=1) == ()
+
+
+def test_get_recommendation_texts(recommendation_service: RecommendationService):
+    """
+    Test the get_recommendation_texts method of RecommendationService.
+
+    This test checks if pages of the skill ids returned by get_recommendations
+    map to the recommendations of the skills, in the same order.
+
+    Args:
+        recommendation_service (RecommendationService): The RecommendationService fixture.
+    """
+    child_id = 2
+    skill_ids = recommendation_service.get_recommendations(child_id)
+    catalog = recommendation_service.skill_repository.catalog
+    pages = [
+        recommendation_service.get_recommendation_texts(skill_ids[index : index + 1])
+        for index in range(len(skill_ids))
+    ]
+    assert [text for page in pages for text in page] == [
+        catalog.skills_by_id[skill_id].recommendation for skill_id in skill_ids
+    ]
+    assert recommendation_service.get_recommendation_texts([-1]) == []
@@ -0,0 +1,107 @@
+# type: ignore
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models.database.models import Base
+from src.services.unit_of_work import ThreadPoolUnitOfWorkRunner, UnitOfWork
+from src.tests.conftest import db_session
+from src.tests.seed_data import SEED_DATA
+from src.tests.test_helpers import create_in_memory_database
+
+
+@pytest.fixture
+def unit_of_work(db_session: Session) -> UnitOfWork:
+    """
+    Fixture that provides an instance of UnitOfWork for use in tests.
+
+    Args:
+        db_session (Session): The SQLAlchemy session fixture.
+
+    Returns:
+        UnitOfWork: An instance of UnitOfWork.
+    """
+    return UnitOfWork(db_session)
+
+
+def test_unit_of_work_shares_session(unit_of_work: UnitOfWork):
+    """
+    Test the repositories and services of UnitOfWork.
+
+    This test checks if all repositories and services of a unit of work
+    are created once and share its session.
+
+    Args:
+        unit_of_work (UnitOfWork): The UnitOfWork fixture.
+    """
+    diagnosis_service = unit_of_work.diagnosis_service
+    recommendation_service = unit_of_work.recommendation_service
+    assert unit_of_work.diagnosis_service is diagnosis_service
+    assert diagnosis_service.child_repository is unit_of_work.child_repository
+    assert (
+        recommendation_service.diagnosis_repository
+        is diagnosis_service.diagnosis_repository
+    )
+    for repository in (
+        unit_of_work.user_repository,
+        unit_of_work.child_repository,
+        unit_of_work.diagnosis_repository,
+        unit_of_work.skill_repository,
+    ):
+        assert repository.session is unit_of_work.session
+
+
+def test_unit_of_work_close():
+    """
+    Test the close method of UnitOfWork.
+
+    This test checks if closing the unit of work discards uncommitted changes
+    and releases the session.
+    """
+    unit_of_work = UnitOfWork(create_in_memory_database(SEED_DATA))
+    unit_of_work.child_repository.create_child(1, "Test Child", date(2021, 1, 1))
+    assert unit_of_work.session.in_transaction()
+    unit_of_work.close()
+    assert not unit_of_work.session.in_transaction()
+    assert len(unit_of_work.child_service.get_children(1)) == 2
+    unit_of_work.close()
+
+
+def test_thread_pool_runner():
+    """
+    Test the ThreadPoolUnitOfWorkRunner.
+
+    This test checks if the runner executes calls in the thread pool,
+    gives every call its own session and counts the calls.
+    """
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        for model, records in SEED_DATA.items():
+            session.bulk_insert_mappings(model, records)
+        session.commit()
+    runner = ThreadPoolUnitOfWorkRunner(session_factory, max_workers=1)
+
+    async def run():
+        children = await runner(lambda uow: uow.child_service.get_children(1))
+        first = await runner(lambda uow: uow.session)
+        second = await runner(lambda uow: uow.session)
+        return children, first, second
+
+    children, first, second = asyncio.run(run())
+    runner.shutdown()
+    assert len(children) == 2
+    assert first is not second
+    metrics = runner.metrics()
+    assert metrics["completed"] == 3
+    assert metrics["queue_depth"] == 0
+    assert metrics["running"] == 0
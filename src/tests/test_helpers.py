@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
 
 from src.models.database.models import Base
 
@@ -61,3 +62,94 @@ def create_in_memory_database(data: dict) -> Session:
     db.commit()
 
     return db
+
+
+async def create_async_in_memory_database(data: dict) -> AsyncSession:
+    """
+    Create an async in-memory database populated with data.
+
+    This function is the async counterpart of create_in_memory_database and
+    uses the aiosqlite driver.
+
+    Args:
+        data (dict): Dictionary of SQLAlchemy models and their data.
+
+    Returns:
+        AsyncSession: A populated SQLAlchemy async session object.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Base.metadata.create_all(
+                sync_connection, tables=[table.__table__ for table in data]
+            )
+        )
+
+    db = AsyncSession(engine, expire_on_commit=False)
+
+    def populate(session: Session) -> None:
+        for model, records in data.items():
+            session.bulk_insert_mappings(model, records)
+
+    await db.run_sync(populate)
+    await db.commit()
+
+    return db
+
+
+class LazyLoadError(RuntimeError):
+    """Raised by LazyLoadGuard when a relationship is loaded row by row."""
+
+
+class LazyLoadGuard:
+    """Detects N+1 lazy loading on a session.
+
+    Lazy loads are counted per parent and target entity. Once the same
+    relationship is lazy loaded more than max_lazy_loads times while the
+    guard is active, the load raises LazyLoadError: the relationship is
+    loaded once per row and needs a loader option instead.
+
+    Example:
+        with LazyLoadGuard(session):
+            ...
+    """
+
+    def __init__(self, session: Session, max_lazy_loads: int = 1) -> None:
+        """Instantiate the guard.
+
+        Args:
+            session: The session to watch.
+            max_lazy_loads: Lazy loads allowed per relationship.
+        """
+        self._session = session
+        self.max_lazy_loads = max_lazy_loads
+        self.lazy_loads: dict[tuple[str, str], int] = {}
+
+    def __enter__(self) -> "LazyLoadGuard":
+        event.listen(self._session, "do_orm_execute", self._check)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        event.remove(self._session, "do_orm_execute", self._check)
+
+    def reset(self) -> None:
+        """Forget the lazy loads counted so far."""
+        self.lazy_loads.clear()
+
+    def _check(self, orm_execute_state: ORMExecuteState) -> None:
+        if not orm_execute_state.is_select:
+            return
+        parent = orm_execute_state.lazy_loaded_from
+        if parent is None:
+            return
+        target = ", ".join(
+            mapper.class_.__name__ for mapper in orm_execute_state.all_mappers
+        )
+        key = (parent.class_.__name__, target)
+        self.lazy_loads[key] = self.lazy_loads.get(key, 0) + 1
+        if self.lazy_loads[key] > self.max_lazy_loads:
+            raise LazyLoadError(
+                f"N+1 query: {target} lazy loaded {self.lazy_loads[key]} times "
+                f"from {parent.class_.__name__}, add a loader option"
+            )